@@ -1,10 +1,15 @@
 import requests
 import json
+import os
 from datetime import datetime
 
 # === CONFIGURACIÓN ===
 API_TOKEN = "(ESRCIBE TU TOKEN )"
 ESPACIO_ID = "eL CODIGO iD "  # Espacio "Administración y Sistemas"
+NOMBRE_ESPACIO = "Administración y Sistemas"
+
+# Base de la API; se puede apuntar a un servidor de pruebas con CLICKUP_API_BASE
+API_BASE = os.environ.get("CLICKUP_API_BASE", "https://api.clickup.com/api/v2")
 
 HEADERS = {
     "Authorization": API_TOKEN
@@ -19,79 +24,112 @@ def formatear_fecha(fecha_ms):
             return None
     return None
 
-def obtener_carpetas(space_id):
-    url = f"https://api.clickup.com/api/v2/space/{space_id}/folder"
-    r = requests.get(url, headers=HEADERS)
+def obtener_carpetas(space_id, api_base=API_BASE, session=requests):
+    url = f"{api_base}/space/{space_id}/folder"
+    r = session.get(url, headers=HEADERS)
     return r.json()["folders"] if r.ok else []
 
-def obtener_listas(folder_id):
-    url = f"https://api.clickup.com/api/v2/folder/{folder_id}/list"
-    r = requests.get(url, headers=HEADERS)
+def obtener_listas(folder_id, api_base=API_BASE, session=requests):
+    url = f"{api_base}/folder/{folder_id}/list"
+    r = session.get(url, headers=HEADERS)
     return r.json()["lists"] if r.ok else []
 
-def obtener_tareas(list_id):
-    url = f"https://api.clickup.com/api/v2/list/{list_id}/task?subtasks=true&include_closed=true"
-    r = requests.get(url, headers=HEADERS)
+def obtener_tareas(list_id, api_base=API_BASE, session=requests):
+    url = f"{api_base}/list/{list_id}/task?subtasks=true&include_closed=true"
+    r = session.get(url, headers=HEADERS)
     return r.json()["tasks"] if r.ok else []
 
-# === PROCESO PRINCIPAL ===
-
-estructura = { "Administración y Sistemas": {} }
-
-carpetas = obtener_carpetas(ESPACIO_ID)
-
-for carpeta in carpetas:
-    nombre_carpeta = carpeta["name"]
-    estructura["Administración y Sistemas"][nombre_carpeta] = {}
-
-    listas = obtener_listas(carpeta["id"])
-
-    for lista in listas:
-        nombre_lista = lista["name"]
-        lista_id = lista["id"]
-        estructura["Administración y Sistemas"][nombre_carpeta][nombre_lista] = {}
-
-        tareas = obtener_tareas(lista_id)
-
-        # Agrupar subtareas por ID de padre
-        subtareas_dict = {}
-        for tarea in tareas:
-            if tarea.get("parent"):
-                parent_id = tarea["parent"]
-                if parent_id not in subtareas_dict:
-                    subtareas_dict[parent_id] = []
-                subtareas_dict[parent_id].append({
+def construir_estructura(space_id=ESPACIO_ID, api_base=API_BASE, session=requests, nombre_espacio=NOMBRE_ESPACIO):
+    """
+    Descarga carpetas, listas y tareas del espacio y devuelve la estructura
+    anidada Espacio > Carpeta > Lista > Estado > [tareas] que lee la aplicación.
+    'session' puede ser cualquier objeto con un método get() compatible con requests.
+    """
+    estructura = { nombre_espacio: {} }
+
+    carpetas = obtener_carpetas(space_id, api_base, session)
+
+    for carpeta in carpetas:
+        nombre_carpeta = carpeta["name"]
+        estructura[nombre_espacio][nombre_carpeta] = {}
+
+        listas = obtener_listas(carpeta["id"], api_base, session)
+
+        for lista in listas:
+            nombre_lista = lista["name"]
+            lista_id = lista["id"]
+            estructura[nombre_espacio][nombre_carpeta][nombre_lista] = {}
+
+            tareas = obtener_tareas(lista_id, api_base, session)
+
+            # Agrupar subtareas por ID de padre
+            subtareas_dict = {}
+            for tarea in tareas:
+                if tarea.get("parent"):
+                    parent_id = tarea["parent"]
+                    if parent_id not in subtareas_dict:
+                        subtareas_dict[parent_id] = []
+                    subtareas_dict[parent_id].append({
+                        "nombre": tarea.get("name"),
+                        "estado": tarea["status"]["status"].lower() if tarea.get("status") else "sin estado",
+                        "asignados": [a["username"] for a in tarea.get("assignees", [])],
+                        "fecha_inicio": formatear_fecha(tarea.get("start_date")),
+                        "fecha_limite": formatear_fecha(tarea.get("due_date")),
+                        "prioridad": tarea["priority"]["priority"] if tarea.get("priority") else None
+                    })
+
+            for tarea in tareas:
+                if tarea.get("parent"): continue  # Ya fue capturada como subtarea
+
+                estado = tarea["status"]["status"].lower() if tarea.get("status") else "sin estado"
+
+                tarea_info = {
+                    "id": tarea.get("id"),
                     "nombre": tarea.get("name"),
-                    "estado": tarea["status"]["status"].lower() if tarea.get("status") else "sin estado",
+                    "estado": estado,
                     "asignados": [a["username"] for a in tarea.get("assignees", [])],
                     "fecha_inicio": formatear_fecha(tarea.get("start_date")),
                     "fecha_limite": formatear_fecha(tarea.get("due_date")),
-                    "prioridad": tarea["priority"]["priority"] if tarea.get("priority") else None
-                })
+                    "prioridad": tarea["priority"]["priority"] if tarea.get("priority") else None,
+                    "subtareas": subtareas_dict.get(tarea.get("id"), [])
+                }
 
-        for tarea in tareas:
-            if tarea.get("parent"): continue  # Ya fue capturada como subtarea
+                if estado not in estructura[nombre_espacio][nombre_carpeta][nombre_lista]:
+                    estructura[nombre_espacio][nombre_carpeta][nombre_lista][estado] = []
 
-            estado = tarea["status"]["status"].lower() if tarea.get("status") else "sin estado"
+                estructura[nombre_espacio][nombre_carpeta][nombre_lista][estado].append(tarea_info)
 
-            tarea_info = {
-                "id": tarea.get("id"),
-                "nombre": tarea.get("name"),
-                "estado": estado,
-                "asignados": [a["username"] for a in tarea.get("assignees", [])],
-                "fecha_inicio": formatear_fecha(tarea.get("start_date")),
-                "fecha_limite": formatear_fecha(tarea.get("due_date")),
-                "prioridad": tarea["priority"]["priority"] if tarea.get("priority") else None,
-                "subtareas": subtareas_dict.get(tarea.get("id"), [])
-            }
+    return estructura
 
-            if estado not in estructura["Administración y Sistemas"][nombre_carpeta][nombre_lista]:
-                estructura["Administración y Sistemas"][nombre_carpeta][nombre_lista][estado] = []
+def guardar_estructura(estructura, ruta="datos.json"):
+    """
+    Escribe el JSON en un archivo temporal y lo reemplaza de forma atómica, para
+    que un lector (p. ej. la aplicación) nunca vea un archivo a medio escribir.
+    """
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(estructura, f, ensure_ascii=False, indent=4)
+    os.replace(temporal, ruta)
 
-            estructura["Administración y Sistemas"][nombre_carpeta][nombre_lista][estado].append(tarea_info)
-
-# === GUARDAR ARCHIVO FINAL ===
-with open("datos.json", "w", encoding="utf-8") as f:
-    json.dump(estructura, f, ensure_ascii=False, indent=4)
-
-print("\n✅ Archivo 'tareas_con_subtareas.json' generado correctamente.")
+# === PROCESO PRINCIPAL ===
+# Sin argumentos se exporta el espacio configurado a 'datos.json'. Para varios
+# espacios: python Json/main.py ID1=Nombre1 ID2=Nombre2 --salida espacios/
+# genera un archivo por espacio que la aplicación carga con REPORTE_DATA=espacios/
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Exporta espacios de ClickUp a JSON.")
+    parser.add_argument("espacios", nargs="*", help="Espacios como ID=Nombre.")
+    parser.add_argument("--salida", default="espacios", help="Directorio de salida con varios espacios.")
+    args = parser.parse_args()
+
+    if not args.espacios:
+        guardar_estructura(construir_estructura())
+        print("\n✅ Archivo 'datos.json' generado correctamente.")
+    else:
+        os.makedirs(args.salida, exist_ok=True)
+        for espacio in args.espacios:
+            space_id, _, nombre = espacio.partition("=")
+            nombre = nombre or space_id
+            ruta = os.path.join(args.salida, f"{nombre}.json")
+            guardar_estructura(construir_estructura(space_id, nombre_espacio=nombre), ruta)
+            print(f"✅ Archivo '{ruta}' generado correctamente.")
@@ -0,0 +1,313 @@
+"""
+API HTTP local (JSON) con los mismos datos filtrados y agregados que muestra
+el dashboard, para otras herramientas internas. Es una aplicación ASGI
+(Starlette) que comparte con la interfaz la carga en segundo plano
+(RefreshWorker), los filtros jerárquicos, el cubo de conteos y la memoria de
+resultados de filtros; no ejecuta ninguna vista de Streamlit.
+
+Los filtros se pasan con los mismos parámetros que la URL de la aplicación:
+area, proyecto y estado (repetibles), desde y hasta (AAAA-MM-DD; por defecto
+el rango completo de fechas de inicio, como en la barra lateral), buscar y tipo.
+
+    GET /api/version                 versión de los datos publicada
+    GET /api/tareas                  tareas filtradas, paginadas (pagina, tamano)
+                                     o completas en NDJSON (formato=ndjson)
+    GET /api/kpis                    totales por estado, prioridad y tipo
+    GET /api/gantt                   filas del Gantt de las tareas filtradas
+    GET /api/personal-sin-tareas     personas sin tareas en el filtro
+
+Todas las respuestas llevan un ETag derivado de la versión de los datos y de
+la consulta canónica: un cliente que repite la consulta con If-None-Match
+recibe 304 sin que se vuelva a calcular nada.
+
+Uso:
+    python src/api.py --data datos.json --puerto 8600
+"""
+import os
+import sys
+import asyncio
+import hashlib
+import json
+import pandas as pd
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from dataset import Dataset
+from filter_cache import TASK_TYPES, FilterResultCache, filter_key, get_filter_cache
+from gantt_prep import prepare_gantt_frame
+from processors import filter_data_hierarchically, unassigned_personnel
+from refresh import DatasetHolder
+
+API_HOST = os.environ.get('REPORTE_API_HOST', '127.0.0.1')
+API_PORT = int(os.environ.get('REPORTE_API_PUERTO', '8600'))
+PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+# Filas serializadas por bloque en las respuestas NDJSON
+NDJSON_CHUNK_ROWS = 5000
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+# Cuerpos de respuesta JSON memorizados por ETag
+RESPONSE_CACHE_SIZE = 256
+
+TASK_FIELDS = ['id', 'parent_id', 'nombre', 'proyecto', 'area', 'estado', 'prioridad',
+               'asignados', 'fecha_inicio', 'fecha_limite', 'is_subtask']
+GANTT_FIELDS = ['id', 'parent_id', 'nombre', 'proyecto', 'tipo', 'fecha_inicio', 'fecha_limite', 'duracion', 'task_label']
+
+def records_json(df: pd.DataFrame, fields: List[str], lines: bool = False) -> str:
+    """
+    Serializa las columnas 'fields' como registros JSON (o NDJSON con
+    'lines'): fechas AAAA-MM-DD, categorías como texto y nulos como null.
+    """
+    data = {}
+    for field in fields:
+        values = df[field]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = values.dt.strftime('%Y-%m-%d')
+        elif isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(object)
+        data[field] = values
+    return pd.DataFrame(data, index=df.index).to_json(orient='records', lines=lines, force_ascii=False)
+
+def _observed(counts: pd.Series) -> Dict[str, int]:
+    counts = counts[counts > 0]
+    return {str(key): int(value) for key, value in counts.items()}
+
+def kpi_summary(dataset: Dataset, filtros: Tuple, filtered: Optional[pd.DataFrame] = None) -> dict:
+    """
+    KPIs del dashboard: desde el cubo (o la consulta SQL) cuando los filtros
+    lo permiten y, si no, contando las filas filtradas.
+    """
+    cube = dataset.backend.summary_cube(*filtros) if dataset.backend else dataset.cube.for_filters(*filtros)
+    if cube is not None:
+        total, estados, prioridades = cube.total(), cube.counts_by('estado'), cube.counts_by('prioridad')
+        por_tipo = cube.counts_by('is_subtask')
+    else:
+        total, estados, prioridades = len(filtered), filtered['estado'].value_counts(), filtered['prioridad'].value_counts()
+        por_tipo = filtered['is_subtask'].value_counts()
+    return {
+        'total': int(total),
+        'tareas': int(por_tipo.get(False, 0)),
+        'subtareas': int(por_tipo.get(True, 0)),
+        'por_estado': _observed(estados),
+        'por_prioridad': _observed(prioridades),
+    }
+
+
+class ReportAPI:
+    """
+    Endpoints de la API sobre un DatasetHolder. Cada petición toma el Dataset
+    vigente una vez; las posiciones filtradas se guardan en la memoria LRU de
+    filtros y las peticiones simultáneas con la misma consulta esperan a un
+    único cálculo. El trabajo con pandas se hace en el pool de hilos para no
+    bloquear el bucle de eventos.
+    """
+    def __init__(self, holder: DatasetHolder, cache: Optional[FilterResultCache] = None):
+        self.holder = holder
+        self.cache = cache or get_filter_cache()
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._bodies = OrderedDict()
+
+    def data_tag(self, version) -> str:
+        """Identidad de los datos: versión publicada y versión de la fuente."""
+        return f'{self.holder.source_version!r}/{version}'
+
+    def filters(self, request: Request, dataset: Dataset) -> Tuple:
+        """Tupla de filtros (como la de la aplicación) a partir de la consulta."""
+        if dataset.empty:
+            raise HTTPException(503, "Aún no hay datos cargados.")
+        params = request.query_params
+        fechas = []
+        for name, default in (('desde', dataset.options.min_date), ('hasta', dataset.options.max_date)):
+            fecha = pd.to_datetime(params[name], errors='coerce') if params.get(name) else default
+            if params.get(name) and pd.isna(fecha):
+                raise HTTPException(400, f"Fecha no válida en '{name}': {params[name]}")
+            fechas.append(fecha)
+        tipo = params.get('tipo') or TASK_TYPES[0]
+        if tipo not in TASK_TYPES:
+            raise HTTPException(400, f"'tipo' debe ser uno de: {', '.join(TASK_TYPES)}")
+        return (params.getlist('area'), params.getlist('proyecto'), params.getlist('estado'),
+                fechas[0], fechas[1], params.get('buscar', ''), tipo)
+
+    def _compute_positions(self, dataset: Dataset, filtros: Tuple):
+        if dataset.backend:
+            return dataset.backend.filter_positions(*filtros)
+        return dataset.df.index.get_indexer(filter_data_hierarchically(dataset.df, *filtros).index)
+
+    async def filtered(self, dataset: Dataset, version, filtros: Tuple) -> pd.DataFrame:
+        """Filas filtradas del Dataset, calculadas una vez por versión y consulta."""
+        tag, key = self.data_tag(version), filter_key(filtros)
+        positions = self.cache.get(tag, key)
+        if positions is None:
+            future = self._inflight.get((tag, key))
+            if future is None:
+                future = asyncio.ensure_future(run_in_threadpool(
+                    self.cache.positions, tag, key, lambda: self._compute_positions(dataset, filtros)
+                ))
+                self._inflight[(tag, key)] = future
+                future.add_done_callback(lambda _: self._inflight.pop((tag, key), None))
+            positions = await future
+        return dataset.df.iloc[positions]
+
+    def etag(self, request: Request, version, filtros: Optional[Tuple], *extra) -> str:
+        canonical = filter_key(filtros) if filtros is not None else ''
+        digest = hashlib.blake2b(repr((self.data_tag(version), request.url.path, canonical, extra)).encode('utf-8'), digest_size=12)
+        return f'"{digest.hexdigest()}"'
+
+    @staticmethod
+    def client_has(request: Request, etag: str) -> bool:
+        """True si el cliente envía ese ETag en If-None-Match."""
+        return etag in [tag.strip() for tag in request.headers.get('if-none-match', '').split(',')]
+
+    async def respond(self, request: Request, etag: str, build) -> Response:
+        """
+        Respuesta JSON con ETag: 304 si el cliente ya tiene esa versión; si no,
+        el cuerpo memorizado para el ETag o el que devuelva 'build()' (una
+        corrutina que produce el texto JSON). La memoria de cuerpos solo se
+        usa desde el bucle de eventos, por lo que no necesita lock.
+        """
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if self.client_has(request, etag):
+            return Response(status_code=304, headers=headers)
+        body = self._bodies.get(etag)
+        if body is None:
+            body = await build()
+            self._bodies[etag] = body
+            while len(self._bodies) > RESPONSE_CACHE_SIZE:
+                self._bodies.popitem(last=False)
+        else:
+            self._bodies.move_to_end(etag)
+        return Response(body, media_type='application/json', headers=headers)
+
+    def paging(self, request: Request) -> Tuple[int, int]:
+        try:
+            pagina = int(request.query_params.get('pagina', 1))
+            tamano = int(request.query_params.get('tamano', PAGE_SIZE))
+        except ValueError:
+            raise HTTPException(400, "'pagina' y 'tamano' deben ser números enteros")
+        if pagina < 1 or not 1 <= tamano <= MAX_PAGE_SIZE:
+            raise HTTPException(400, f"'pagina' debe ser >= 1 y 'tamano' estar entre 1 y {MAX_PAGE_SIZE}")
+        return pagina, tamano
+
+    @staticmethod
+    def wants_ndjson(request: Request) -> bool:
+        return request.query_params.get('formato') == 'ndjson' or NDJSON_MEDIA_TYPE in request.headers.get('accept', '')
+
+    async def rows_response(self, request: Request, rows_for, fields: List[str]) -> Response:
+        """
+        Respuesta de filas común a tareas y Gantt: una página en JSON o todas
+        las filas en NDJSON, escritas por bloques a medida que se envían.
+        'rows_for(dataset, version, filtros)' devuelve el DataFrame de filas.
+        """
+        dataset, version = self.holder.snapshot()
+        filtros = self.filters(request, dataset)
+        if self.wants_ndjson(request):
+            etag = self.etag(request, version, filtros, 'ndjson')
+            headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+            if self.client_has(request, etag):
+                return Response(status_code=304, headers=headers)
+            rows = await rows_for(dataset, version, filtros)
+
+            async def chunks():
+                for start in range(0, len(rows), NDJSON_CHUNK_ROWS):
+                    block = rows.iloc[start:start + NDJSON_CHUNK_ROWS]
+                    yield await run_in_threadpool(records_json, block, fields, True)
+            return StreamingResponse(chunks(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+        pagina, tamano = self.paging(request)
+
+        async def build():
+            rows = await rows_for(dataset, version, filtros)
+            page = rows.iloc[(pagina - 1) * tamano:pagina * tamano]
+            body = await run_in_threadpool(records_json, page, fields)
+            header = json.dumps({'total': len(rows), 'pagina': pagina, 'tamano': tamano,
+                                 'paginas': -(-len(rows) // tamano)}, ensure_ascii=False)
+            return f'{header[:-1]}, "filas": {body}}}'
+        return await self.respond(request, self.etag(request, version, filtros, pagina, tamano), build)
+
+    async def tareas(self, request: Request) -> Response:
+        return await self.rows_response(request, self.filtered, TASK_FIELDS)
+
+    async def gantt(self, request: Request) -> Response:
+        async def gantt_rows(dataset, version, filtros):
+            filtered = await self.filtered(dataset, version, filtros)
+            return await run_in_threadpool(prepare_gantt_frame, filtered)
+        return await self.rows_response(request, gantt_rows, GANTT_FIELDS)
+
+    async def kpis(self, request: Request) -> Response:
+        dataset, version = self.holder.snapshot()
+        filtros = self.filters(request, dataset)
+
+        async def build():
+            # Solo se recorren las filas si el cubo no puede responder los filtros
+            needs_rows = not dataset.backend and dataset.cube.for_filters(*filtros) is None
+            filtered = await self.filtered(dataset, version, filtros) if needs_rows else None
+            return json.dumps(await run_in_threadpool(kpi_summary, dataset, filtros, filtered), ensure_ascii=False)
+        return await self.respond(request, self.etag(request, version, filtros), build)
+
+    async def personal_sin_tareas(self, request: Request) -> Response:
+        dataset, version = self.holder.snapshot()
+        filtros = self.filters(request, dataset)
+
+        async def build():
+            filtered = await self.filtered(dataset, version, filtros)
+            personas = await run_in_threadpool(unassigned_personnel, dataset.df, filtered)
+            return json.dumps({'total': len(personas), 'personas': personas}, ensure_ascii=False)
+        return await self.respond(request, self.etag(request, version, filtros), build)
+
+    async def version(self, request: Request) -> Response:
+        dataset, version = self.holder.snapshot()
+
+        async def build():
+            return json.dumps({
+                'version': version,
+                'filas': len(dataset.df),
+                'actualizado': pd.Timestamp(self.holder.updated_at, unit='s').isoformat(),
+            })
+        return await self.respond(request, self.etag(request, version, None), build)
+
+
+async def http_error(request: Request, exc: HTTPException) -> Response:
+    """Errores de la API como JSON ({"error": ...})."""
+    return JSONResponse({'error': exc.detail}, status_code=exc.status_code)
+
+def create_app(holder: DatasetHolder, cache: Optional[FilterResultCache] = None) -> Starlette:
+    """Aplicación ASGI con los endpoints de la API sobre 'holder'."""
+    api = ReportAPI(holder, cache)
+    return Starlette(exception_handlers={HTTPException: http_error}, routes=[
+        Route('/api/version', api.version),
+        Route('/api/tareas', api.tareas),
+        Route('/api/kpis', api.kpis),
+        Route('/api/gantt', api.gantt),
+        Route('/api/personal-sin-tareas', api.personal_sin_tareas),
+    ])
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    import uvicorn
+    from refresh import RefreshWorker, open_source
+
+    parser = argparse.ArgumentParser(description="API JSON local con las tareas filtradas y los agregados del dashboard.")
+    parser.add_argument("--data", default=os.environ.get('REPORTE_DATA', 'datos.json'), help="JSON de tareas, directorio o patrón glob.")
+    parser.add_argument("--fuente", default=os.environ.get('REPORTE_FUENTE', 'archivo'), choices=['archivo', 'clickup', 'compartido'])
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--puerto", type=int, default=API_PORT)
+    parser.add_argument("--refresco", type=float, default=float(os.environ.get('REPORTE_REFRESCO_SEG', '2')),
+                        help="Segundos entre comprobaciones de la fuente de datos.")
+    args = parser.parse_args(argv)
+
+    source, holder = open_source(args.data, args.fuente, debounce=1.0)
+    if holder.get().empty and args.fuente != 'compartido':
+        print(f"No se pudieron cargar datos de '{args.data}'.", file=sys.stderr)
+        return 1
+    RefreshWorker(source, holder, args.refresco).start()
+    uvicorn.run(create_app(holder), host=args.host, port=args.puerto, log_level='info')
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
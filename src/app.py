@@ -1,191 +1,239 @@
-import os
-import sys
-
-# Añadir el directorio 'src' al sys.path para asegurar que los módulos se encuentren
-# tanto en local como en despliegues en la nube.
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
-
-
-# ---------------------------------------------------
-# Configuración para que Kaleido encuentre el binario
-# ---------------------------------------------------
-# Intentamos rutas comunes; la primera que exista la usamos.
-for candidate in (
-    "/usr/bin/chromium",
-    "/usr/bin/chromium-browser",
-    "/usr/bin/google-chrome-stable",
-):
-    if os.path.exists(candidate):
-        os.environ["BROWSER_PATH"] = candidate
-        break
-else:
-    # Si no se encuentra ningún binario, emitimos un warning
-    print("⚠️ WARNING: No se detectó Chrome/Chromium. Verifica packages.txt")
-
-# (Opcional) Habilitar logs de debug de Kaleido
-# os.environ["KALEIDO_DEBUG"] = "1"
-
-import streamlit as st
-import pandas as pd
-from data_loader import load_and_normalize_json
-from processors import DataManager
-
-from views.dashboard_view import render_dashboard
-from views.detailed_report_view import render_detailed_report
-from views.gantt_view import render_gantt_view
-from views.unassigned_personnel_view import render_unassigned_personnel_view
-from views.general_activity_report_view import render_general_activity_report
-
-def filter_data_hierarchically(df, areas, proyectos, estados, fecha_inicio, fecha_fin, search_term, task_type_filter):
-    """
-    Filtra el DataFrame de forma jerárquica aplicando todos los filtros.
-    """
-    # 1. Aplicar filtros estándar
-    filtered_df = df.copy()
-    if areas:
-        filtered_df = filtered_df[filtered_df['area'].isin(areas)]
-    if proyectos:
-        filtered_df = filtered_df[filtered_df['proyecto'].isin(proyectos)]
-    if estados:
-        filtered_df = filtered_df[filtered_df['estado'].isin(estados)]
-    if pd.notna(fecha_inicio) and pd.notna(fecha_fin):
-        filtered_df = filtered_df[
-            (filtered_df['fecha_inicio'].notna()) &
-            (filtered_df['fecha_inicio'] >= fecha_inicio) & 
-            (filtered_df['fecha_inicio'] <= fecha_fin)
-        ]
-    if search_term:
-        filtered_df = filtered_df[
-            filtered_df['nombre'].str.contains(search_term, case=False, na=False)
-        ]
-
-    # 2. Lógica jerárquica para mantener la integridad de las tareas
-    parent_ids_from_subtasks = filtered_df[filtered_df['is_subtask']]['parent_id'].dropna().unique()
-    final_parent_ids = set(filtered_df[~filtered_df['is_subtask']]['id']) | set(parent_ids_from_subtasks)
-    
-    result_df = df[
-        df['id'].isin(final_parent_ids) | df['parent_id'].isin(final_parent_ids)
-    ].copy()
-
-    # 3. Aplicar el filtro de tipo de tarea al final
-    if task_type_filter == 'Solo Tareas':
-        # Muestra solo las tareas principales del conjunto ya filtrado jerárquicamente
-        return result_df[~result_df['is_subtask']]
-    elif task_type_filter == 'Solo Subtareas':
-        # Muestra solo las subtareas del conjunto ya filtrado
-        return result_df[result_df['is_subtask']]
-    else: # 'Todas'
-        return result_df
-
-def main():
-    st.set_page_config(
-        page_title="Dashboard de Reportes",
-        page_icon="📊",
-        layout="wide"
-    )
-    st.title("📊 Dashboard de Reportes y Productividad")
-
-    # Cargar datos
-    df_original = load_and_normalize_json('datos.json')
-    if df_original.empty:
-        st.error("No se pudieron cargar los datos o el archivo está vacío.")
-        return
-    data_manager_original = DataManager(df_original)
-
-    # --- Session State para filtros ---
-    if 'selected_areas' not in st.session_state:
-        st.session_state.selected_areas = []
-    if 'selected_proyectos' not in st.session_state:
-        st.session_state.selected_proyectos = []
-    if 'selected_estados' not in st.session_state:
-        st.session_state.selected_estados = []
-    if 'date_range' not in st.session_state:
-        min_date = df_original['fecha_inicio'].min()
-        max_date = df_original['fecha_inicio'].max()
-        st.session_state.date_range = (min_date, max_date)
-    if 'gantt_selected_proyectos' not in st.session_state:
-        st.session_state.gantt_selected_proyectos = data_manager_original.get_unique_values('proyecto')
-    if 'search_term' not in st.session_state:
-        st.session_state.search_term = ""
-    if 'task_type_filter' not in st.session_state:
-        st.session_state.task_type_filter = "Todas"
-
-    # --- Barra lateral de filtros ---
-    st.sidebar.header("Filtros Globales")
-
-    st.session_state.search_term = st.sidebar.text_input(
-        "Buscar por Nombre",
-        value=st.session_state.search_term
-    )
-
-    st.session_state.task_type_filter = st.sidebar.radio(
-        "Filtrar por Tipo",
-        options=["Todas", "Solo Tareas", "Solo Subtareas"],
-        key='radio_task_type',
-        horizontal=True,
-        index=["Todas", "Solo Tareas", "Solo Subtareas"].index(st.session_state.task_type_filter)
-    )
-    
-    areas = data_manager_original.get_unique_values('area')
-    st.session_state.selected_areas = st.sidebar.multiselect(
-        "Filtrar por Área", areas, key='multiselect_areas',
-        default=st.session_state.selected_areas
-    )
-    
-    proyectos_filtrados = data_manager_original.filter_by_area(
-        st.session_state.selected_areas
-    ).get_unique_values('proyecto')
-    st.session_state.selected_proyectos = st.sidebar.multiselect(
-        "Filtrar por Proyecto", proyectos_filtrados, key='multiselect_proyectos',
-        default=st.session_state.selected_proyectos
-    )
-    
-    estados = data_manager_original.get_unique_values('estado')
-    st.session_state.selected_estados = st.sidebar.multiselect(
-        "Filtrar por Estado", estados, key='multiselect_estados',
-        default=st.session_state.selected_estados
-    )
-    
-    min_date, max_date = st.session_state.date_range
-    sel_start, sel_end = st.sidebar.date_input(
-        "Filtrar por Fecha de Inicio",
-        value=(min_date, max_date),
-        min_value=min_date, max_value=max_date,
-    )
-    st.session_state.date_range = (sel_start, sel_end)
-
-    # Aplicar todos los filtros
-    df_filtrado = filter_data_hierarchically(
-        df_original,
-        st.session_state.selected_areas,
-        st.session_state.selected_proyectos,
-        st.session_state.selected_estados,
-        pd.to_datetime(sel_start),
-        pd.to_datetime(sel_end),
-        st.session_state.search_term,
-        st.session_state.task_type_filter
-    )
-    
-    st.info(f"Mostrando {len(df_filtrado)} de {len(df_original)} registros según los filtros aplicados.")
-
-    # --- Pestañas ---
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "📊 Dashboard Ejecutivo",
-        "📄 Reporte Detallado",
-        "📈 Diagrama de Gantt",
-        "👤 Personal sin Tareas",
-        "⭐ Reporte General"
-    ])
-    with tab1:
-        render_dashboard(df_filtrado)
-    with tab2:
-        render_detailed_report(df_filtrado)
-    with tab3:
-        render_gantt_view(df_original)
-    with tab4:
-        render_unassigned_personnel_view(df_original, df_filtrado)
-    with tab5:
-        render_general_activity_report(df_filtrado)
-
-if __name__ == "__main__":
-    main()
+import os
+import sys
+
+# Añadir el directorio 'src' al sys.path para asegurar que los módulos se encuentren
+# tanto en local como en despliegues en la nube.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+import time
+import streamlit as st
+import pandas as pd
+from refresh import RefreshWorker, open_source
+from snapshots import SnapshotStore
+from processors import filter_data_hierarchically
+from filter_cache import QUERY_PARAMS, filter_key, filter_params, filters_from_params, get_filter_cache
+from startup import load_view
+
+# Vistas de la aplicación: (módulo, función de renderizado). Cada módulo, con
+# sus librerías (plotly, xlsxwriter...), se importa la primera vez que se abre
+# la vista; Kaleido/Chromium se configuran al abrir el dashboard, que exporta imágenes.
+VIEWS = {
+    "📊 Dashboard Ejecutivo": ('views.dashboard_view', 'render_dashboard'),
+    "📄 Reporte Detallado": ('views.detailed_report_view', 'render_detailed_report'),
+    "📈 Diagrama de Gantt": ('views.gantt_view', 'render_gantt_view'),
+    "👤 Personal sin Tareas": ('views.unassigned_personnel_view', 'render_unassigned_personnel_view'),
+    "⭐ Reporte General": ('views.general_activity_report_view', 'render_general_activity_report'),
+    "🔥 Carga de Trabajo": ('views.workload_view', 'render_workload_view'),
+    "🧪 Calidad de Datos": ('views.data_quality_view', 'render_data_quality_view'),
+    "📉 Tendencias": ('views.trends_view', 'render_trends_view'),
+}
+
+# Archivo de datos, o directorio/patrón glob con varias exportaciones de espacio
+DATA_PATH = os.environ.get('REPORTE_DATA', 'datos.json')
+# Origen de los datos ('archivo', 'clickup' o 'compartido') y segundos entre comprobaciones
+DATA_SOURCE = os.environ.get('REPORTE_FUENTE', 'archivo')
+REFRESH_INTERVAL = float(os.environ.get('REPORTE_REFRESCO_SEG', '2'))
+# Segundos que el archivo debe permanecer sin cambios antes de recargarlo
+REFRESH_DEBOUNCE = float(os.environ.get('REPORTE_ESPERA_SEG', '1'))
+# Con REPORTE_HISTORIAL definido, cada versión publicada se guarda en el historial
+# (las réplicas en modo 'compartido' no escriben: lo hace el cargador)
+SNAPSHOT_ON_REFRESH = bool(os.environ.get('REPORTE_HISTORIAL'))
+
+# Resultados guardados en la sesión que se derivan de una versión de los datos
+# (exportaciones preparadas y preparaciones por DataFrame); los ZIP por
+# proyecto/persona se guardan con el sufijo '_split_zip'
+VERSION_STATE_KEYS = (
+    'date_range', 'gantt_selected_proyectos', 'gantt_frame', 'gantt_analytics', 'gantt_excel',
+    'detallado_opciones', 'detallado_excel', 'detallado_data_export',
+    'dashboard_images', 'dashboard_pdf', 'burndown_excel', 'workload_excel', 'calidad_excel',
+)
+
+@st.cache_resource(show_spinner="Cargando datos...")
+def get_refresh_worker(file_path: str, fuente: str) -> RefreshWorker:
+    """
+    Carga el conjunto de datos una sola vez por proceso y arranca el hilo que
+    lo actualiza en segundo plano. Las sesiones comparten el DatasetHolder y
+    ven la versión nueva en su siguiente ejecución, sin esperar a la recarga.
+    """
+    store = SnapshotStore()
+    on_publish = (lambda dataset: store.append(dataset.df)) if SNAPSHOT_ON_REFRESH and fuente != 'compartido' else None
+    source, holder = open_source(file_path, fuente, REFRESH_DEBOUNCE)
+    if on_publish is not None and not holder.get().empty:
+        on_publish(holder.get())
+    worker = RefreshWorker(source, holder, REFRESH_INTERVAL, on_publish)
+    worker.start()
+    return worker
+
+def render_refresh_status(worker: RefreshWorker):
+    """Estado de la actualización en segundo plano en la barra lateral."""
+    updated = time.strftime('%d/%m/%Y %H:%M:%S', time.localtime(worker.holder.updated_at))
+    st.sidebar.caption(f"Datos actualizados: {updated}")
+    if worker.refreshing:
+        st.sidebar.caption("🔄 Actualizando datos en segundo plano...")
+    if worker.last_error:
+        st.sidebar.warning(worker.last_error)
+    if st.sidebar.button("🔄 Actualizar datos", key='refresh_button'):
+        worker.request_refresh()
+        st.sidebar.caption("Actualización solicitada; los datos nuevos aparecerán al terminar.")
+
+def main():
+    st.set_page_config(
+        page_title="Dashboard de Reportes",
+        page_icon="📊",
+        layout="wide"
+    )
+    st.title("📊 Dashboard de Reportes y Productividad")
+
+    # Cargar datos: se toma la versión vigente una vez por ejecución
+    worker = get_refresh_worker(DATA_PATH, DATA_SOURCE)
+    dataset, dataset_version = worker.holder.snapshot()
+    render_refresh_status(worker)
+    if dataset.empty:
+        st.error("No se pudieron cargar los datos o el archivo está vacío.")
+        return
+    df_original = dataset.df
+    # Opciones de los filtros precalculadas en la carga (búsquedas en diccionarios)
+    options = dataset.options
+    # Motor SQL opcional (REPORTE_BACKEND) para filtros y conteos
+    backend = dataset.backend
+
+    # Si se publicó una versión nueva de los datos, se descartan los valores
+    # derivados de la anterior (rango de fechas, proyectos del Gantt y
+    # exportaciones ya preparadas, que ya no corresponden a los datos)
+    if st.session_state.get('dataset_version') != dataset_version:
+        st.session_state.dataset_version = dataset_version
+        for key in list(st.session_state):
+            if key in VERSION_STATE_KEYS or key.endswith('_split_zip'):
+                del st.session_state[key]
+
+    # Filtros compartidos en la URL: se aplican una vez al abrir la sesión
+    if 'url_filters_loaded' not in st.session_state:
+        st.session_state.url_filters_loaded = True
+        url_state = filters_from_params({name: st.query_params.get_all(name) for name in QUERY_PARAMS})
+        if 'date_range' in url_state:
+            # Los límites de la selección aún no se conocen; se fijan al mostrar el selector
+            st.session_state.date_range_url = (None, url_state.pop('date_range'))
+        st.session_state.update(url_state)
+
+    # --- Session State para filtros ---
+    if 'selected_areas' not in st.session_state:
+        st.session_state.selected_areas = []
+    if 'selected_proyectos' not in st.session_state:
+        st.session_state.selected_proyectos = []
+    if 'selected_estados' not in st.session_state:
+        st.session_state.selected_estados = []
+    if 'date_range' not in st.session_state:
+        st.session_state.date_range = options.date_bounds()
+    if 'gantt_selected_proyectos' not in st.session_state:
+        st.session_state.gantt_selected_proyectos = options.projects()
+    if 'search_term' not in st.session_state:
+        st.session_state.search_term = ""
+    if 'task_type_filter' not in st.session_state:
+        st.session_state.task_type_filter = "Todas"
+
+    # --- Barra lateral de filtros ---
+    st.sidebar.header("Filtros Globales")
+
+    st.session_state.search_term = st.sidebar.text_input(
+        "Buscar por Nombre",
+        value=st.session_state.search_term
+    )
+
+    st.session_state.task_type_filter = st.sidebar.radio(
+        "Filtrar por Tipo",
+        options=["Todas", "Solo Tareas", "Solo Subtareas"],
+        key='radio_task_type',
+        horizontal=True,
+        index=["Todas", "Solo Tareas", "Solo Subtareas"].index(st.session_state.task_type_filter)
+    )
+    
+    areas = options.areas
+    st.session_state.selected_areas = st.sidebar.multiselect(
+        "Filtrar por Área", areas, key='multiselect_areas',
+        default=[a for a in st.session_state.selected_areas if a in areas]
+    )
+    
+    proyectos_filtrados = options.projects(st.session_state.selected_areas)
+    st.session_state.selected_proyectos = st.sidebar.multiselect(
+        "Filtrar por Proyecto", proyectos_filtrados, key='multiselect_proyectos',
+        default=[p for p in st.session_state.selected_proyectos if p in proyectos_filtrados]
+    )
+    
+    # Estados y rango de fechas de los proyectos elegidos (o de los de las áreas elegidas)
+    proyectos_en_alcance = st.session_state.selected_proyectos or (
+        proyectos_filtrados if st.session_state.selected_areas else None
+    )
+    estados = options.estados_for(proyectos_en_alcance)
+    st.session_state.selected_estados = st.sidebar.multiselect(
+        "Filtrar por Estado", estados, key='multiselect_estados',
+        default=[e for e in st.session_state.selected_estados if e in estados]
+    )
+    
+    # Al cambiar los límites el selector vuelve al rango completo de la selección
+    min_date, max_date = options.date_bounds(proyectos_en_alcance)
+    # El rango pedido en la URL se mantiene mientras no cambien esos límites
+    url_range = st.session_state.get('date_range_url')
+    if url_range is not None and url_range[0] is None:
+        inicio, fin = (min(max(fecha, min_date), max_date) for fecha in url_range[1])
+        url_range = st.session_state.date_range_url = ((min_date, max_date), (inicio, fin))
+    elif url_range is not None and url_range[0] != (min_date, max_date):
+        url_range = st.session_state.date_range_url = None
+    sel_start, sel_end = st.sidebar.date_input(
+        "Filtrar por Fecha de Inicio",
+        value=url_range[1] if url_range else (min_date, max_date),
+        min_value=min_date, max_value=max_date,
+    )
+    st.session_state.date_range = (sel_start, sel_end)
+
+    # Aplicar todos los filtros
+    filtros = (
+        st.session_state.selected_areas,
+        st.session_state.selected_proyectos,
+        st.session_state.selected_estados,
+        pd.to_datetime(sel_start),
+        pd.to_datetime(sel_end),
+        st.session_state.search_term,
+        st.session_state.task_type_filter
+    )
+    # La URL refleja los filtros para poder compartir la vista
+    params = filter_params(filtros)
+    if {name: st.query_params.get_all(name) for name in st.query_params} != params:
+        st.query_params.from_dict(params)
+
+    # Las posiciones filtradas se comparten entre sesiones por versión de datos y clave canónica
+    cache = get_filter_cache()
+    key = filter_key(filtros)
+    if backend:
+        # Filtros, expansión jerárquica y conteos del dashboard resueltos en SQL
+        positions = cache.positions(dataset_version, key, lambda: backend.filter_positions(*filtros))
+        cube_filtrado = backend.summary_cube(*filtros)
+    else:
+        positions = cache.positions(dataset_version, key, lambda: df_original.index.get_indexer(
+            filter_data_hierarchically(df_original, *filtros).index
+        ))
+        # Sub-cubo para el dashboard cuando los filtros pueden resolverse sin recorrer filas
+        cube_filtrado = dataset.cube.for_filters(*filtros)
+    df_filtrado = df_original.iloc[positions]
+    
+    st.info(f"Mostrando {len(df_filtrado)} de {len(df_original)} registros según los filtros aplicados.")
+
+    # --- Vistas ---
+    # Solo se importa y renderiza la vista seleccionada (las pestañas de
+    # st.tabs ejecutan todas las vistas en cada interacción)
+    vista = st.radio(
+        "Vista", list(VIEWS), key='vista', horizontal=True, label_visibility='collapsed'
+    )
+    view_args = {
+        "📊 Dashboard Ejecutivo": (df_filtrado, cube_filtrado),
+        "📄 Reporte Detallado": (df_filtrado,),
+        "📈 Diagrama de Gantt": (df_original,),
+        "👤 Personal sin Tareas": (df_original, df_filtrado),
+        "⭐ Reporte General": (df_filtrado,),
+        "🔥 Carga de Trabajo": (df_filtrado,),
+        "🧪 Calidad de Datos": (dataset.issues, df_original),
+        "📉 Tendencias": (SnapshotStore(),),
+    }
+    load_view(*VIEWS[vista])(*view_args[vista])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+from typing import Optional, Tuple
+
+from snapshots import DONE_STATES
+
+BURNDOWN_COLUMNS = ['proyecto', 'fecha', 'alcance', 'completadas', 'pendientes']
+
+def cumulative_counts(keys: np.ndarray, event_days: np.ndarray, n_keys: int, n_days: int) -> np.ndarray:
+    """
+    Matriz (n_keys x n_days) con el número acumulado de eventos de cada clave
+    hasta cada día inclusive. Los eventos se ordenan una vez por (clave, día)
+    codificados en un solo entero y cada celda se obtiene con np.searchsorted,
+    sin recorrer los días. Días negativos cuentan desde el primer día; días
+    >= n_days quedan fuera.
+    """
+    width = n_days + 1
+    days = np.clip(event_days, 0, n_days)
+    encoded = np.sort(keys.astype(np.int64) * width + days)
+    grid = np.arange(n_keys, dtype=np.int64)[:, None] * width + np.arange(n_days, dtype=np.int64)[None, :]
+    starts = np.searchsorted(encoded, np.arange(n_keys, dtype=np.int64) * width, side='left')
+    return np.searchsorted(encoded, grid, side='right') - starts[:, None]
+
+def burndown_events(df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+    """
+    Eventos de alcance y de cierre por tarea a partir de las columnas actuales:
+    una tarea entra en el alcance en su 'fecha_inicio' (o 'fecha_limite' si no
+    tiene inicio) y, si su estado es terminado, se cierra en su 'fecha_limite'
+    (o en su inicio). Devuelve los eventos y el número de tareas sin fechas.
+    """
+    inicio = df['fecha_inicio'].fillna(df['fecha_limite'])
+    cierre = df['fecha_limite'].fillna(df['fecha_inicio'])
+    con_fecha = inicio.notna().to_numpy()
+    events = pd.DataFrame({
+        'proyecto': df['proyecto'].to_numpy()[con_fecha],
+        'alcance': inicio.to_numpy()[con_fecha],
+        'cierre': cierre.where(df['estado'].isin(DONE_STATES)).to_numpy()[con_fecha],
+    })
+    return events, int((~con_fecha).sum())
+
+def compute_burndown(df: pd.DataFrame, desde: Optional[pd.Timestamp] = None,
+                     hasta: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """
+    Alcance acumulado frente a tareas completadas por proyecto y día, en
+    formato largo (proyecto, fecha, alcance, completadas, pendientes). El eje
+    de días va de 'desde' a 'hasta' (inclusive) si se indican y, si no, de la
+    primera a la última fecha de los eventos: la matriz proyectos x días solo
+    cubre el rango que se muestra (los eventos anteriores se acumulan en el
+    primer día y los posteriores se ignoran).
+    """
+    events, _ = burndown_events(df)
+    if events.empty:
+        return pd.DataFrame(columns=BURNDOWN_COLUMNS)
+
+    codes, proyectos = pd.factorize(events['proyecto'], sort=True)
+    # Las tareas sin proyecto se agrupan bajo un código propio al final
+    codes = np.where(codes < 0, len(proyectos), codes)
+    nombres = list(proyectos) + (['(Sin proyecto)'] if (codes == len(proyectos)).any() else [])
+
+    alcance = events['alcance'].to_numpy(dtype='datetime64[D]')
+    cierre = events['cierre'].to_numpy(dtype='datetime64[D]')
+    cerradas = ~np.isnat(cierre)
+    first = alcance.min() if desde is None else np.datetime64(pd.Timestamp(desde).date(), 'D')
+    if hasta is not None:
+        last = np.datetime64(pd.Timestamp(hasta).date(), 'D')
+    else:
+        last = max(alcance.max(), cierre[cerradas].max()) if cerradas.any() else alcance.max()
+    n_days = int((last - first).astype(int)) + 1
+    if n_days <= 0:
+        return pd.DataFrame(columns=BURNDOWN_COLUMNS)
+
+    scope = cumulative_counts(codes, (alcance - first).astype(int), len(nombres), n_days)
+    done = cumulative_counts(codes[cerradas], (cierre[cerradas] - first).astype(int), len(nombres), n_days)
+
+    fechas = pd.date_range(pd.Timestamp(first), periods=n_days, freq='D')
+    return pd.DataFrame({
+        'proyecto': np.repeat(nombres, n_days),
+        'fecha': np.tile(fechas, len(nombres)),
+        'alcance': scope.ravel(),
+        'completadas': done.ravel(),
+        'pendientes': (scope - done).ravel(),
+    })
+
+def total_burndown(burndown: pd.DataFrame) -> pd.DataFrame:
+    """Suma de todos los proyectos por día (índice 'fecha')."""
+    return burndown.groupby('fecha')[['alcance', 'completadas', 'pendientes']].sum()
+
+def velocity(burndown: pd.DataFrame) -> pd.DataFrame:
+    """Tareas completadas por semana (lunes) y proyecto: diferencia del acumulado."""
+    weekly = burndown.pivot(index='fecha', columns='proyecto', values='completadas').resample('W-MON', label='left', closed='left').last()
+    return weekly.diff().fillna(weekly).astype(int)
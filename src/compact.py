@@ -0,0 +1,280 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from typing import Dict, List, Optional, Tuple
+
+# Columnas de baja cardinalidad que se guardan como códigos enteros + diccionario
+CATEGORICAL_COLUMNS = ['area', 'proyecto', 'estado', 'prioridad']
+# Columnas opcionales que también se codifican cuando existen ('space' al federar espacios)
+OPTIONAL_CATEGORICAL_COLUMNS = ['space']
+DATE_COLUMNS = ['fecha_inicio', 'fecha_limite']
+FRAME_COLUMNS = [
+    'id', 'nombre', 'estado', 'asignados', 'fecha_inicio', 'fecha_limite',
+    'prioridad', 'area', 'proyecto', 'parent_id', 'is_subtask'
+]
+
+def _smallest_int_dtype(size: int) -> np.dtype:
+    """Tipo entero con signo más pequeño capaz de indexar 'size' valores (y -1)."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if size < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+def _code_columns(dictionary: str) -> List[str]:
+    """Arreglos de códigos que usan un diccionario."""
+    return {'id': ['id', 'parent_id'], 'asignados': ['asignados_codes']}.get(dictionary, [dictionary])
+
+def _recode(codes: np.ndarray, mapping: np.ndarray) -> np.ndarray:
+    """Traduce códigos (-1 para nulos) con 'mapping' (código anterior -> nuevo)."""
+    return np.append(mapping, -1)[codes]
+
+def _take_ranges(offsets: np.ndarray, values: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Filas 'rows' de un par en formato CSR (desplazamientos + valores concatenados)."""
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    new_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=new_offsets[1:])
+    index = np.repeat(starts - new_offsets[:-1], lengths) + np.arange(new_offsets[-1])
+    return new_offsets, values[index]
+
+def _concat_offsets(offsets: List[np.ndarray]) -> np.ndarray:
+    """Une los desplazamientos de varios pares CSR cuyos valores se concatenan en orden."""
+    shifts = np.cumsum([0] + [o[-1] for o in offsets[:-1]])
+    return np.concatenate([np.zeros(1, dtype=np.int64)] + [o[1:] + shift for o, shift in zip(offsets, shifts)])
+
+def encode_texts(values) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """
+    Codifica textos como un búfer UTF-8 con los desplazamientos (en bytes) de
+    cada valor y, si hay nulos, una máscara de nulos (formato de Arrow).
+    """
+    array = pa.array(np.asarray(values, dtype=object), type=pa.large_string(), from_pandas=True)
+    _, offsets, data = array.buffers()
+    nulls = array.is_null().to_numpy(zero_copy_only=False)
+    return (
+        np.frombuffer(data, dtype=np.uint8).copy() if data is not None else np.zeros(0, dtype=np.uint8),
+        np.frombuffer(offsets, dtype=np.int64)[array.offset:array.offset + len(array) + 1].copy(),
+        nulls if nulls.any() else None,
+    )
+
+def texts_array(data: np.ndarray, offsets: np.ndarray, nulls: Optional[np.ndarray] = None) -> pd.api.extensions.ExtensionArray:
+    """Columna de texto de pandas (respaldada por Arrow) como vista sobre los búferes de 'encode_texts'."""
+    validity = pa.array(~nulls).buffers()[1] if nulls is not None else None
+    array = pa.Array.from_buffers(
+        pa.large_string(), len(offsets) - 1, [validity, pa.py_buffer(offsets), pa.py_buffer(data)],
+        null_count=int(nulls.sum()) if nulls is not None else 0,
+    )
+    return pd.arrays.ArrowStringArray(array)
+
+class CompactTasks:
+    """
+    Representación compacta en memoria de las tareas normalizadas:
+    - columnas de baja cardinalidad como códigos enteros + diccionario;
+    - 'id' y 'parent_id' como claves enteras sobre un diccionario común de ids
+      (-1 para valores nulos);
+    - 'asignados' en formato CSR: 'asignados_offsets' (n + 1) y los códigos de
+      persona de todas las tareas concatenados en 'asignados_codes';
+    - 'nombre' como un búfer UTF-8 ('nombre_texto') con sus desplazamientos
+      ('nombre_offsets') y, si hay nulos, su máscara ('nombre_nulos').
+    Las vistas obtienen DataFrames o columnas decodificadas bajo demanda; el
+    DataFrame completo de 'to_frame' es una vista sobre estos arreglos.
+    """
+    def __init__(self, arrays: Dict[str, np.ndarray], dictionaries: Dict[str, pd.Index], extras: Optional[Dict[str, np.ndarray]] = None):
+        self.arrays = arrays
+        self.dictionaries = dictionaries
+        self.extras = extras or {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'CompactTasks':
+        """Codifica el DataFrame que produce 'load_and_normalize_json'."""
+        arrays, dictionaries = {}, {}
+
+        for col in CATEGORICAL_COLUMNS + [c for c in OPTIONAL_CATEGORICAL_COLUMNS if c in df.columns]:
+            codes, uniques = pd.factorize(df[col], sort=True)
+            arrays[col] = codes.astype(_smallest_int_dtype(len(uniques)))
+            dictionaries[col] = pd.Index(uniques, dtype=object)
+
+        # Diccionario común para id y parent_id (incluye padres inexistentes)
+        key_codes, key_uniques = pd.factorize(pd.concat([df['id'], df['parent_id']], ignore_index=True))
+        key_dtype = _smallest_int_dtype(len(key_uniques))
+        arrays['id'] = key_codes[:len(df)].astype(key_dtype)
+        arrays['parent_id'] = key_codes[len(df):].astype(key_dtype)
+        dictionaries['id'] = pd.Index(key_uniques, dtype=object)
+
+        for col in DATE_COLUMNS:
+            arrays[col] = df[col].to_numpy(dtype='datetime64[ns]')
+        arrays['is_subtask'] = df['is_subtask'].to_numpy(dtype=bool)
+        # Búferes propios: no mantienen vivo el DataFrame original y se
+        # decodifican sin copia como una columna de texto de Arrow
+        data, offsets, nulls = encode_texts(df['nombre'])
+        arrays['nombre_texto'], arrays['nombre_offsets'] = data, offsets
+        if nulls is not None:
+            arrays['nombre_nulos'] = nulls
+
+        # 'asignados' en formato CSR. Las longitudes se cuentan sobre los valores
+        # no nulos ya explotados para que los offsets coincidan con los códigos
+        # (ClickUp puede devolver usuarios sin nombre dentro de la lista)
+        personas = df['asignados'].reset_index(drop=True).explode().dropna()
+        lengths = personas.groupby(level=0).size().reindex(range(len(df)), fill_value=0).to_numpy(dtype=np.int64)
+        person_codes, person_uniques = pd.factorize(personas, sort=True)
+        arrays['asignados_offsets'] = np.concatenate([[0], np.cumsum(lengths)])
+        arrays['asignados_codes'] = person_codes.astype(_smallest_int_dtype(len(person_uniques)))
+        dictionaries['asignados'] = pd.Index(person_uniques, dtype=object)
+
+        extras = {
+            col: df[col].to_numpy(copy=True)
+            for col in df.columns if col not in FRAME_COLUMNS and col not in arrays
+        }
+        return cls(arrays, dictionaries, extras)
+
+    @classmethod
+    def concat(cls, parts: List['CompactTasks']) -> 'CompactTasks':
+        """
+        Une varias representaciones con las mismas columnas. Los diccionarios
+        se reúnen (los ordenados siguen ordenados) y solo se traducen los
+        códigos enteros, sin volver a codificar los valores originales.
+        """
+        arrays, dictionaries = {}, {}
+        for name in parts[0].dictionaries:
+            union = parts[0].dictionaries[name]
+            for part in parts[1:]:
+                index = part.dictionaries[name]
+                # Las claves de tareas conservan el orden de aparición; el resto, orden alfabético
+                union = union.append(index[~index.isin(union)]) if name == 'id' else union.union(index)
+            union = pd.Index(union, dtype=object)
+            dictionaries[name] = union
+            dtype = _smallest_int_dtype(len(union))
+            for col in _code_columns(name):
+                arrays[col] = np.concatenate([
+                    _recode(part.arrays[col], union.get_indexer(part.dictionaries[name])) for part in parts
+                ]).astype(dtype)
+
+        arrays['asignados_offsets'] = _concat_offsets([part.arrays['asignados_offsets'] for part in parts])
+        arrays['nombre_offsets'] = _concat_offsets([part.arrays['nombre_offsets'] for part in parts])
+        if any('nombre_nulos' in part.arrays for part in parts):
+            arrays['nombre_nulos'] = np.concatenate([
+                part.arrays.get('nombre_nulos', np.zeros(len(part), dtype=bool)) for part in parts
+            ])
+        for name in parts[0].arrays:
+            if name not in arrays:
+                arrays[name] = np.concatenate([part.arrays[name] for part in parts])
+        extras = {name: np.concatenate([part.extras[name] for part in parts]) for name in parts[0].extras}
+        return cls(arrays, dictionaries, extras)
+
+    def take(self, rows: np.ndarray) -> 'CompactTasks':
+        """
+        Nueva representación con las filas 'rows' (en ese orden). Los
+        diccionarios se reducen a los valores que siguen en uso.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        arrays = {}
+        arrays['nombre_offsets'], arrays['nombre_texto'] = _take_ranges(self.arrays['nombre_offsets'], self.arrays['nombre_texto'], rows)
+        arrays['asignados_offsets'], arrays['asignados_codes'] = _take_ranges(self.arrays['asignados_offsets'], self.arrays['asignados_codes'], rows)
+        for name, values in self.arrays.items():
+            if name not in arrays:
+                arrays[name] = values[rows]
+
+        dictionaries = {}
+        for name, index in self.dictionaries.items():
+            columns = _code_columns(name)
+            # La última posición recoge los nulos (-1)
+            used = np.zeros(len(index) + 1, dtype=bool)
+            for col in columns:
+                used[arrays[col]] = True
+            used = used[:-1]
+            if used.all():
+                dictionaries[name] = index
+                continue
+            mapping = np.cumsum(used) - 1
+            mapping[~used] = -1
+            dictionaries[name] = index[used]
+            for col in columns:
+                arrays[col] = _recode(arrays[col], mapping).astype(_smallest_int_dtype(int(used.sum())))
+        extras = {name: values[rows] for name, values in self.extras.items()}
+        return type(self)(arrays, dictionaries, extras)
+
+    def __len__(self) -> int:
+        return len(self.arrays['is_subtask'])
+
+    @property
+    def personas(self) -> pd.Index:
+        """Diccionario de todas las personas asignadas en el conjunto."""
+        return self.dictionaries['asignados']
+
+    def _rows(self, rows: Optional[np.ndarray]) -> np.ndarray:
+        return np.arange(len(self)) if rows is None else np.asarray(rows)
+
+    def column(self, name: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Decodifica una columna (opcionalmente solo algunas filas) a valores
+        originales. Sin 'rows', las columnas numéricas, de fecha y los códigos
+        de las categorías son vistas de los arreglos (sin copia).
+        """
+        if name == 'asignados':
+            return self.asignados(rows)
+        if name == 'nombre':
+            nombres = texts_array(self.arrays['nombre_texto'], self.arrays['nombre_offsets'], self.arrays.get('nombre_nulos'))
+            return nombres if rows is None else nombres.take(np.asarray(rows))
+        source = self.extras if name in self.extras else self.arrays
+        values = source[name] if rows is None else source[name][np.asarray(rows)]
+        if name in self.dictionaries and name != 'id':
+            return pd.Categorical.from_codes(values, categories=self.dictionaries[name])
+        if name in ('id', 'parent_id'):
+            decoded = self.dictionaries['id'].to_numpy()[np.maximum(values, 0)]
+            return np.where(values >= 0, decoded, None)
+        return values
+
+    def asignados(self, rows: Optional[np.ndarray] = None) -> List[list]:
+        """
+        Decodifica las listas de asignados. Los nombres son los objetos del
+        diccionario de personas y las tareas con los mismos asignados comparten
+        una única lista, por lo que no se duplican en memoria (las listas no
+        deben modificarse en el lugar).
+        """
+        rows = self._rows(rows)
+        offsets = self.arrays['asignados_offsets']
+        nombres = self.personas.to_numpy()[self.arrays['asignados_codes']].tolist()
+        shared = {}
+        result = []
+        for start, end in zip(offsets[rows].tolist(), offsets[rows + 1].tolist()):
+            key = tuple(nombres[start:end])
+            lista = shared.get(key)
+            if lista is None:
+                lista = shared[key] = list(key)
+            result.append(lista)
+        return result
+
+    def explode_asignados(self, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        Devuelve una fila por (tarea, persona) sin construir listas de Python:
+        'fila' es la posición de la tarea y 'persona' el nombre decodificado.
+        """
+        rows = self._rows(rows)
+        offsets = self.arrays['asignados_offsets']
+        starts, lengths = offsets[rows], offsets[rows + 1] - offsets[rows]
+        fila = np.repeat(rows, lengths)
+        # Posiciones en el arreglo CSR: inicio de cada tarea + desplazamiento dentro de ella
+        within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        codes = self.arrays['asignados_codes'][np.repeat(starts, lengths) + within]
+        return pd.DataFrame({'fila': fila, 'persona': pd.Categorical.from_codes(codes, categories=self.personas)})
+
+    def to_frame(self, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        Materializa el DataFrame con el mismo esquema del cargador: columnas de
+        baja cardinalidad como 'category' y textos compartidos con los diccionarios.
+        """
+        data = {col: self.column(col, rows) for col in FRAME_COLUMNS}
+        # Las claves se mantienen como objetos con None para los faltantes
+        # (pandas 3 inferiría un tipo de texto con NaN)
+        for col in ('id', 'parent_id'):
+            data[col] = pd.Series(data[col], dtype=object, copy=False)
+        data.update({col: self.column(col, rows) for col in OPTIONAL_CATEGORICAL_COLUMNS if col in self.arrays})
+        data.update({col: self.column(col, rows) for col in self.extras})
+        # Sin copia: el DataFrame completo comparte los arreglos de la representación
+        return pd.DataFrame(data, copy=False)
+
+    def nbytes(self) -> int:
+        """Memoria aproximada de la representación compacta (arreglos + diccionarios)."""
+        total = sum(arr.nbytes for arr in self.arrays.values())
+        total += sum(int(d.memory_usage(deep=True)) for d in self.dictionaries.values())
+        total += sum(int(pd.Series(arr).memory_usage(deep=True, index=False)) for arr in self.extras.values())
+        return total
@@ -0,0 +1,58 @@
+import io
+import gzip
+import pandas as pd
+from typing import Iterator
+
+# Formatos de datos para cargas masivas: extensión del archivo y tipo MIME
+DATA_FORMATS = {
+    'csv': ('csv.gz', 'application/gzip'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'arrow': ('arrow', 'application/vnd.apache.arrow.file'),
+}
+# Filas por bloque al escribir el CSV
+CSV_CHUNK_ROWS = 20000
+# Compresión de Parquet y Arrow (zstd: archivos pequeños y lectura rápida)
+COLUMNAR_COMPRESSION = 'zstd'
+
+def iter_csv_chunks(frame: pd.DataFrame, chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[str]:
+    """
+    Texto CSV del DataFrame por bloques de 'chunk_rows' filas: el encabezado
+    va en el primer bloque y las fechas en formato ISO (AAAA-MM-DD).
+    """
+    for start in range(0, max(len(frame), 1), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows].to_csv(index=False, header=start == 0, date_format='%Y-%m-%d')
+
+def to_csv_gz(frame: pd.DataFrame, chunk_rows: int = CSV_CHUNK_ROWS) -> bytes:
+    """CSV (UTF-8) comprimido con gzip, escrito bloque a bloque sin generar el texto completo."""
+    output = io.BytesIO()
+    with gzip.GzipFile(fileobj=output, mode='wb', compresslevel=6, mtime=0) as stream:
+        for chunk in iter_csv_chunks(frame, chunk_rows):
+            stream.write(chunk.encode('utf-8'))
+    return output.getvalue()
+
+def to_parquet(frame: pd.DataFrame) -> bytes:
+    """Archivo Parquet comprimido (requiere pyarrow)."""
+    output = io.BytesIO()
+    frame.to_parquet(output, engine='pyarrow', compression=COLUMNAR_COMPRESSION, index=False)
+    return output.getvalue()
+
+def to_arrow(frame: pd.DataFrame) -> bytes:
+    """Archivo Arrow IPC (formato 'file', legible con pyarrow.ipc.open_file) con compresión."""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=COLUMNAR_COMPRESSION)
+    with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def export_data(frame: pd.DataFrame, data_format: str) -> bytes:
+    """Bytes del DataFrame en uno de los formatos de DATA_FORMATS."""
+    if data_format == 'csv':
+        return to_csv_gz(frame)
+    if data_format == 'parquet':
+        return to_parquet(frame)
+    if data_format == 'arrow':
+        return to_arrow(frame)
+    raise ValueError(f"Formato de datos desconocido: {data_format}")
@@ -1,81 +1,214 @@
-import pandas as pd
-import json
-from typing import List, Dict, Any
-
-def parse_and_correct_date(date_str):
-    """
-    Parsea una cadena de fecha DD/MM/YY y maneja explícitamente los años de dos dígitos
-    para asegurar que se interpreten como fechas del siglo XXI.
-    """
-    if pd.isna(date_str) or not isinstance(date_str, str):
-        return pd.NaT
-    try:
-        # Dividir la fecha para manejar el año manualmente
-        parts = date_str.split('/')
-        if len(parts) != 3:
-            return pd.NaT
-        
-        day, month, year_str = parts
-        year = int(year_str)
-        
-        # Corregir años de dos dígitos (ej: 25 -> 2025)
-        if year < 100:
-            year += 2000
-
-        # Reconstruir la fecha con el año corregido y convertirla
-        return pd.to_datetime(f"{day}/{month}/{year}", format='%d/%m/%Y')
-
-    except (ValueError, TypeError):
-        return pd.NaT
-
-def load_and_normalize_json(file_path: str) -> pd.DataFrame:
-    """
-    Carga un archivo JSON, procesa su estructura anidada de tareas y subtareas,
-    y lo convierte en un DataFrame de Pandas, preservando la relación jerárquica.
-    """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    all_tasks = []
-    
-    for area, proyectos in data.items():
-        for proyecto, detalles_proyecto in proyectos.items():
-            if detalles_proyecto and isinstance(detalles_proyecto, dict):
-                task_container = next(iter(detalles_proyecto.values()), None)
-                if task_container and isinstance(task_container, dict):
-                    for estado, tareas in task_container.items():
-                        for tarea in tareas:
-                            # Procesar la tarea principal
-                            processed_task = tarea.copy()
-                            processed_task['area'] = area
-                            processed_task['proyecto'] = proyecto
-                            processed_task['parent_id'] = None
-                            processed_task['is_subtask'] = False
-                            
-                            subtasks = processed_task.pop('subtareas', [])
-                            all_tasks.append(processed_task)
-
-                            # Procesar las subtareas asociadas
-                            for i, subtask in enumerate(subtasks):
-                                processed_subtask = subtask.copy()
-                                processed_subtask['area'] = area
-                                processed_subtask['proyecto'] = proyecto
-                                processed_subtask['parent_id'] = tarea.get('id')
-                                # Generar un ID único y estable para la subtarea
-                                processed_subtask['id'] = f"sub_{tarea.get('id')}_{i}"
-                                processed_subtask['is_subtask'] = True
-                                all_tasks.append(processed_subtask)
-
-    if not all_tasks:
-        return pd.DataFrame()
-
-    df = pd.DataFrame(all_tasks)
-
-    # Limpieza y estandarización de datos usando la nueva función robusta
-    date_columns = ['fecha_inicio', 'fecha_limite']
-    for col in date_columns:
-        df[col] = df[col].apply(parse_and_correct_date)
-
-    df['asignados'] = df['asignados'].apply(lambda x: x if isinstance(x, list) else [])
-
-    return df
+import numpy as np
+import pandas as pd
+import json
+from typing import List, Dict, Any
+
+def parse_and_correct_date(date_str):
+    """
+    Parsea una cadena de fecha DD/MM/YY y maneja explícitamente los años de dos dígitos
+    para asegurar que se interpreten como fechas del siglo XXI.
+    """
+    if pd.isna(date_str) or not isinstance(date_str, str):
+        return pd.NaT
+    try:
+        # Dividir la fecha para manejar el año manualmente
+        parts = date_str.split('/')
+        if len(parts) != 3:
+            return pd.NaT
+        
+        day, month, year_str = parts
+        year = int(year_str)
+        
+        # Corregir años de dos dígitos (ej: 25 -> 2025)
+        if year < 100:
+            year += 2000
+
+        # Reconstruir la fecha con el año corregido y convertirla
+        return pd.to_datetime(f"{day}/{month}/{year}", format='%d/%m/%Y')
+
+    except (ValueError, TypeError):
+        return pd.NaT
+
+# Reglas de validación: código -> descripción para el reporte de calidad
+VALIDATION_RULES = {
+    'fecha_invalida': 'Fecha con formato inválido (se tomó como vacía)',
+    'asignados_no_lista': "'asignados' no es una lista (se tomó como vacía)",
+    'asignado_nulo': "'asignados' contiene un usuario nulo (se omite)",
+    'id_faltante': 'Tarea principal sin id',
+    'id_duplicado': 'Id de tarea duplicado',
+    'subtarea_huerfana': 'Subtarea cuya tarea padre no existe',
+    'fecha_limite_anterior': 'Fecha límite anterior a la fecha de inicio',
+}
+ISSUE_COLUMNS = ['fila', 'id', 'columna', 'regla', 'descripcion', 'valor']
+
+def parse_dates_vectorized(values: pd.Series) -> pd.Series:
+    """
+    Versión vectorizada de 'parse_and_correct_date' para una columna completa:
+    extrae día, mes y año con una expresión regular y corrige los años de dos
+    dígitos al siglo XXI. Como int() en la versión original, el año admite
+    espacios alrededor. Los valores que no cumplen el formato (incluidos los
+    dígitos no ASCII) quedan en NaT en lugar de interrumpir la carga.
+    """
+    parts = values.astype(object).str.extract(r'^([0-9]{1,2})/([0-9]{1,2})/\s*([0-9]{1,4})\s*$')
+    day, month, year = (pd.to_numeric(parts[i], errors='coerce') for i in range(3))
+    year = year.where(year >= 100, year + 2000)
+    # Como el formato '%Y' del original, los años de tres dígitos no son válidos
+    year = year.where(year >= 1000)
+    return pd.to_datetime(pd.DataFrame({'year': year, 'month': month, 'day': day}), errors='coerce')
+
+def _issues_for(mask: pd.Series, df: pd.DataFrame, column: str, rule: str, values: pd.Series = None) -> pd.DataFrame:
+    """Construye las filas del reporte de incidencias para una máscara booleana."""
+    rows = np.flatnonzero(mask.to_numpy())
+    valores = (values if values is not None else df[column]).iloc[rows]
+    return pd.DataFrame({
+        'fila': rows,
+        'id': df['id'].iloc[rows].to_numpy(),
+        'columna': column,
+        'regla': rule,
+        'descripcion': VALIDATION_RULES[rule],
+        'valor': valores.astype(str).to_numpy(),
+    })
+
+def row_issues(df: pd.DataFrame, raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Incidencias que dependen solo de cada fila (fechas, asignados, id
+    faltante, fecha límite anterior al inicio). Pueden calcularse por partes:
+    'fila' es la posición dentro de 'df'.
+    """
+    # Listas de asignados con algún elemento nulo: menos valores no nulos que elementos
+    asignados = df['asignados'].reset_index(drop=True)
+    no_nulos = asignados.explode().notna().groupby(level=0).sum().reindex(range(len(df)), fill_value=0)
+    asignado_nulo = pd.Series(asignados.str.len().fillna(0).to_numpy() > no_nulos.to_numpy())
+    checks = [
+        _issues_for(raw['fecha_inicio'].notna() & df['fecha_inicio'].isna(), df, 'fecha_inicio', 'fecha_invalida', raw['fecha_inicio']),
+        _issues_for(raw['fecha_limite'].notna() & df['fecha_limite'].isna(), df, 'fecha_limite', 'fecha_invalida', raw['fecha_limite']),
+        _issues_for(raw['asignados'].notna() & ~raw['asignados_es_lista'], df, 'asignados', 'asignados_no_lista', raw['asignados']),
+        _issues_for(asignado_nulo, df, 'asignados', 'asignado_nulo'),
+        _issues_for(df['id'].isna() & ~df['is_subtask'], df, 'id', 'id_faltante'),
+        _issues_for(df['fecha_limite'] < df['fecha_inicio'], df, 'fecha_limite', 'fecha_limite_anterior'),
+    ]
+    return pd.concat(checks, ignore_index=True)[ISSUE_COLUMNS]
+
+def key_issues(df: pd.DataFrame) -> pd.DataFrame:
+    """Incidencias que cruzan filas de todo el conjunto: ids duplicados y subtareas huérfanas."""
+    ids = df['id']
+    main_ids = ids[~df['is_subtask']].dropna()
+    checks = [
+        _issues_for(ids.notna() & ids.duplicated(keep=False), df, 'id', 'id_duplicado'),
+        _issues_for(df['is_subtask'] & ~df['parent_id'].isin(main_ids), df, 'parent_id', 'subtarea_huerfana'),
+    ]
+    return pd.concat(checks, ignore_index=True)[ISSUE_COLUMNS]
+
+def merge_issues(row: pd.DataFrame, key: pd.DataFrame) -> pd.DataFrame:
+    """Une las incidencias por fila y las de todo el conjunto, ordenadas por fila."""
+    issues = pd.concat([row, key], ignore_index=True)
+    return issues.sort_values('fila', kind='stable', ignore_index=True)[ISSUE_COLUMNS]
+
+def validate_tasks(df: pd.DataFrame, raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Valida el DataFrame normalizado con comprobaciones vectorizadas (sin bucles
+    por fila) y devuelve una tabla compacta de incidencias (fila, columna, regla).
+    'raw' contiene los valores originales de las columnas que la normalización
+    corrige en silencio (fechas y asignados).
+    """
+    return merge_issues(row_issues(df, raw), key_issues(df))
+
+def flatten_project(area: str, proyecto: str, detalles_proyecto) -> list:
+    """
+    Aplana un proyecto (lista de ClickUp) en registros de tareas y subtareas,
+    preservando la relación jerárquica mediante 'parent_id'.
+    """
+    tasks = []
+    if detalles_proyecto and isinstance(detalles_proyecto, dict):
+        task_container = next(iter(detalles_proyecto.values()), None)
+        if task_container and isinstance(task_container, dict):
+            for estado, tareas in task_container.items():
+                for tarea in tareas:
+                    # Procesar la tarea principal
+                    processed_task = tarea.copy()
+                    processed_task['area'] = area
+                    processed_task['proyecto'] = proyecto
+                    processed_task['parent_id'] = None
+                    processed_task['is_subtask'] = False
+                    
+                    subtasks = processed_task.pop('subtareas', [])
+                    tasks.append(processed_task)
+
+                    # Procesar las subtareas asociadas
+                    for i, subtask in enumerate(subtasks):
+                        processed_subtask = subtask.copy()
+                        processed_subtask['area'] = area
+                        processed_subtask['proyecto'] = proyecto
+                        processed_subtask['parent_id'] = tarea.get('id')
+                        # Generar un ID único y estable para la subtarea
+                        processed_subtask['id'] = f"sub_{tarea.get('id')}_{i}"
+                        processed_subtask['is_subtask'] = True
+                        tasks.append(processed_subtask)
+    return tasks
+
+def normalize_tasks(all_tasks: list):
+    """
+    Convierte los registros aplanados en el DataFrame normalizado. Devuelve
+    (df, raw), donde 'raw' conserva los valores originales que la limpieza
+    corrige en silencio (para la validación de calidad).
+    """
+    df = pd.DataFrame(all_tasks)
+
+    # Conservar los valores originales que la limpieza corrige en silencio
+    asignados_es_lista = df['asignados'].map(type) == list
+    raw = pd.DataFrame({
+        'fecha_inicio': df['fecha_inicio'],
+        'fecha_limite': df['fecha_limite'],
+        'asignados': df['asignados'],
+        'asignados_es_lista': asignados_es_lista,
+    })
+
+    # Limpieza y estandarización de datos con el parseo vectorizado de fechas
+    date_columns = ['fecha_inicio', 'fecha_limite']
+    for col in date_columns:
+        df[col] = parse_dates_vectorized(df[col])
+
+    # Ids faltantes como None en columnas de objetos (pandas 3 infiere un
+    # tipo de texto cuyo valor faltante es NaN)
+    for col in ['id', 'parent_id']:
+        df[col] = df[col].astype(object).where(df[col].notna(), None)
+
+    if not asignados_es_lista.all():
+        df['asignados'] = df['asignados'].where(asignados_es_lista, pd.Series([[] for _ in range(len(df))], index=df.index))
+
+    return df, raw
+
+def read_tasks(file_path: str):
+    """
+    Lee y aplana un archivo JSON de tareas. Devuelve (df, raw) como
+    'normalize_tasks', o (None, None) si el archivo no contiene tareas.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    all_tasks = []
+    
+    for area, proyectos in data.items():
+        for proyecto, detalles_proyecto in proyectos.items():
+            all_tasks.extend(flatten_project(area, proyecto, detalles_proyecto))
+
+    if not all_tasks:
+        return None, None
+    return normalize_tasks(all_tasks)
+
+def load_and_normalize_json(file_path: str, with_issues: bool = False):
+    """
+    Carga un archivo JSON, procesa su estructura anidada de tareas y subtareas,
+    y lo convierte en un DataFrame de Pandas, preservando la relación jerárquica.
+    Con with_issues=True devuelve también la tabla de incidencias de calidad
+    de datos: (df, issues).
+    """
+    df, raw = read_tasks(file_path)
+
+    if df is None:
+        empty = pd.DataFrame()
+        return (empty, pd.DataFrame(columns=ISSUE_COLUMNS)) if with_issues else empty
+
+    if with_issues:
+        return df, validate_tasks(df, raw)
+    return df
@@ -0,0 +1,94 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+from typing import Optional
+from data_loader import ISSUE_COLUMNS
+from federation import load_tasks
+from rollup import RollupCube
+from options_index import OptionsIndex
+from compact import CompactTasks
+from sql_backend import SqlBackend, dataset_database
+
+# Motor SQL opcional para filtros y agregaciones ('sqlite' o 'duckdb'; vacío = pandas)
+SQL_BACKEND = os.environ.get('REPORTE_BACKEND', '')
+# Base de datos del motor: en memoria o un archivo local (cada versión de los
+# datos usa su propio archivo derivado de este nombre, borrado al liberarla)
+SQL_DATABASE = os.environ.get('REPORTE_BACKEND_DB', ':memory:')
+
+class Dataset:
+    """
+    Conjunto de datos cargado: el DataFrame normalizado de tareas junto con
+    las estructuras precalculadas en la carga que reutilizan las vistas.
+    La representación compacta es el almacenamiento principal; 'df' es una
+    vista sobre sus arreglos (el DataFrame original del cargador no se conserva).
+    """
+    def __init__(self, df: Optional[pd.DataFrame], issues: Optional[pd.DataFrame] = None,
+                 compact: Optional[CompactTasks] = None, cube: Optional[RollupCube] = None,
+                 options: Optional[OptionsIndex] = None, backend: Optional[SqlBackend] = None):
+        if df is None:
+            df = pd.DataFrame()
+        if compact is None and not df.empty:
+            compact = CompactTasks.from_frame(df)
+        self.compact = compact
+        self.df = self.compact.to_frame() if self.compact is not None else df
+        self.issues = issues if issues is not None else pd.DataFrame(columns=ISSUE_COLUMNS)
+        # El cubo y las opciones pueden llegar ya calculados (p. ej. de una recarga incremental)
+        self.cube = cube if cube is not None else RollupCube.from_dataframe(self.df)
+        self.options = options if options is not None else OptionsIndex.from_frame(self.df)
+        self.backend = backend
+        if self.backend is None and SQL_BACKEND and self.compact is not None:
+            self.backend = SqlBackend.from_dataframe(self.df, dataset_database(SQL_DATABASE), SQL_BACKEND, temporary=True)
+
+    @classmethod
+    def from_compact(cls, compact: CompactTasks, issues: Optional[pd.DataFrame] = None,
+                     cube: Optional[RollupCube] = None, options: Optional[OptionsIndex] = None,
+                     backend: Optional[SqlBackend] = None) -> 'Dataset':
+        """
+        Dataset sobre una representación compacta ya construida (p. ej.
+        adjuntada de memoria compartida), con las estructuras derivadas que
+        ya se hayan calculado; las que falten se construyen.
+        """
+        return cls(None, issues, compact, cube, options, backend)
+
+    @property
+    def empty(self) -> bool:
+        return self.df.empty
+
+    def nbytes(self) -> int:
+        """
+        Memoria aproximada de las tareas: la representación compacta más las
+        columnas del DataFrame que no son vistas sobre ella ('id' y
+        'parent_id' decodificados y las listas de asignados, cuyos textos
+        son los de los diccionarios).
+        """
+        if self.compact is None:
+            return int(self.df.memory_usage(deep=True, index=False).sum())
+        shared = list(self.compact.arrays.values()) + list(self.compact.extras.values())
+        total = self.compact.nbytes()
+        addresses = {arr.ctypes.data for arr in shared if arr.dtype != object and arr.size}
+        for col in self.df.columns:
+            values = self.df[col].array
+            if isinstance(values, pd.arrays.ArrowStringArray):
+                # Texto de Arrow: es una vista si sus búferes son los de la representación
+                buffers = values.__arrow_array__().chunk(0).buffers() if values.__arrow_array__().num_chunks == 1 else []
+                if not any(b is not None and b.address in addresses for b in buffers):
+                    total += values.nbytes
+                continue
+            values = values.codes if isinstance(values, pd.Categorical) else values.to_numpy()
+            if not any(np.shares_memory(values, arr) for arr in shared):
+                total += values.nbytes
+        # Las tareas con los mismos asignados comparten una única lista
+        listas = {id(lista): lista for lista in self.df['asignados']}
+        total += sum(sys.getsizeof(lista) for lista in listas.values())
+        return total
+
+
+def load_dataset(file_path: str) -> Dataset:
+    """
+    Carga y normaliza el JSON de tareas (con su validación de calidad) y
+    precalcula sus estructuras derivadas. 'file_path' puede ser también un
+    directorio o patrón glob con varias exportaciones de espacio.
+    """
+    df, issues = load_tasks(file_path, with_issues=True)
+    return Dataset(df, issues)
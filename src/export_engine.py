@@ -0,0 +1,357 @@
+import io
+import numpy as np
+import pandas as pd
+import xlsxwriter
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, Union
+
+# Formatos compartidos por los reportes
+HEADER_FORMAT = {'bold': True, 'bg_color': '#4472C4', 'font_color': 'white', 'border': 1, 'align': 'center'}
+LIGHT_HEADER_FORMAT = {'bold': True, 'bg_color': '#F2F2F2', 'border': 1}
+TITLE_FORMAT = {'bold': True, 'font_size': 16, 'bg_color': '#2F5597', 'font_color': 'white', 'align': 'center', 'border': 1}
+SUBTITLE_FORMAT = {'font_size': 11, 'bg_color': '#D9E2F3', 'border': 1, 'align': 'center'}
+NOTE_TITLE_FORMAT = {'bold': True, 'font_size': 12, 'bg_color': '#E6F2FF'}
+DATE_FORMAT = 'dd/mm/yyyy'
+# Origen de los números de serie de fecha de Excel (sistema 1900)
+EXCEL_EPOCH = pd.Timestamp('1899-12-30')
+
+
+class Column:
+    """
+    Columna de una hoja: encabezado, origen del valor (nombre de columna del
+    DataFrame o función que recibe el DataFrame y devuelve los valores), tipo
+    ('text', 'number' o 'date'), ancho, formato de celda opcional y formato de
+    encabezado propio (por defecto, el de la hoja).
+    """
+    def __init__(self, header: str, source: Union[str, Callable[[pd.DataFrame], Sequence], None] = None,
+                 kind: str = 'text', width: float = 15, cell_format: Optional[dict] = None,
+                 header_format: Optional[dict] = None):
+        if kind not in ('text', 'number', 'date'):
+            raise ValueError(f"Tipo de columna desconocido: {kind}")
+        self.header = header
+        self.source = source if source is not None else header
+        self.kind = kind
+        self.width = width
+        self.cell_format = cell_format
+        self.header_format = header_format
+
+    def values(self, df: pd.DataFrame) -> pd.Series:
+        values = self.source(df) if callable(self.source) else df[self.source]
+        return pd.Series(values, index=df.index) if not isinstance(values, pd.Series) else values
+
+
+class Chart:
+    """
+    Gráfico nativo de Excel. Las series indican 'categories' y 'values' por el
+    encabezado de la columna (y 'name' como texto); el motor las convierte en
+    rangos de la tabla escrita. El resto de claves se pasan a xlsxwriter.
+    """
+    def __init__(self, options: dict, series: List[dict], anchor: Union[str, Tuple[int, int]],
+                 title: Optional[dict] = None, x_axis: Optional[dict] = None, y_axis: Optional[dict] = None,
+                 size: Optional[dict] = None, legend: Optional[dict] = None, insert_options: Optional[dict] = None):
+        self.options = options
+        self.series = series
+        self.anchor = anchor
+        self.title = title
+        self.x_axis = x_axis
+        self.y_axis = y_axis
+        self.size = size
+        self.legend = legend
+        self.insert_options = insert_options or {}
+
+
+class ConditionalFormat:
+    """
+    Formato condicional de Excel (p. ej. una escala de color) sobre las filas
+    de datos de las columnas indicadas por encabezado, de la primera a la
+    última; sin columnas, sobre toda la tabla. 'options' se pasa a xlsxwriter.
+    """
+    def __init__(self, options: dict, columns: Optional[List[str]] = None):
+        self.options = options
+        self.columns = columns
+
+
+class Image:
+    """
+    Imagen (PNG, JPEG...) insertada en la celda 'anchor', con un título
+    opcional en esa celda: la imagen se coloca entonces en la fila siguiente.
+    """
+    def __init__(self, data: bytes, anchor: Tuple[int, int], title: Optional[str] = None,
+                 title_format: Optional[dict] = None, insert_options: Optional[dict] = None):
+        self.data = data
+        self.anchor = anchor
+        self.title = title
+        self.title_format = title_format
+        self.insert_options = insert_options or {}
+
+
+class SheetSpec:
+    """
+    Especificación declarativa de una hoja: columnas, tabla nativa o filtro
+    automático, título y subtítulo opcionales (celdas combinadas sobre la
+    tabla), gráficos y notas finales. Los gráficos se declaran como funciones
+    que reciben la posición de la tabla escrita (TablePlacement) y devuelven
+    un Chart, de modo que pueden depender del número de filas. También admite
+    formatos condicionales sobre la tabla e imágenes (p. ej. gráficos de
+    Plotly renderizados).
+    """
+    def __init__(self, name: str, columns: List[Column], header_format: Optional[dict] = None,
+                 native_table: bool = False, table_style: str = 'Table Style Medium 9', autofilter: bool = False,
+                 title: Optional[str] = None, subtitle: Optional[Callable[[pd.DataFrame], str]] = None,
+                 title_width: int = 8, charts: Optional[List[Callable[['TablePlacement'], Chart]]] = None,
+                 notes: Optional[Callable[[pd.DataFrame], List[str]]] = None, notes_title: Optional[str] = None,
+                 date_format: str = DATE_FORMAT, empty_message: Optional[str] = None, freeze_header: bool = False,
+                 conditional_formats: Optional[List[ConditionalFormat]] = None, images: Optional[List[Image]] = None,
+                 header_height: Optional[float] = None, freeze_columns: int = 0):
+        self.name = name
+        self.columns = columns
+        self.header_format = header_format
+        self.native_table = native_table
+        self.table_style = table_style
+        self.autofilter = autofilter
+        self.title = title
+        self.subtitle = subtitle
+        self.title_width = title_width
+        self.charts = charts or []
+        self.notes = notes
+        self.notes_title = notes_title
+        self.date_format = date_format
+        self.empty_message = empty_message
+        self.freeze_header = freeze_header
+        self.conditional_formats = conditional_formats or []
+        self.images = images or []
+        self.header_height = header_height
+        self.freeze_columns = freeze_columns
+
+
+class TablePlacement:
+    """Posición de una tabla escrita: permite referenciar el rango de una columna por su encabezado."""
+    def __init__(self, sheet_name: str, header_row: int, first_col: int, headers: List[str], n_rows: int):
+        self.sheet_name = sheet_name
+        self.header_row = header_row
+        self.first_col = first_col
+        self.headers = headers
+        self.n_rows = n_rows
+
+    @property
+    def last_row(self) -> int:
+        return self.header_row + self.n_rows
+
+    def col(self, header: str) -> int:
+        return self.first_col + self.headers.index(header)
+
+    def range(self, header: str) -> list:
+        col = self.col(header)
+        return [self.sheet_name, self.header_row + 1, col, self.last_row, col]
+
+    def header_cell(self, header: str) -> list:
+        return [self.sheet_name, self.header_row, self.col(header)]
+
+
+class FormatCache:
+    """Crea cada formato una sola vez por libro (add_format por propiedades)."""
+    def __init__(self, workbook: xlsxwriter.Workbook):
+        self.workbook = workbook
+        self._formats = {}
+
+    def get(self, properties: Optional[dict]):
+        if not properties:
+            return None
+        key = tuple(sorted(properties.items()))
+        if key not in self._formats:
+            self._formats[key] = self.workbook.add_format(properties)
+        return self._formats[key]
+
+
+def text_values(values: pd.Series) -> np.ndarray:
+    """Valores de texto (None para los nulos), sin pasar por la detección de tipos de write()."""
+    values = values.astype(object)
+    return np.where(values.notna().to_numpy(), values.astype(str).to_numpy(), None)
+
+def write_column_values(worksheet, row: int, col: int, column: Column, values: pd.Series, cell_format, date_format):
+    """
+    Escritura masiva de una columna con el método específico de su tipo
+    (write_string o write_number). Las fechas se convierten de forma vectorizada
+    a números de serie de Excel con formato de fecha, que es lo que escribe
+    write_datetime celda a celda. Los nulos se dejan en blanco (con el formato
+    de celda, si lo hay, para conservar los bordes).
+    """
+    if column.kind == 'date':
+        items = ((pd.to_datetime(values) - EXCEL_EPOCH) / pd.Timedelta(days=1)).to_numpy(dtype=float)
+        present = ~np.isnan(items)
+        fmt = date_format
+        write = worksheet.write_number
+    elif column.kind == 'number':
+        items = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+        present = ~np.isnan(items)
+        fmt = cell_format
+        write = worksheet.write_number
+    else:
+        items = text_values(values)
+        present = np.array([value is not None and value != '' for value in items], dtype=bool)
+        fmt = cell_format
+        write = worksheet.write_string
+
+    for offset, (item, ok) in enumerate(zip(items, present)):
+        if ok:
+            write(row + offset, col, item, fmt)
+        elif fmt is not None:
+            worksheet.write_blank(row + offset, col, None, fmt)
+
+def write_table(workbook: xlsxwriter.Workbook, worksheet, formats: FormatCache, spec: SheetSpec,
+                df: pd.DataFrame, row: int = 0, col: int = 0) -> TablePlacement:
+    """
+    Escribe encabezados y datos de las columnas de 'spec' a partir de (row, col)
+    y devuelve la posición de la tabla. Se usa tanto para hojas completas como
+    para bloques repetidos dentro de una hoja.
+    """
+    headers = [column.header for column in spec.columns]
+    if not spec.native_table:
+        for offset, column in enumerate(spec.columns):
+            worksheet.write_string(row, col + offset, column.header, formats.get(column.header_format or spec.header_format))
+
+    for offset, column in enumerate(spec.columns):
+        cell_format = formats.get(column.cell_format)
+        date_format = formats.get(dict(column.cell_format or {}, num_format=spec.date_format))
+        write_column_values(worksheet, row + 1, col + offset, column, column.values(df), cell_format, date_format)
+
+    placement = TablePlacement(worksheet.name, row, col, headers, len(df))
+    if spec.native_table:
+        worksheet.add_table(row, col, max(placement.last_row, row + 1), col + len(headers) - 1, {
+            'columns': [{'header': header} for header in headers],
+            'style': spec.table_style,
+        })
+    elif spec.autofilter and len(df):
+        worksheet.autofilter(row, col, placement.last_row, col + len(headers) - 1)
+    return placement
+
+def insert_chart(workbook: xlsxwriter.Workbook, worksheet, chart_spec: Chart, placement: TablePlacement):
+    """Crea un gráfico nativo resolviendo las referencias a columnas de la tabla."""
+    chart = workbook.add_chart(chart_spec.options)
+    for series in chart_spec.series:
+        options = dict(series)
+        for key in ('categories', 'values'):
+            if isinstance(options.get(key), str):
+                options[key] = placement.range(options[key])
+        if isinstance(options.get('name'), dict):
+            options['name'] = placement.header_cell(options['name']['header'])
+        chart.add_series(options)
+    for setter, value in (('set_title', chart_spec.title), ('set_x_axis', chart_spec.x_axis), ('set_y_axis', chart_spec.y_axis),
+                          ('set_size', chart_spec.size), ('set_legend', chart_spec.legend)):
+        if value is not None:
+            getattr(chart, setter)(value)
+    if isinstance(chart_spec.anchor, str):
+        worksheet.insert_chart(chart_spec.anchor, chart, chart_spec.insert_options)
+    else:
+        worksheet.insert_chart(*chart_spec.anchor, chart, chart_spec.insert_options)
+
+def apply_conditional_format(worksheet, conditional: ConditionalFormat, placement: TablePlacement):
+    """Aplica un formato condicional a las filas de datos de la tabla escrita."""
+    if not placement.n_rows:
+        return
+    headers = conditional.columns or placement.headers
+    worksheet.conditional_format(placement.header_row + 1, placement.col(headers[0]),
+                                 placement.last_row, placement.col(headers[-1]), conditional.options)
+
+def insert_image(worksheet, formats: FormatCache, image: Image):
+    """Inserta una imagen (y su título, si lo tiene) a partir de su celda."""
+    row, col = image.anchor
+    if image.title is not None:
+        worksheet.write_string(row, col, image.title, formats.get(image.title_format))
+        row += 1
+    options = dict(image.insert_options, image_data=io.BytesIO(image.data))
+    worksheet.insert_image(row, col, image.title or 'imagen.png', options)
+
+def write_sheet(workbook: xlsxwriter.Workbook, formats: FormatCache, spec: SheetSpec, df: pd.DataFrame):
+    """Crea la hoja de 'spec' con su título, tabla, gráficos, anchos y notas."""
+    worksheet = workbook.add_worksheet(spec.name)
+    if df.empty and spec.empty_message:
+        worksheet.write_string(0, 0, spec.empty_message)
+        return worksheet
+
+    row = 0
+    last_title_col = spec.title_width - 1
+    if spec.title:
+        worksheet.merge_range(row, 0, row, last_title_col, spec.title, formats.get(TITLE_FORMAT))
+        row += 1
+    if spec.subtitle:
+        worksheet.merge_range(row, 0, row, last_title_col, spec.subtitle(df), formats.get(SUBTITLE_FORMAT))
+        row += 1
+    if spec.title or spec.subtitle:
+        row += 1
+
+    placement = write_table(workbook, worksheet, formats, spec, df, row)
+    for offset, column in enumerate(spec.columns):
+        worksheet.set_column(offset, offset, column.width)
+    if spec.header_height is not None:
+        worksheet.set_row(row, spec.header_height)
+    if spec.freeze_header or spec.freeze_columns:
+        worksheet.freeze_panes(row + 1 if spec.freeze_header else 0, spec.freeze_columns)
+
+    for conditional in spec.conditional_formats:
+        apply_conditional_format(worksheet, conditional, placement)
+    for chart_factory in spec.charts:
+        insert_chart(workbook, worksheet, chart_factory(placement), placement)
+    for image in spec.images:
+        insert_image(worksheet, formats, image)
+
+    if spec.notes:
+        notes_row = placement.last_row + 3
+        if spec.notes_title:
+            worksheet.write_string(notes_row, 0, spec.notes_title, formats.get(NOTE_TITLE_FORMAT))
+            notes_row += 1
+        for offset, note in enumerate(spec.notes(df)):
+            worksheet.write_string(notes_row + offset, 0, note)
+    return worksheet
+
+def frame_columns(df: pd.DataFrame, width: float = 22, date_width: float = 14, cell_format: Optional[dict] = None,
+                  date_cell_format: Optional[dict] = None, widths: Optional[dict] = None) -> List[Column]:
+    """
+    Columnas por defecto de un DataFrame: tipo según el dtype y encabezado igual
+    al nombre. Las fechas usan 'date_cell_format' (o 'cell_format') más el
+    formato de fecha; 'widths' fija el ancho de columnas concretas por nombre.
+    """
+    columns = []
+    for name in df.columns:
+        dtype = df[name].dtype
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            column = Column(str(name), name, 'date', date_width, date_cell_format or cell_format)
+        elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            column = Column(str(name), name, 'number', width, cell_format)
+        else:
+            column = Column(str(name), name, 'text', width, cell_format)
+        column.width = (widths or {}).get(name, column.width)
+        columns.append(column)
+    return columns
+
+def spec_frame(spec: SheetSpec, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tabla de 'spec' como DataFrame (mismos encabezados y valores que la hoja
+    Excel), con tipos de columna reales para los formatos de datos: texto
+    (None para vacíos), números en coma flotante y fechas datetime64.
+    """
+    data = {}
+    for column in spec.columns:
+        values = column.values(df)
+        if column.kind == 'date':
+            data[column.header] = pd.to_datetime(values).to_numpy()
+        elif column.kind == 'number':
+            data[column.header] = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+        else:
+            data[column.header] = text_values(values)
+    return pd.DataFrame(data, columns=[column.header for column in spec.columns])
+
+def build_workbook(sheets: Iterable[Tuple[SheetSpec, pd.DataFrame]],
+                   extra: Optional[Callable[[xlsxwriter.Workbook, FormatCache], None]] = None) -> bytes:
+    """
+    Genera el libro con las hojas indicadas (en memoria) y devuelve sus bytes.
+    'extra' permite añadir contenido que no encaja en una tabla.
+    """
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+    formats = FormatCache(workbook)
+    for spec, df in sheets:
+        write_sheet(workbook, formats, spec, df)
+    if extra is not None:
+        extra(workbook, formats)
+    workbook.close()
+    return output.getvalue()
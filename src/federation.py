@@ -0,0 +1,124 @@
+import glob
+import hashlib
+import os
+import pickle
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from data_loader import ISSUE_COLUMNS, load_and_normalize_json, read_tasks, validate_tasks
+
+# Directorio de la caché de espacios ya normalizados (se reutiliza entre ejecuciones)
+CACHE_DIR = os.environ.get('REPORTE_CACHE', os.path.join('.cache', 'espacios'))
+
+def is_federated(spec: str) -> bool:
+    """Indica si 'spec' es un directorio o un patrón glob en lugar de un archivo."""
+    return os.path.isdir(spec) or glob.has_magic(spec)
+
+def resolve_sources(spec: str) -> List[str]:
+    """
+    Devuelve la lista ordenada de exportaciones de espacio que describe 'spec':
+    todos los .json de un directorio, los archivos que coinciden con un patrón
+    glob o el propio archivo.
+    """
+    if os.path.isdir(spec):
+        return sorted(glob.glob(os.path.join(spec, '*.json')))
+    if glob.has_magic(spec):
+        return sorted(path for path in glob.glob(spec) if os.path.isfile(path))
+    return [spec]
+
+def space_name(path: str) -> str:
+    """Nombre del espacio de una exportación: el nombre del archivo sin extensión."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+def _cache_key(path: str) -> Tuple[str, int, int]:
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+def _cache_path(path: str, cache_dir: str) -> str:
+    digest = hashlib.blake2b(os.path.abspath(path).encode('utf-8'), digest_size=16).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.pkl")
+
+def _read_cached(path: str, cache_dir: str):
+    """Devuelve (df, raw) de la caché si corresponde a la versión actual del archivo."""
+    try:
+        with open(_cache_path(path, cache_dir), 'rb') as f:
+            key, df, raw = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        return None
+    return (df, raw) if key == _cache_key(path) else None
+
+def _write_cache(path: str, cache_dir: str, key, df, raw):
+    os.makedirs(cache_dir, exist_ok=True)
+    target = _cache_path(path, cache_dir)
+    temporal = f"{target}.{os.getpid()}.tmp"
+    with open(temporal, 'wb') as f:
+        pickle.dump((key, df, raw), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, target)
+
+def _parse_space(path: str):
+    """Lee y normaliza una exportación (se ejecuta en los procesos del pool)."""
+    key = _cache_key(path)
+    df, raw = read_tasks(path)
+    return key, df, raw
+
+def load_spaces(paths: List[str], cache_dir: Optional[str] = CACHE_DIR, max_workers: Optional[int] = None) -> List[Tuple[str, pd.DataFrame, pd.DataFrame]]:
+    """
+    Devuelve (espacio, df, raw) de cada exportación. Las que no están en la
+    caché (o cambiaron) se parsean en paralelo en un pool de procesos y se
+    guardan en la caché para la próxima ejecución.
+    """
+    results = {}
+    pending = []
+    for path in paths:
+        cached = _read_cached(path, cache_dir) if cache_dir else None
+        if cached is not None:
+            results[path] = cached
+        else:
+            pending.append(path)
+
+    max_workers = max_workers or min(len(pending), os.cpu_count() or 1)
+    if max_workers <= 1 or len(pending) <= 1:
+        parsed = [_parse_space(path) for path in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            parsed = list(executor.map(_parse_space, pending))
+
+    for path, (key, df, raw) in zip(pending, parsed):
+        results[path] = (df, raw)
+        if cache_dir:
+            _write_cache(path, cache_dir, key, df, raw)
+
+    return [(space_name(path), *results[path]) for path in paths]
+
+def load_federated(spec: str, with_issues: bool = False, cache_dir: Optional[str] = CACHE_DIR, max_workers: Optional[int] = None):
+    """
+    Carga varias exportaciones de espacio (directorio o patrón glob) en una
+    sola tabla normalizada con la columna adicional 'space'. La validación de
+    calidad se hace sobre la tabla unida (p. ej. ids duplicados entre espacios).
+    Devuelve df, o (df, issues) con with_issues=True.
+    """
+    frames, raws = [], []
+    for space, df, raw in load_spaces(resolve_sources(spec), cache_dir, max_workers):
+        if df is None:
+            continue
+        frames.append(df.assign(space=space))
+        raws.append(raw)
+
+    if not frames:
+        empty = pd.DataFrame()
+        return (empty, pd.DataFrame(columns=ISSUE_COLUMNS)) if with_issues else empty
+
+    df = pd.concat(frames, ignore_index=True)
+    if with_issues:
+        return df, validate_tasks(df, pd.concat(raws, ignore_index=True))
+    return df
+
+def load_tasks(spec: str, with_issues: bool = False):
+    """
+    Punto de entrada único de carga: un archivo se carga como siempre y un
+    directorio o patrón glob se federa con 'load_federated'.
+    """
+    if is_federated(spec):
+        return load_federated(spec, with_issues, CACHE_DIR)
+    return load_and_normalize_json(spec, with_issues)
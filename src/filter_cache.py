@@ -0,0 +1,115 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+# Resultados de filtros (posiciones de filas) que se conservan, compartidos por todas las sesiones
+FILTER_CACHE_SIZE = int(os.environ.get('REPORTE_CACHE_FILTROS', '32'))
+
+TASK_TYPES = ["Todas", "Solo Tareas", "Solo Subtareas"]
+# Parámetros de la URL para cada filtro, en el orden de la tupla 'filtros' de la app
+QUERY_PARAMS = ['area', 'proyecto', 'estado', 'desde', 'hasta', 'buscar', 'tipo']
+
+def _iso(value) -> str:
+    return pd.Timestamp(value).strftime('%Y-%m-%d') if pd.notna(value) else ''
+
+def filter_params(filtros: Tuple) -> Dict[str, List[str]]:
+    """
+    Forma canónica de los filtros como parámetros de URL: listas ordenadas y
+    sin repetidos, fechas en ISO y se omiten los valores vacíos o por defecto.
+    Dos selecciones equivalentes producen los mismos parámetros.
+    """
+    areas, proyectos, estados, fecha_inicio, fecha_fin, search_term, task_type_filter = filtros
+    params = {
+        'area': sorted(set(areas or [])),
+        'proyecto': sorted(set(proyectos or [])),
+        'estado': sorted(set(estados or [])),
+        'desde': [_iso(fecha_inicio)],
+        'hasta': [_iso(fecha_fin)],
+        'buscar': [search_term or ''],
+        'tipo': [task_type_filter if task_type_filter != TASK_TYPES[0] else ''],
+    }
+    return {name: values for name, values in params.items() if any(values)}
+
+def filter_key(filtros: Tuple) -> str:
+    """Clave canónica de los filtros (la cadena de consulta de la URL)."""
+    return urlencode([(name, value) for name, values in filter_params(filtros).items() for value in values])
+
+def filters_from_params(params: Dict[str, List[str]]) -> Dict:
+    """
+    Valores de los filtros leídos de la URL (para iniciar el estado de la
+    sesión). Solo se devuelven los presentes; los desconocidos se ignoran.
+    """
+    state = {}
+    for name, state_key in (('area', 'selected_areas'), ('proyecto', 'selected_proyectos'), ('estado', 'selected_estados')):
+        if params.get(name):
+            state[state_key] = list(params[name])
+    if params.get('buscar'):
+        state['search_term'] = params['buscar'][0]
+    if params.get('tipo') and params['tipo'][0] in TASK_TYPES:
+        state['task_type_filter'] = params['tipo'][0]
+    fechas = [pd.to_datetime((params.get(name) or [''])[0], errors='coerce') for name in ('desde', 'hasta')]
+    if all(pd.notna(fecha) for fecha in fechas):
+        state['date_range'] = tuple(fechas)
+    return state
+
+
+class FilterResultCache:
+    """
+    Memoria LRU de resultados de filtros compartida entre sesiones: guarda las
+    posiciones (iloc) de las filas filtradas por versión de datos y clave
+    canónica, de modo que una misma combinación de filtros se calcula una vez
+    y se sirve a todos los usuarios. Los arrays se marcan de solo lectura.
+    """
+    def __init__(self, size: int = FILTER_CACHE_SIZE):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            positions = self._entries.get((version, key))
+            if positions is not None:
+                self._entries.move_to_end((version, key))
+                self.hits += 1
+            return positions
+
+    def put(self, version, key: str, positions) -> np.ndarray:
+        positions = np.asarray(positions, dtype=np.int64)
+        positions.setflags(write=False)
+        with self._lock:
+            self._entries[(version, key)] = positions
+            self._entries.move_to_end((version, key))
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return positions
+
+    def positions(self, version, key: str, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """Posiciones memorizadas para (versión, clave), calculándolas con 'compute' si faltan."""
+        positions = self.get(version, key)
+        if positions is None:
+            with self._lock:
+                self.misses += 1
+            positions = self.put(version, key, compute())
+        return positions
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache: Optional[FilterResultCache] = None
+_cache_lock = threading.Lock()
+
+def get_filter_cache() -> FilterResultCache:
+    """Memoria de resultados de filtros compartida por el proceso."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = FilterResultCache()
+        return _cache
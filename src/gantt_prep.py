@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+
+GANTT_COLUMNS = ['id', 'parent_id', 'nombre', 'proyecto', 'fecha_inicio', 'fecha_limite', 'is_subtask']
+TIPO_CATEGORIES = ['Tarea', 'Subtarea']
+
+def prepare_gantt_frame(df: pd.DataFrame, include_subtasks: bool = True) -> pd.DataFrame:
+    """
+    Prepara de forma vectorizada el DataFrame compacto que consumen el Gantt en
+    pantalla y el Gantt de Excel: completa fechas faltantes, descarta las tareas
+    sin fechas, ordena por proyecto y familia y calcula desplazamientos,
+    duraciones, etiquetas y códigos de tipo.
+    """
+    gantt_df = df[GANTT_COLUMNS]
+    if not include_subtasks:
+        gantt_df = gantt_df[gantt_df['parent_id'].isnull()]
+
+    # Lógica para manejar fechas faltantes: si solo falta una, se calcula.
+    inicio = gantt_df['fecha_inicio'].fillna(gantt_df['fecha_limite'] - pd.Timedelta(days=1))
+    limite = gantt_df['fecha_limite'].fillna(gantt_df['fecha_inicio'] + pd.Timedelta(days=1))
+    # Las tareas con la fecha límite anterior al inicio (incidencia 'fecha_limite_anterior'
+    # de la calidad de datos) se acotan a su día de inicio para no generar duraciones negativas
+    limite = limite.mask(limite < inicio, inicio)
+    gantt_df = gantt_df.assign(fecha_inicio=inicio, fecha_limite=limite)
+
+    # Filtrar las tareas que aún no tienen ambas fechas
+    gantt_df = gantt_df.dropna(subset=['fecha_inicio', 'fecha_limite'])
+    if gantt_df.empty:
+        return gantt_df.assign(
+            tipo=pd.Categorical([], categories=TIPO_CATEGORIES), tipo_code=np.int8(0),
+            inicio_dias=0, duracion=0, task_label='', tarea_display=''
+        )
+
+    # Ordenar por proyecto y familia, dejando cada subtarea bajo su tarea principal
+    familia = gantt_df['parent_id'].where(gantt_df['parent_id'].notna(), gantt_df['id'])
+    inicio_familia = gantt_df['fecha_inicio'].groupby(familia).transform('min')
+    orden = np.lexsort((
+        gantt_df['fecha_inicio'].to_numpy(),
+        gantt_df['is_subtask'].to_numpy(),
+        familia.astype(str).to_numpy(),
+        inicio_familia.to_numpy(),
+        gantt_df['proyecto'].astype(str).to_numpy(),
+    ))
+    gantt_df = gantt_df.iloc[orden]
+
+    is_subtask = gantt_df['parent_id'].notna().to_numpy()
+    nombre = gantt_df['nombre'].fillna('').astype(str)
+    proyecto = gantt_df['proyecto'].astype(str)
+    fecha_minima = gantt_df['fecha_inicio'].min()
+
+    tipo_code = is_subtask.astype(np.int8)
+    return gantt_df.assign(
+        tipo=pd.Categorical.from_codes(tipo_code, categories=TIPO_CATEGORIES),
+        tipo_code=tipo_code,
+        inicio_dias=(gantt_df['fecha_inicio'] - fecha_minima).dt.days.astype(np.int32),
+        duracion=((gantt_df['fecha_limite'] - gantt_df['fecha_inicio']).dt.days + 1).astype(np.int32),
+        task_label=np.where(is_subtask, '  - ' + nombre, proyecto + ' - ' + nombre),
+        tarea_display=np.where(is_subtask, '  - ' + nombre, nombre),
+    )
+
+def cached_gantt_frame(store: dict, df: pd.DataFrame, proyectos: Optional[List[str]], include_subtasks: bool) -> pd.DataFrame:
+    """
+    Devuelve el frame de Gantt para un estado de filtros, recalculándolo solo
+    cuando cambia el DataFrame de origen, la selección de proyectos o la
+    inclusión de subtareas. 'store' es un diccionario persistente (p. ej. la
+    sesión de Streamlit) donde se guarda la última preparación.
+    """
+    key = (tuple(sorted(proyectos or [])), include_subtasks)
+    cached = store.get('gantt_frame')
+    if cached is not None and cached[0] is df and cached[1] == key:
+        return cached[2]
+
+    source = df[df['proyecto'].isin(proyectos)] if proyectos else df
+    frame = prepare_gantt_frame(source, include_subtasks)
+    store['gantt_frame'] = (df, key, frame)
+    return frame
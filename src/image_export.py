@@ -0,0 +1,179 @@
+import os
+import atexit
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from startup import configure_kaleido
+
+# Procesos de Kaleido que se mantienen arrancados y entradas de la memoria de imágenes
+IMAGE_POOL_SIZE = int(os.environ.get('REPORTE_KALEIDO_PROCESOS', '2'))
+IMAGE_CACHE_SIZE = 128
+
+def plotly_scope():
+    """
+    Crea un PlotlyScope de Kaleido configurado como el de plotly.io (plotly.js
+    del paquete local), sin MathJax: los gráficos no usan LaTeX y así el
+    renderizador no depende de la CDN al arrancar.
+    """
+    import plotly
+    from kaleido.scopes.plotly import PlotlyScope
+
+    scope = PlotlyScope(mathjax=False)
+    scope.plotlyjs = os.path.join(os.path.dirname(os.path.abspath(plotly.__file__)), 'package_data', 'plotly.min.js')
+    return scope
+
+def figure_key(fig, format: str, width: Optional[int], height: Optional[int], scale: Optional[float]) -> str:
+    """Huella del JSON de la figura y de las opciones de exportación."""
+    digest = hashlib.blake2b(fig.to_json().encode('utf-8'), digest_size=16)
+    digest.update(repr((format, width, height, scale)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ImageRendererPool:
+    """
+    Grupo de renderizadores Kaleido calientes: cada uno mantiene su proceso de
+    Chromium abierto entre exportaciones, y un lote de figuras se reparte entre
+    ellos para renderizarse en paralelo. Las imágenes se memorizan por la huella
+    del JSON de la figura, de modo que volver a exportar un gráfico sin cambios
+    no llama a Kaleido.
+    """
+    def __init__(self, size: int = IMAGE_POOL_SIZE, cache_size: int = IMAGE_CACHE_SIZE,
+                 scope_factory: Callable = plotly_scope):
+        self.size = max(1, size)
+        self.cache_size = cache_size
+        self._scope_factory = scope_factory
+        self._scopes = []
+        self._idle = []
+        self._available = threading.Condition()
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix='kaleido')
+        self.hits = 0
+        self.renders = 0
+        self.warm_error: Optional[Exception] = None
+        self.warming: Optional[threading.Thread] = None
+
+    def _acquire(self):
+        """Toma un renderizador libre, creando uno nuevo mientras no se llegue a 'size'."""
+        with self._available:
+            while not self._idle and len(self._scopes) >= self.size:
+                self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            scope = self._scope_factory()
+            self._scopes.append(scope)
+            return scope
+
+    def _release(self, scope):
+        with self._available:
+            self._idle.append(scope)
+            self._available.notify()
+
+    def _cached(self, key: str) -> Optional[bytes]:
+        with self._cache_lock:
+            image = self._cache.get(key)
+            if image is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            return image
+
+    def _store(self, key: str, image: bytes):
+        with self._cache_lock:
+            self._cache[key] = image
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _transform(self, fig, format, width, height, scale) -> bytes:
+        scope = self._acquire()
+        try:
+            image = scope.transform(fig.to_dict(), format=format, width=width, height=height, scale=scale)
+        finally:
+            self._release(scope)
+        with self._cache_lock:
+            self.renders += 1
+        return image
+
+    def render(self, fig, format: str = 'png', width: Optional[int] = None,
+               height: Optional[int] = None, scale: Optional[float] = None) -> bytes:
+        """Imagen de una figura (equivalente a fig.to_image)."""
+        return self.render_many([fig], format, width, height, scale)[0]
+
+    def render_many(self, figs: List, format: str = 'png', width: Optional[int] = None,
+                    height: Optional[int] = None, scale: Optional[float] = None) -> List[bytes]:
+        """
+        Imágenes de un lote de figuras, en el mismo orden. Las que están en la
+        memoria se devuelven directamente; el resto (sin repetir figuras
+        idénticas) se renderiza en paralelo en los procesos del grupo.
+        """
+        keys = [figure_key(fig, format, width, height, scale) for fig in figs]
+        images = {}
+        pending = {}
+        for key, fig in zip(keys, figs):
+            if key in images or key in pending:
+                continue
+            image = self._cached(key)
+            if image is not None:
+                images[key] = image
+            else:
+                pending[key] = self._executor.submit(self._transform, fig, format, width, height, scale)
+
+        for key, future in pending.items():
+            images[key] = future.result()
+            self._store(key, images[key])
+        return [images[key] for key in keys]
+
+    def warm(self):
+        """Arranca todos los procesos de Kaleido antes de la primera exportación."""
+        import plotly.graph_objects as go
+        # Figuras distintas para que no se resuelvan desde la memoria
+        self.render_many([go.Figure(layout={'title': {'text': str(i)}}) for i in range(self.size)], width=10, height=10)
+
+    def start_warming(self) -> threading.Thread:
+        """
+        Calienta el grupo en un hilo en segundo plano, sin bloquear a quien lo
+        crea. Un fallo (p. ej. sin Chromium) queda en 'warm_error' y la
+        exportación lo volverá a intentar y lo notificará.
+        """
+        def run():
+            try:
+                self.warm()
+            except Exception as exc:
+                self.warm_error = exc
+        thread = threading.Thread(target=run, name='kaleido-warm', daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        """
+        Cierra el pool de hilos y suelta los renderizadores: cada PlotlyScope
+        cierra su proceso de Kaleido al liberarse.
+        """
+        self._executor.shutdown(wait=True)
+        with self._available:
+            self._scopes.clear()
+            self._idle.clear()
+
+
+_pool: Optional[ImageRendererPool] = None
+_pool_lock = threading.Lock()
+
+def get_image_pool() -> ImageRendererPool:
+    """
+    Grupo de renderizadores compartido por el proceso (todas las sesiones).
+    Se crea la primera vez que se abre una vista que exporta imágenes, después
+    de localizar Chromium, y empieza a calentarse en segundo plano para que la
+    primera exportación no espere a que arranquen los procesos de Kaleido. Se
+    cierra al salir del intérprete.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            configure_kaleido()
+            _pool = ImageRendererPool()
+            _pool.warming = _pool.start_warming()
+            atexit.register(_pool.close)
+        return _pool
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import re
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Optional, Tuple
+
+from compact import CompactTasks
+from data_loader import ISSUE_COLUMNS, flatten_project, key_issues, merge_issues, normalize_tasks, row_issues
+from dataset import Dataset
+from options_index import OptionsIndex
+from rollup import RollupCube
+
+# Formato que escribe Json/main.py (json.dump con indent=4): la clave de cada
+# proyecto va en una línea con 8 espacios de sangría y, si su valor ocupa
+# varias líneas, este se cierra en una línea con la misma sangría. Las líneas
+# interiores tienen más sangría y los textos JSON no contienen saltos de línea.
+PROJECT_LINE = re.compile(rb'^ {8}"(?:[^"\\\n]|\\.)*": ', re.M)
+PROJECT_CLOSE = re.compile(rb'^ {8}[}\]]', re.M)
+
+def content_hash(subtree) -> str:
+    """Huella del contenido de un subárbol del JSON (un proyecto con sus tareas)."""
+    payload = json.dumps(subtree, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+def project_spans(content: bytes) -> Optional[List[Tuple[Tuple[str, str], int, int]]]:
+    """
+    Localiza el texto del valor de cada proyecto en un archivo con el formato
+    de Json/main.py sin parsear las tareas. Devuelve [((área, proyecto),
+    inicio, fin)] en orden, o None si el archivo no sigue ese formato.
+    La estructura se comprueba parseando el esqueleto del archivo, con cada
+    proyecto reemplazado por 'null': solo es válida si resulta exactamente
+    {área: {proyecto: null}} con un proyecto por cada valor localizado.
+    """
+    spans = []
+    for match in PROJECT_LINE.finditer(content):
+        start = match.end()
+        line_end = content.find(b'\n', start)
+        line_end = len(content) if line_end < 0 else line_end
+        rest = content[start:line_end].rstrip()
+        if rest.endswith((b'{', b'[')):
+            close = PROJECT_CLOSE.search(content, line_end)
+            if close is None:
+                return None
+            end = close.end()
+        else:
+            end = start + len(rest.rstrip(b','))
+        spans.append((start, end))
+    if not spans:
+        return None
+
+    pieces, previous = [], 0
+    for start, end in spans:
+        pieces.extend([content[previous:start], b'null'])
+        previous = end
+    pieces.append(content[previous:])
+    try:
+        skeleton = json.loads(b''.join(pieces).decode('utf-8'))
+    except ValueError:
+        return None
+    if not isinstance(skeleton, dict) or not all(isinstance(proyectos, dict) for proyectos in skeleton.values()):
+        return None
+    keys = [(area, proyecto) for area, proyectos in skeleton.items() for proyecto, value in proyectos.items() if value is None]
+    if len(keys) != len(spans) or sum(len(proyectos) for proyectos in skeleton.values()) != len(spans):
+        return None
+    return [(key, start, end) for key, (start, end) in zip(keys, spans)]
+
+def project_entries(content: bytes) -> List[Tuple[Tuple[str, str], str, Callable]]:
+    """
+    (clave, huella, función que devuelve el subárbol) de cada proyecto, en
+    orden. Con el formato de Json/main.py la huella es la del texto del
+    proyecto y solo se parsean los proyectos que se piden; con otro formato
+    se parsea el archivo completo y la huella se calcula sobre cada subárbol.
+    """
+    spans = project_spans(content)
+    if spans is not None:
+        return [
+            (key, hashlib.blake2b(content[start:end], digest_size=16).hexdigest(),
+             lambda start=start, end=end: json.loads(content[start:end].decode('utf-8')))
+            for key, start, end in spans
+        ]
+    data = json.loads(content.decode('utf-8'))
+    return [
+        ((area, proyecto), content_hash(detalles), lambda detalles=detalles: detalles)
+        for area, proyectos in data.items() for proyecto, detalles in proyectos.items()
+    ]
+
+def _key_mask(frame: pd.DataFrame, keys: set) -> np.ndarray:
+    """Filas de una tabla con columnas 'area' y 'proyecto' cuyo par está en 'keys'."""
+    if frame.empty:
+        return np.zeros(0, dtype=bool)
+    pairs = pd.MultiIndex.from_arrays([frame['area'].astype(object), frame['proyecto'].astype(object)])
+    return pairs.isin(list(keys))
+
+
+class IncrementalLoader:
+    """
+    Cargador de 'datos.json' que recuerda la huella de cada proyecto
+    (área, proyecto) y las filas que produjo. En cada recarga solo se vuelven
+    a parsear, aplanar y normalizar los proyectos cuyo contenido cambió, y
+    solo esas filas se codifican, se agregan en el cubo y en el resumen de
+    opciones y se validan. Las filas, celdas e incidencias de los proyectos
+    sin cambios se reutilizan del Dataset anterior, conservando el orden del
+    archivo.
+
+    Con el formato de Json/main.py los proyectos sin cambios no se parsean:
+    su huella es la del texto, localizado sin decodificar el JSON. Lo que
+    sigue siendo proporcional a todo el conjunto son operaciones vectorizadas
+    sobre arreglos (unir y reordenar la representación compacta, validar ids
+    duplicados y subtareas huérfanas, que cruzan proyectos) y, si está
+    activo, el motor SQL, que se vuelve a cargar completo.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.dataset: Optional[Dataset] = None
+        # (área, proyecto) -> (huella, fila inicial, fila final) en la tabla vigente
+        self.parts: Dict[Tuple[str, str], Tuple[str, int, int]] = {}
+        # Incidencias por fila de la tabla vigente (las que no cruzan proyectos)
+        self.row_issues: Optional[pd.DataFrame] = None
+        self.changed: List[Tuple[str, str]] = []
+        self.file_digest: Optional[str] = None
+
+    def _reset(self):
+        self.dataset, self.parts, self.row_issues, self.file_digest = None, {}, None, None
+
+    def load(self) -> Dataset:
+        with open(self.path, 'rb') as f:
+            content = f.read()
+        # Archivo idéntico (p. ej. solo se actualizó su fecha): no hace falta leer los proyectos
+        file_digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        if self.dataset is not None and file_digest == self.file_digest:
+            self.changed = []
+            return self.dataset
+
+        n_old = len(self.dataset.compact) if self.dataset is not None else 0
+        parts, segments, changed, new_tasks = {}, [], [], []
+        offset = 0
+        for key, digest, subtree in project_entries(content):
+            cached = self.parts.get(key)
+            if cached is not None and cached[0] == digest:
+                # Proyecto sin cambios: se reutilizan sus filas de la tabla anterior
+                start, stop = cached[1], cached[2]
+            else:
+                tasks = flatten_project(key[0], key[1], subtree())
+                start = n_old + len(new_tasks)
+                stop = start + len(tasks)
+                new_tasks.extend(tasks)
+                changed.append(key)
+            segments.append(np.arange(start, stop))
+            size = stop - start
+            parts[key] = (digest, offset, offset + size)
+            offset += size
+
+        self.changed = changed
+        if offset == 0:
+            self._reset()
+            return Dataset(pd.DataFrame(), pd.DataFrame(columns=ISSUE_COLUMNS))
+
+        if self.dataset is not None and not new_tasks and list(parts.items()) == list(self.parts.items()):
+            # Mismo contenido y mismo orden: el Dataset anterior sigue vigente
+            self.file_digest = file_digest
+            return self.dataset
+
+        new_df = new_raw = None
+        if new_tasks:
+            new_df, new_raw = normalize_tasks(new_tasks)
+            if self.dataset is not None and set(new_df.columns) != set(self.dataset.df.columns):
+                # Columnas nuevas o desaparecidas: la tabla anterior no se puede reutilizar
+                self._reset()
+                return self.load()
+
+        self.dataset, self.row_issues = self._splice(new_df, new_raw, np.concatenate(segments), set(parts) - set(changed))
+        self.parts, self.file_digest = parts, file_digest
+        return self.dataset
+
+    def _splice(self, new_df: Optional[pd.DataFrame], new_raw: Optional[pd.DataFrame],
+                positions: np.ndarray, unchanged: set) -> Tuple[Dataset, pd.DataFrame]:
+        """
+        Construye el Dataset nuevo a partir del anterior y de las filas
+        recién normalizadas. 'positions' son posiciones sobre la
+        concatenación tabla anterior + filas nuevas y 'unchanged' las claves
+        de los proyectos que se reutilizan.
+        """
+        old = self.dataset
+        compacts, cells, summaries, issues = [], [], [], []
+        if old is not None:
+            compacts.append(old.compact)
+            cells.append(old.cube.cells[_key_mask(old.cube.cells, unchanged)])
+            summaries.append(old.options.summary[_key_mask(old.options.summary, unchanged)])
+            issues.append(self.row_issues)
+        n_old = len(old.compact) if old is not None else 0
+        if new_df is not None:
+            compacts.append(CompactTasks.from_frame(new_df))
+            cells.append(RollupCube.from_dataframe(new_df).cells)
+            summaries.append(OptionsIndex.summarize(new_df))
+            new_issues = row_issues(new_df, new_raw)
+            new_issues['fila'] += n_old
+            issues.append(new_issues)
+
+        compact = (CompactTasks.concat(compacts) if len(compacts) > 1 else compacts[0]).take(positions)
+        # Posición de cada fila de la concatenación en la tabla nueva (-1 si se descarta)
+        new_position = np.full(n_old + (len(new_df) if new_df is not None else 0), -1, dtype=np.int64)
+        new_position[positions] = np.arange(len(positions))
+        spliced = pd.concat(issues, ignore_index=True)
+        spliced['fila'] = new_position[spliced['fila'].to_numpy(dtype=np.int64)]
+        spliced = spliced[spliced['fila'] >= 0].sort_values('fila', kind='stable', ignore_index=True)
+
+        dataset = Dataset(
+            None, None, compact,
+            cube=RollupCube(pd.concat(cells, ignore_index=True)),
+            options=OptionsIndex.from_summary(pd.concat(summaries, ignore_index=True)),
+        )
+        dataset.issues = merge_issues(spliced, key_issues(dataset.df))
+        return dataset, spliced
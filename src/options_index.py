@@ -0,0 +1,115 @@
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def _sorted_values(values) -> List[str]:
+    """Valores distintos no nulos ordenados (mismo criterio que DataManager.get_unique_values)."""
+    return sorted(pd.Series(values).dropna().unique().tolist())
+
+
+class OptionsIndex:
+    """
+    Opciones de los filtros de la barra lateral precalculadas en la carga:
+    listas de áreas, proyectos y estados, y mapas en cascada
+    (área -> proyectos, proyecto -> estados, proyecto -> rango de fechas de
+    inicio). Las combinaciones de selección ya consultadas se memorizan, de
+    modo que cada lista de opciones es una búsqueda en un diccionario.
+    """
+    def __init__(self, areas: List[str], proyectos: List[str], estados: List[str],
+                 projects_by_area: Dict[str, List[str]], estados_by_project: Dict[str, List[str]],
+                 date_bounds_by_project: Dict[str, Tuple[pd.Timestamp, pd.Timestamp]],
+                 date_bounds: Tuple[pd.Timestamp, pd.Timestamp]):
+        self.areas = areas
+        self.proyectos = proyectos
+        self.estados = estados
+        self.projects_by_area = projects_by_area
+        self.estados_by_project = estados_by_project
+        self.date_bounds_by_project = date_bounds_by_project
+        self.min_date, self.max_date = date_bounds
+        # Resumen por (área, proyecto, estado) del que se construyó (ver 'summarize')
+        self.summary = None
+        self._memo = {}
+
+    @staticmethod
+    def summarize(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Resumen del que se derivan los mapas: una fila por (área, proyecto,
+        estado) con la primera y la última fecha de inicio. Los resúmenes de
+        varias partes del conjunto se pueden concatenar.
+        """
+        keys = pd.DataFrame({
+            'area': df['area'].astype(object), 'proyecto': df['proyecto'].astype(object),
+            'estado': df['estado'].astype(object), 'fecha_inicio': df['fecha_inicio'],
+        })
+        return keys.groupby(['area', 'proyecto', 'estado'], dropna=False, sort=False)['fecha_inicio'].agg(
+            inicio_min='min', inicio_max='max'
+        ).reset_index()
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'OptionsIndex':
+        """Construye los mapas con una agrupación por (área, proyecto, estado)."""
+        if df.empty:
+            return cls.from_summary(pd.DataFrame(columns=['area', 'proyecto', 'estado', 'inicio_min', 'inicio_max']))
+        return cls.from_summary(cls.summarize(df))
+
+    @classmethod
+    def from_summary(cls, summary: pd.DataFrame) -> 'OptionsIndex':
+        """Construye los mapas a partir de 'summarize' (sin recorrer las filas de tareas)."""
+        if summary.empty:
+            index = cls([], [], [], {}, {}, {}, (pd.NaT, pd.NaT))
+            index.summary = summary
+            return index
+
+        pairs = summary[['area', 'proyecto', 'estado']].drop_duplicates()
+        projects_by_area = {
+            area: _sorted_values(group['proyecto'])
+            for area, group in pairs.dropna(subset=['area']).groupby('area', sort=False)
+        }
+        estados_by_project = {
+            proyecto: _sorted_values(group['estado'])
+            for proyecto, group in pairs.dropna(subset=['proyecto']).groupby('proyecto', sort=False)
+        }
+        bounds = summary.groupby('proyecto').agg(min=('inicio_min', 'min'), max=('inicio_max', 'max')).dropna()
+        date_bounds_by_project = {proyecto: (row['min'], row['max']) for proyecto, row in bounds.iterrows()}
+
+        index = cls(
+            _sorted_values(pairs['area']), _sorted_values(pairs['proyecto']), _sorted_values(pairs['estado']),
+            projects_by_area, estados_by_project, date_bounds_by_project,
+            (summary['inicio_min'].min(), summary['inicio_max'].max())
+        )
+        index.summary = summary
+        return index
+
+    def _lookup(self, name: str, selection: Optional[Sequence[str]], build):
+        key = (name, tuple(sorted(selection)) if selection else ())
+        if key not in self._memo:
+            self._memo[key] = build()
+        return self._memo[key]
+
+    def projects(self, areas: Optional[Sequence[str]] = None) -> List[str]:
+        """Proyectos de las áreas seleccionadas (todos si no hay selección)."""
+        if not areas:
+            return self.proyectos
+        return self._lookup('proyectos', areas, lambda: sorted(
+            {proyecto for area in areas for proyecto in self.projects_by_area.get(area, [])}
+        ))
+
+    def estados_for(self, proyectos: Optional[Sequence[str]] = None) -> List[str]:
+        """Estados presentes en los proyectos indicados (todos si no hay selección)."""
+        if not proyectos:
+            return self.estados
+        return self._lookup('estados', proyectos, lambda: sorted(
+            {estado for proyecto in proyectos for estado in self.estados_by_project.get(proyecto, [])}
+        ))
+
+    def date_bounds(self, proyectos: Optional[Sequence[str]] = None) -> Tuple[pd.Timestamp, pd.Timestamp]:
+        """Primera y última fecha de inicio de los proyectos indicados (o de todo el conjunto)."""
+        if not proyectos:
+            return self.min_date, self.max_date
+
+        def build():
+            bounds = [self.date_bounds_by_project[p] for p in proyectos if p in self.date_bounds_by_project]
+            if not bounds:
+                return self.min_date, self.max_date
+            return min(b[0] for b in bounds), max(b[1] for b in bounds)
+        return self._lookup('fechas', proyectos, build)
@@ -0,0 +1,321 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from fpdf import FPDF
+
+from gantt_prep import prepare_gantt_frame
+from utils import format_date_for_display
+
+PDF_SECTIONS = ['dashboard', 'gantt', 'general']
+
+# Fuente TrueType con tildes y eñes; sin ella se usa Helvetica (latin-1)
+PDF_FONT_CANDIDATES = (
+    ('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'),
+    ('/usr/share/fonts/dejavu/DejaVuSans.ttf', '/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf'),
+)
+
+ESTADO_COLORS = {
+    'pendiente': (79, 129, 189),
+    'en progreso': (247, 150, 70),
+    'completado': (155, 187, 89),
+    'aprobado': (128, 100, 162),
+}
+PRIORIDAD_LABELS = {'urgent': 'Urgente', 'high': 'Alta', 'normal': 'Normal', 'low': 'Baja'}
+PRIORITY_ORDER = list(PRIORIDAD_LABELS)
+TIPO_COLORS = [(68, 114, 196), (165, 165, 165)]  # Tarea, Subtarea
+HEADER_FILL = (215, 228, 188)
+
+GANTT_ROW_HEIGHT = 5.0
+GANTT_LABEL_WIDTH = 80.0
+
+# Tabla de proyectos por estado: anchos máximos y ancho mínimo del nombre del proyecto
+CROSSTAB_NAME_WIDTH = 90.0
+CROSSTAB_MIN_NAME_WIDTH = 60.0
+CROSSTAB_COUNT_WIDTH = 28.0
+
+
+class ReportPDF(FPDF):
+    """Documento A4 apaisado con título de sección en la cabecera y número de página al pie."""
+    def __init__(self, title: str = "Reporte de Actividades"):
+        super().__init__(orientation='L', unit='mm', format='A4')
+        self.report_title = title
+        self.section_title = ''
+        self.set_margins(10, 12, 10)
+        self.set_auto_page_break(True, margin=12)
+        self.set_title(title)
+        self.font_family_name = self._register_font()
+
+    def _register_font(self) -> str:
+        for regular, bold in PDF_FONT_CANDIDATES:
+            if os.path.exists(regular) and os.path.exists(bold):
+                self.add_font('DejaVu', '', regular)
+                self.add_font('DejaVu', 'B', bold)
+                return 'DejaVu'
+        return 'Helvetica'
+
+    def text_safe(self, value) -> str:
+        """Texto imprimible con la fuente activa (las fuentes base solo admiten latin-1)."""
+        text = '' if value is None or (not isinstance(value, str) and pd.isna(value)) else str(value)
+        if self.font_family_name == 'Helvetica':
+            return text.encode('latin-1', 'replace').decode('latin-1')
+        return text
+
+    def header(self):
+        self.set_font(self.font_family_name, 'B', 9)
+        self.set_text_color(90, 90, 90)
+        self.cell(0, 5, self.text_safe(f"{self.report_title} · {self.section_title}"), new_x='LMARGIN', new_y='NEXT')
+        self.set_text_color(0, 0, 0)
+        self.ln(2)
+
+    def footer(self):
+        self.set_y(-10)
+        self.set_font(self.font_family_name, '', 8)
+        self.set_text_color(90, 90, 90)
+        self.cell(0, 5, f"Página {self.page_no()} de {{nb}}", align='R')
+        self.set_text_color(0, 0, 0)
+
+    def start_section(self, title: str):
+        self.section_title = title
+        self.add_page()
+        self.set_font(self.font_family_name, 'B', 16)
+        self.cell(0, 10, self.text_safe(title), new_x='LMARGIN', new_y='NEXT')
+        self.ln(2)
+
+    def fit_text(self, text: str, width: float) -> str:
+        """Recorta el texto (con '…') para que quepa en el ancho indicado con la fuente activa."""
+        text = self.text_safe(text)
+        if self.get_string_width(text) <= width:
+            return text
+        ellipsis = '…' if self.font_family_name != 'Helvetica' else '...'
+        # Estimación por ancho medio de carácter y ajuste fino
+        keep = max(1, int(len(text) * width / max(self.get_string_width(text), 1e-6)))
+        while keep > 1 and self.get_string_width(text[:keep] + ellipsis) > width:
+            keep -= 1
+        return text[:keep] + ellipsis
+
+
+def _observed(counts: pd.Series) -> pd.Series:
+    counts = counts[counts > 0]
+    counts.index = counts.index.astype(str)
+    return counts
+
+def _bar_chart(pdf: ReportPDF, x: float, y: float, w: float, h: float, counts: pd.Series,
+               title: str, colors: Optional[dict] = None):
+    """Gráfico de barras horizontales vectorial (rectángulos y texto) con el valor de cada barra."""
+    pdf.set_font(pdf.font_family_name, 'B', 11)
+    pdf.set_xy(x, y)
+    pdf.cell(w, 7, pdf.text_safe(title))
+    if counts.empty:
+        pdf.set_font(pdf.font_family_name, '', 9)
+        pdf.set_xy(x, y + 9)
+        pdf.cell(w, 5, "Sin datos")
+        return
+
+    label_width, value_width = 35.0, 12.0
+    bar_area = w - label_width - value_width
+    row_height = min(10.0, (h - 9) / len(counts))
+    maximum = counts.max()
+    pdf.set_font(pdf.font_family_name, '', 9)
+    for i, (label, value) in enumerate(counts.items()):
+        row_y = y + 9 + i * row_height
+        pdf.set_xy(x, row_y)
+        pdf.cell(label_width, row_height * 0.7, pdf.fit_text(label, label_width - 2))
+        pdf.set_fill_color(*(colors or {}).get(label, TIPO_COLORS[0]))
+        pdf.rect(x + label_width, row_y, max(bar_area * value / maximum, 0.3), row_height * 0.7, style='F')
+        pdf.set_xy(x + label_width + bar_area * value / maximum + 1, row_y)
+        pdf.cell(value_width, row_height * 0.7, str(int(value)))
+
+def _table(pdf: ReportPDF, headings: Sequence[str], rows: Iterable[Sequence], col_widths: Sequence[float],
+           row_height: float = 4.5):
+    """
+    Tabla de una línea por fila, con la cabecera repetida en cada página. Las
+    celdas se recortan al ancho de su columna (sin ajuste de línea), lo que
+    mantiene el coste por fila constante en reportes de cientos de tareas.
+    """
+    def draw_headings():
+        pdf.set_font(pdf.font_family_name, 'B', 8)
+        pdf.set_fill_color(*HEADER_FILL)
+        for heading, width in zip(headings, col_widths):
+            pdf.cell(width, row_height + 1, pdf.fit_text(heading, width - 2), border=1, fill=True)
+        pdf.ln(row_height + 1)
+        pdf.set_font(pdf.font_family_name, '', 8)
+
+    limit = pdf.h - pdf.b_margin - row_height
+    pdf.set_draw_color(160, 160, 160)
+    draw_headings()
+    for values in rows:
+        if pdf.get_y() > limit:
+            pdf.add_page()
+            draw_headings()
+        for value, width in zip(values, col_widths):
+            pdf.cell(width, row_height, pdf.fit_text(value, width - 2), border=1)
+        pdf.ln(row_height)
+
+def crosstab_widths(available: float, n_estados: int) -> List[float]:
+    """
+    Anchos de la tabla de proyectos por estado (proyecto, un conteo por estado
+    y total) repartidos dentro del ancho útil de la página: las columnas de
+    conteo se estrechan cuando hay muchos estados en lugar de salirse del margen.
+    """
+    count_width = min(CROSSTAB_COUNT_WIDTH, (available - CROSSTAB_MIN_NAME_WIDTH) / (n_estados + 1))
+    name_width = min(CROSSTAB_NAME_WIDTH, available - count_width * (n_estados + 1))
+    return [name_width] + [count_width] * (n_estados + 1)
+
+def dashboard_section(pdf: ReportPDF, df: pd.DataFrame):
+    """KPIs y distribución por estado y prioridad (mismos conteos que el dashboard)."""
+    pdf.start_section("Dashboard Ejecutivo")
+    estado_counts = _observed(df['estado'].value_counts())
+    prioridad_counts = _observed(df['prioridad'].value_counts())
+
+    kpis = [
+        ("Total Tareas", len(df)),
+        ("Pendientes", estado_counts.get('pendiente', 0)),
+        ("En Progreso", estado_counts.get('en progreso', 0)),
+        ("Completadas", estado_counts.get('completado', 0)),
+        ("Aprobados", estado_counts.get('aprobado', 0)),
+    ]
+    box_width = (pdf.epw - 4 * 4) / len(kpis)
+    y = pdf.get_y()
+    for i, (label, value) in enumerate(kpis):
+        x = pdf.l_margin + i * (box_width + 4)
+        pdf.set_fill_color(221, 235, 247)
+        pdf.rect(x, y, box_width, 22, style='F')
+        pdf.set_xy(x, y + 2)
+        pdf.set_font(pdf.font_family_name, '', 9)
+        pdf.cell(box_width, 6, label, align='C')
+        pdf.set_xy(x, y + 9)
+        pdf.set_font(pdf.font_family_name, 'B', 18)
+        pdf.cell(box_width, 10, str(int(value)), align='C')
+
+    chart_y = y + 30
+    half = (pdf.epw - 10) / 2
+    _bar_chart(pdf, pdf.l_margin, chart_y, half, 80, estado_counts.sort_values(ascending=False), "Tareas por Estado", ESTADO_COLORS)
+    prioridad = prioridad_counts[prioridad_counts.index.isin(PRIORITY_ORDER)].reindex(PRIORITY_ORDER).dropna()
+    prioridad.index = [PRIORIDAD_LABELS[p] for p in prioridad.index]
+    _bar_chart(pdf, pdf.l_margin + half + 10, chart_y, half, 80, prioridad, "Tareas por Prioridad")
+
+    # Resumen por proyecto
+    pdf.set_xy(pdf.l_margin, chart_y + 88)
+    pdf.set_font(pdf.font_family_name, 'B', 11)
+    pdf.cell(0, 7, "Tareas por Proyecto y Estado", new_x='LMARGIN', new_y='NEXT')
+    resumen = pd.crosstab(df['proyecto'].astype(str), df['estado'].astype(str))
+    estados = list(resumen.columns)
+    widths = crosstab_widths(pdf.epw, len(estados))
+    rows = ([proyecto] + [str(int(v)) for v in fila] + [str(int(sum(fila)))] for proyecto, fila in zip(resumen.index, resumen.to_numpy()))
+    _table(pdf, ["Proyecto"] + [e.capitalize() for e in estados] + ["Total"], rows, widths)
+
+def _gantt_ticks(fecha_minima: pd.Timestamp, fecha_maxima: pd.Timestamp) -> Tuple[pd.DatetimeIndex, str]:
+    """Marcas del eje temporal: semanas en rangos cortos, meses en el resto."""
+    days = (fecha_maxima - fecha_minima).days + 1
+    if days <= 70:
+        return pd.date_range(fecha_minima.normalize(), fecha_maxima, freq='W-MON'), '%d/%m'
+    step = max(1, int(np.ceil(days / 30 / 14)))
+    return pd.date_range(fecha_minima.normalize() + pd.offsets.MonthBegin(0), fecha_maxima, freq=f'{step}MS'), '%m/%Y'
+
+def gantt_section(pdf: ReportPDF, frame: pd.DataFrame):
+    """
+    Gantt paginado dibujado con rectángulos a partir del frame de
+    'prepare_gantt_frame'. La escala de tiempo es la misma en todas las
+    páginas; cada página repite el eje de fechas.
+    """
+    pdf.start_section("Diagrama de Gantt")
+    if frame.empty:
+        pdf.set_font(pdf.font_family_name, '', 10)
+        pdf.cell(0, 6, "No hay tareas con fechas válidas para mostrar en el diagrama de Gantt.")
+        return
+
+    fecha_minima = frame['fecha_inicio'].min()
+    fecha_maxima = frame['fecha_limite'].max()
+    total_days = (fecha_maxima - fecha_minima).days + 1
+    chart_x = pdf.l_margin + GANTT_LABEL_WIDTH
+    chart_w = pdf.epw - GANTT_LABEL_WIDTH
+    scale = chart_w / total_days
+    ticks, tick_format = _gantt_ticks(fecha_minima, fecha_maxima)
+
+    labels = frame['task_label'].to_numpy()
+    starts = frame['inicio_dias'].to_numpy()
+    durations = frame['duracion'].to_numpy()
+    tipos = frame['tipo_code'].to_numpy()
+
+    # Las filas de cada página caben entre el eje y el pie
+    top = pdf.get_y()
+    rows_per_page = int((pdf.h - pdf.b_margin - top - 8) // GANTT_ROW_HEIGHT)
+    for page_start in range(0, len(frame), rows_per_page):
+        if page_start > 0:
+            pdf.add_page()
+            top = pdf.get_y()
+        axis_y = top + 6
+        pdf.set_font(pdf.font_family_name, '', 7)
+        pdf.set_draw_color(200, 200, 200)
+        page_rows = min(rows_per_page, len(frame) - page_start)
+        bottom = axis_y + page_rows * GANTT_ROW_HEIGHT
+        for tick in ticks:
+            tick_x = chart_x + (tick - fecha_minima).days * scale
+            pdf.line(tick_x, axis_y, tick_x, bottom)
+            pdf.set_xy(tick_x - 8, top)
+            pdf.cell(16, 5, tick.strftime(tick_format), align='C')
+
+        pdf.set_font(pdf.font_family_name, '', 7.5)
+        for i in range(page_rows):
+            row = page_start + i
+            row_y = axis_y + i * GANTT_ROW_HEIGHT
+            pdf.set_xy(pdf.l_margin, row_y)
+            pdf.cell(GANTT_LABEL_WIDTH, GANTT_ROW_HEIGHT, pdf.fit_text(labels[row], GANTT_LABEL_WIDTH - 2))
+            pdf.set_fill_color(*TIPO_COLORS[tipos[row]])
+            pdf.rect(chart_x + starts[row] * scale, row_y + 1, max(durations[row] * scale, 0.4), GANTT_ROW_HEIGHT - 2, style='F')
+        pdf.set_y(bottom + 2)
+
+    # Leyenda
+    pdf.set_font(pdf.font_family_name, '', 8)
+    for tipo, color in zip(['Tarea', 'Subtarea'], TIPO_COLORS):
+        pdf.set_fill_color(*color)
+        pdf.rect(pdf.get_x(), pdf.get_y() + 1, 4, 3, style='F')
+        pdf.set_x(pdf.get_x() + 5)
+        pdf.cell(20, 5, tipo)
+
+def general_section(pdf: ReportPDF, df: pd.DataFrame):
+    """Tareas por persona asignada con el resumen de estados de cada una."""
+    pdf.start_section("Reporte General de Actividades")
+    personas = df['asignados'].explode().dropna()
+    if personas.empty:
+        pdf.set_font(pdf.font_family_name, '', 10)
+        pdf.cell(0, 6, "No hay datos para los filtros seleccionados.")
+        return
+
+    columns = df[['nombre', 'proyecto', 'fecha_inicio', 'fecha_limite', 'estado']]
+    widths = [120.0, 60.0, 28.0, 28.0, 30.0]
+    for persona, rows in personas.groupby(personas, sort=True).groups.items():
+        person_df = columns.loc[rows.unique()]
+        resumen = _observed(person_df['estado'].value_counts())
+        if pdf.get_y() > pdf.h - pdf.b_margin - 30:
+            pdf.add_page()
+        pdf.set_font(pdf.font_family_name, 'B', 12)
+        pdf.cell(0, 8, pdf.text_safe(f"{persona} ({len(person_df)} tareas)"), new_x='LMARGIN', new_y='NEXT')
+        pdf.set_font(pdf.font_family_name, '', 9)
+        pdf.cell(0, 5, pdf.text_safe(" · ".join(f"{estado}: {int(n)}" for estado, n in resumen.items())), new_x='LMARGIN', new_y='NEXT')
+        pdf.ln(1)
+        _table(pdf, ["Tarea", "Proyecto", "Fecha inicio", "Fecha fin", "Estado"], (
+            (nombre, proyecto, format_date_for_display(inicio), format_date_for_display(fin), estado)
+            for nombre, proyecto, inicio, fin, estado in person_df.itertuples(index=False, name=None)
+        ), widths)
+        pdf.ln(4)
+
+def build_pdf_report(df: pd.DataFrame, sections: Optional[List[str]] = None, title: str = "Reporte de Actividades") -> bytes:
+    """
+    Genera el PDF (dashboard, Gantt paginado y reporte general por persona) a
+    partir del mismo DataFrame filtrado que reciben los exportadores de Excel.
+    Todo se dibuja como texto y formas vectoriales, sin capturas del navegador.
+    """
+    pdf = ReportPDF(title)
+    for section in sections or PDF_SECTIONS:
+        if section == 'dashboard':
+            dashboard_section(pdf, df)
+        elif section == 'gantt':
+            gantt_section(pdf, prepare_gantt_frame(df))
+        elif section == 'general':
+            general_section(pdf, df)
+        else:
+            raise ValueError(f"Sección de PDF desconocida: {section}")
+    return bytes(pdf.output())
@@ -1,51 +1,104 @@
-import pandas as pd
-from typing import List, Optional
-
-class DataManager:
-    """
-    Clase para gestionar la lógica de negocio y el procesamiento de datos de tareas.
-    Se inicializa con un DataFrame y proporciona métodos para filtrarlo.
-    """
-    def __init__(self, df: pd.DataFrame):
-        self.df = df.copy()
-
-    def filter_by_date_range(self, start_date: Optional[pd.Timestamp], end_date: Optional[pd.Timestamp]) -> 'DataManager':
-        """
-        Filtra el DataFrame para incluir solo tareas dentro del rango de fechas especificado.
-        Se aplica sobre la columna 'fecha_inicio'.
-        """
-        temp_df = self.df
-        if pd.notna(start_date):
-            temp_df = temp_df[temp_df['fecha_inicio'] >= start_date]
-        if pd.notna(end_date):
-            temp_df = temp_df[temp_df['fecha_inicio'] <= end_date]
-        return DataManager(temp_df)
-
-    def filter_by_status(self, statuses: Optional[List[str]]) -> 'DataManager':
-        """Filtra el DataFrame por una lista de estados."""
-        if statuses:
-            return DataManager(self.df[self.df['estado'].isin(statuses)])
-        return self
-
-    def filter_by_area(self, areas: Optional[List[str]]) -> 'DataManager':
-        """Filtra el DataFrame por una lista de áreas."""
-        if areas:
-            return DataManager(self.df[self.df['area'].isin(areas)])
-        return self
-
-    def filter_by_project(self, projects: Optional[List[str]]) -> 'DataManager':
-        """Filtra el DataFrame por una lista de proyectos."""
-        if projects:
-            return DataManager(self.df[self.df['proyecto'].isin(projects)])
-        return self
-
-    def get_data(self) -> pd.DataFrame:
-        """Devuelve el DataFrame filtrado actual."""
-        return self.df
-
-    def get_unique_values(self, column: str) -> List[str]:
-        """
-        Devuelve una lista de valores únicos para una columna dada,
-        excluyendo los valores nulos o vacíos.
-        """
-        return sorted(self.df[column].dropna().unique().tolist())
+import pandas as pd
+from typing import List, Optional
+
+from utils import name_contains
+
+class DataManager:
+    """
+    Clase para gestionar la lógica de negocio y el procesamiento de datos de tareas.
+    Se inicializa con un DataFrame y proporciona métodos para filtrarlo.
+    """
+    def __init__(self, df: pd.DataFrame):
+        self.df = df.copy()
+
+    def filter_by_date_range(self, start_date: Optional[pd.Timestamp], end_date: Optional[pd.Timestamp]) -> 'DataManager':
+        """
+        Filtra el DataFrame para incluir solo tareas dentro del rango de fechas especificado.
+        Se aplica sobre la columna 'fecha_inicio'.
+        """
+        temp_df = self.df
+        if pd.notna(start_date):
+            temp_df = temp_df[temp_df['fecha_inicio'] >= start_date]
+        if pd.notna(end_date):
+            temp_df = temp_df[temp_df['fecha_inicio'] <= end_date]
+        return DataManager(temp_df)
+
+    def filter_by_status(self, statuses: Optional[List[str]]) -> 'DataManager':
+        """Filtra el DataFrame por una lista de estados."""
+        if statuses:
+            return DataManager(self.df[self.df['estado'].isin(statuses)])
+        return self
+
+    def filter_by_area(self, areas: Optional[List[str]]) -> 'DataManager':
+        """Filtra el DataFrame por una lista de áreas."""
+        if areas:
+            return DataManager(self.df[self.df['area'].isin(areas)])
+        return self
+
+    def filter_by_project(self, projects: Optional[List[str]]) -> 'DataManager':
+        """Filtra el DataFrame por una lista de proyectos."""
+        if projects:
+            return DataManager(self.df[self.df['proyecto'].isin(projects)])
+        return self
+
+    def get_data(self) -> pd.DataFrame:
+        """Devuelve el DataFrame filtrado actual."""
+        return self.df
+
+    def get_unique_values(self, column: str) -> List[str]:
+        """
+        Devuelve una lista de valores únicos para una columna dada,
+        excluyendo los valores nulos o vacíos.
+        """
+        return sorted(self.df[column].dropna().unique().tolist())
+
+def filter_data_hierarchically(df, areas, proyectos, estados, fecha_inicio, fecha_fin, search_term, task_type_filter):
+    """
+    Filtra el DataFrame de forma jerárquica aplicando todos los filtros.
+    """
+    # 1. Aplicar filtros estándar
+    filtered_df = df.copy()
+    if areas:
+        filtered_df = filtered_df[filtered_df['area'].isin(areas)]
+    if proyectos:
+        filtered_df = filtered_df[filtered_df['proyecto'].isin(proyectos)]
+    if estados:
+        filtered_df = filtered_df[filtered_df['estado'].isin(estados)]
+    if pd.notna(fecha_inicio) and pd.notna(fecha_fin):
+        filtered_df = filtered_df[
+            (filtered_df['fecha_inicio'].notna()) &
+            (filtered_df['fecha_inicio'] >= fecha_inicio) & 
+            (filtered_df['fecha_inicio'] <= fecha_fin)
+        ]
+    if search_term:
+        filtered_df = filtered_df[
+            name_contains(filtered_df['nombre'], search_term)
+        ]
+
+    # 2. Lógica jerárquica para mantener la integridad de las tareas
+    parent_ids_from_subtasks = filtered_df[filtered_df['is_subtask']]['parent_id'].dropna().unique()
+    final_parent_ids = set(filtered_df[~filtered_df['is_subtask']]['id']) | set(parent_ids_from_subtasks)
+    
+    result_df = df[
+        df['id'].isin(final_parent_ids) | df['parent_id'].isin(final_parent_ids)
+    ].copy()
+
+    # 3. Aplicar el filtro de tipo de tarea al final
+    if task_type_filter == 'Solo Tareas':
+        # Muestra solo las tareas principales del conjunto ya filtrado jerárquicamente
+        return result_df[~result_df['is_subtask']]
+    elif task_type_filter == 'Solo Subtareas':
+        # Muestra solo las subtareas del conjunto ya filtrado
+        return result_df[result_df['is_subtask']]
+    else: # 'Todas'
+        return result_df
+
+
+def unassigned_personnel(df_original: pd.DataFrame, df_filtrado: pd.DataFrame) -> List[str]:
+    """
+    Personas asignadas a alguna tarea del conjunto completo que no tienen
+    ninguna tarea en el conjunto filtrado, ordenadas por nombre.
+    """
+    all_personnel = set(df_original['asignados'].explode().dropna())
+    personnel_with_tasks = set(df_filtrado['asignados'].explode().dropna())
+    return sorted(all_personnel - personnel_with_tasks)
@@ -0,0 +1,232 @@
+import importlib.util
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from dataset import Dataset, load_dataset
+from federation import is_federated, resolve_sources
+from incremental import IncrementalLoader
+
+# Ruta del script que descarga el espacio de ClickUp (fuera del paquete 'src')
+CLICKUP_SCRIPT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Json', 'main.py'))
+
+class FileSource:
+    """
+    Fuente basada en un archivo JSON: hay datos nuevos cuando cambian la fecha
+    de modificación o el tamaño del archivo. Con 'debounce' > 0 el cambio solo
+    se notifica cuando el archivo lleva ese tiempo sin modificarse (evita
+    recargar a mitad de una sincronización). La carga es incremental: solo se
+    procesan los proyectos cuyo contenido cambió (ver 'IncrementalLoader').
+    """
+    def __init__(self, path: str, debounce: float = 0.0):
+        self.path = path
+        self.debounce = debounce
+        self.loader = IncrementalLoader(path)
+        self._stable = self._stat()
+        self._pending = None
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def version(self):
+        current = self._stat()
+        if current == self._stable or self.debounce <= 0:
+            self._stable, self._pending = current, None
+            return current
+        now = time.monotonic()
+        if self._pending is None or self._pending[0] != current:
+            # Primer cambio observado (o el archivo sigue cambiando): se espera
+            self._pending = (current, now)
+        elif now - self._pending[1] >= self.debounce:
+            self._stable, self._pending = current, None
+        return self._stable
+
+    def load(self) -> Dataset:
+        return self.loader.load()
+
+
+class FederatedSource(FileSource):
+    """
+    Fuente con varias exportaciones de espacio (directorio o patrón glob). Hay
+    una versión nueva cuando cambia el conjunto de archivos o alguno de ellos;
+    al cargar, solo se vuelven a parsear los espacios modificados (el resto
+    sale de la caché por espacio).
+    """
+    def _stat(self):
+        versions = []
+        for path in resolve_sources(self.path):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            versions.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(versions)
+
+    def load(self) -> Dataset:
+        return load_dataset(self.path)
+
+
+def data_source(path: str, debounce: float = 0.0) -> FileSource:
+    """Fuente de archivo adecuada para 'path': un único JSON o varias exportaciones."""
+    return FederatedSource(path, debounce) if is_federated(path) else FileSource(path, debounce)
+
+
+class ClickUpSource(FileSource):
+    """
+    Fuente que descarga el espacio de ClickUp con 'fetch' (una función que
+    devuelve la estructura anidada), la guarda de forma atómica en 'path' y la
+    carga. La versión cambia cada 'min_interval' segundos, de modo que la API
+    se consulta como mucho una vez por intervalo (salvo actualización forzada).
+    """
+    def __init__(self, path: str, fetch: Callable[[], dict], save: Callable[[dict, str], None], min_interval: float = 300.0):
+        super().__init__(path)
+        self.fetch = fetch
+        self.save = save
+        self.min_interval = min_interval
+
+    def version(self):
+        return int(time.monotonic() // self.min_interval)
+
+    def load(self) -> Dataset:
+        self.save(self.fetch(), self.path)
+        return super().load()
+
+
+def clickup_source(path: str, api_base: Optional[str] = None, min_interval: float = 300.0) -> ClickUpSource:
+    """
+    Crea una ClickUpSource a partir de 'Json/main.py'. 'api_base' permite
+    apuntar a un servidor simulado en lugar de la API real.
+    """
+    spec = importlib.util.spec_from_file_location('clickup_main', CLICKUP_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    base = api_base or module.API_BASE
+    return ClickUpSource(
+        path,
+        fetch=lambda: module.construir_estructura(api_base=base),
+        save=module.guardar_estructura,
+        min_interval=min_interval,
+    )
+
+
+def open_source(path: str, fuente: str = 'archivo', debounce: float = 0.0):
+    """
+    Crea la fuente indicada por 'fuente' ('archivo', 'clickup' o 'compartido')
+    y un DatasetHolder con su primera carga. Con ClickUp la primera descarga se
+    deja al RefreshWorker y se parte del archivo existente.
+    """
+    if fuente == 'compartido':
+        # Réplica: adjunta los datos que publica el cargador (src/shared_dataset.py)
+        from shared_dataset import SharedSource
+        source = SharedSource()
+        return source, _first_load(source)
+    if fuente == 'clickup':
+        source = clickup_source(path)
+        return source, DatasetHolder(source.loader.load())
+    source = data_source(path, debounce)
+    return source, _first_load(source)
+
+def _first_load(source) -> 'DatasetHolder':
+    """
+    Primera carga de una fuente. La versión se lee antes de cargar: si los
+    datos cambian durante la carga, el RefreshWorker ve una versión distinta
+    y vuelve a cargar (leerla después marcaría como vigentes datos viejos).
+    """
+    version = source.version()
+    return DatasetHolder(source.load(), version)
+
+
+class DatasetHolder:
+    """
+    Referencia compartida al Dataset vigente. El cambio es un único reemplazo
+    de referencia bajo un lock: cada ejecución de la app toma el Dataset al
+    principio y trabaja con él completo aunque entre tanto se publique otro.
+    """
+    def __init__(self, dataset: Dataset, source_version=None):
+        self._lock = threading.Lock()
+        self._dataset = dataset
+        self.source_version = source_version
+        self.version = 1
+        self.updated_at = time.time()
+
+    def get(self) -> Dataset:
+        with self._lock:
+            return self._dataset
+
+    def snapshot(self):
+        """Dataset vigente junto con su número de versión, leídos a la vez."""
+        with self._lock:
+            return self._dataset, self.version
+
+    def swap(self, dataset: Dataset, source_version=None):
+        with self._lock:
+            self._dataset = dataset
+            self.source_version = source_version
+            self.version += 1
+            self.updated_at = time.time()
+
+
+class RefreshWorker(threading.Thread):
+    """
+    Hilo en segundo plano que consulta la fuente cada 'interval' segundos y,
+    si hay una versión nueva, construye el Dataset (normalización, validación,
+    índices) fuera de las peticiones y lo publica en el DatasetHolder.
+    'on_publish' se llama con cada Dataset publicado (p. ej. para guardar una
+    instantánea en el historial).
+    """
+    def __init__(self, source, holder: DatasetHolder, interval: float = 30.0, on_publish: Optional[Callable[[Dataset], None]] = None):
+        super().__init__(name='refresh-worker', daemon=True)
+        self.source = source
+        self.holder = holder
+        self.interval = interval
+        self.on_publish = on_publish
+        self.last_error: Optional[str] = None
+        self.refreshing = False
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._force = False
+
+    def run_once(self, force: bool = False) -> bool:
+        """Comprueba la fuente y publica un Dataset nuevo si corresponde. Devuelve True si hubo cambio."""
+        version = self.source.version()
+        if not force and (version is None or version == self.holder.source_version):
+            return False
+        self.refreshing = True
+        try:
+            dataset = self.source.load()
+            if dataset.empty:
+                self.last_error = "La fuente no devolvió datos; se mantiene la versión anterior."
+                return False
+            # Se guarda la versión leída antes de cargar: un cambio durante la
+            # carga se detecta en la siguiente consulta.
+            self.holder.swap(dataset, version)
+            self.last_error = None
+            if self.on_publish is not None:
+                self.on_publish(dataset)
+            return True
+        except Exception as e:
+            self.last_error = f"Error al actualizar los datos: {e}"
+            return False
+        finally:
+            self.refreshing = False
+
+    def request_refresh(self):
+        """Pide una actualización inmediata sin esperar al siguiente intervalo ni bloquear al llamador."""
+        self._force = True
+        self._wake.set()
+
+    def stop(self):
+        self._stopping.set()
+        self._wake.set()
+
+    def run(self):
+        while not self._stopping.is_set():
+            force, self._force = self._force, False
+            self.run_once(force)
+            self._wake.wait(self.interval)
+            self._wake.clear()
@@ -0,0 +1,101 @@
+"""
+Generación de reportes Excel y PDF sin navegador.
+
+Ejemplos:
+    python src/report_cli.py --data datos.json --out reportes/
+    python src/report_cli.py --reports detallado gantt --split proyecto --desde 2025-01-01
+    python src/report_cli.py --spec nocturno.json
+    python src/report_cli.py --reports pdf --split persona
+
+El archivo --spec es un JSON con las mismas claves que las opciones
+(areas, proyectos, estados, desde, hasta, buscar, tipo, reports, split);
+las opciones de la línea de comandos tienen prioridad sobre el archivo.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import pandas as pd
+
+from federation import load_tasks
+from filter_cache import TASK_TYPES
+from processors import filter_data_hierarchically
+from report_jobs import DEFAULT_REPORTS, REPORT_FILENAMES, SPLIT_OPTIONS, build_report_jobs, run_report_jobs
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Genera los reportes Excel y PDF del dashboard sin abrir la aplicación.")
+    parser.add_argument('--spec', help="Archivo JSON con la especificación de filtros y reportes.")
+    parser.add_argument('--data', default=None, help="Archivo JSON de tareas, o directorio/patrón glob con varias exportaciones (por defecto datos.json).")
+    parser.add_argument('--out', default=None, help="Directorio de salida (por defecto 'reportes').")
+    parser.add_argument('--reports', nargs='+', choices=list(REPORT_FILENAMES), help="Reportes a generar (por defecto todos los Excel).")
+    parser.add_argument('--areas', nargs='+', help="Áreas a incluir.")
+    parser.add_argument('--proyectos', nargs='+', help="Proyectos a incluir.")
+    parser.add_argument('--estados', nargs='+', help="Estados a incluir.")
+    parser.add_argument('--desde', help="Fecha de inicio mínima (AAAA-MM-DD).")
+    parser.add_argument('--hasta', help="Fecha de inicio máxima (AAAA-MM-DD).")
+    parser.add_argument('--buscar', help="Texto a buscar en el nombre de la tarea.")
+    parser.add_argument('--tipo', choices=TASK_TYPES, help="Tipo de tarea.")
+    parser.add_argument('--split', choices=SPLIT_OPTIONS, help="Generar un libro por proyecto o por persona.")
+    parser.add_argument('--workers', type=int, default=None, help="Número de procesos (por defecto, núcleos disponibles).")
+    return parser.parse_args(argv)
+
+def load_spec(args: argparse.Namespace) -> dict:
+    """Combina el archivo --spec con las opciones explícitas de la línea de comandos."""
+    spec = {}
+    if args.spec:
+        with open(args.spec, 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+    for key, value in vars(args).items():
+        if key != 'spec' and value is not None:
+            spec[key] = value
+
+    spec.setdefault('data', 'datos.json')
+    spec.setdefault('out', 'reportes')
+    spec.setdefault('reports', list(DEFAULT_REPORTS))
+    spec.setdefault('split', 'ninguno')
+    spec.setdefault('tipo', TASK_TYPES[0])
+    return spec
+
+def main(argv=None) -> int:
+    spec = load_spec(parse_args(argv))
+    started = time.perf_counter()
+
+    df_original = load_tasks(spec['data'])
+    if df_original.empty:
+        print(f"No se pudieron cargar datos desde {spec['data']}.", file=sys.stderr)
+        return 1
+
+    # Sin rango explícito no se filtra por fecha (se incluyen tareas sin fecha);
+    # si solo se indica un extremo, el otro se toma de los datos.
+    desde, hasta = spec.get('desde'), spec.get('hasta')
+    if desde or hasta:
+        desde = pd.to_datetime(desde) if desde else df_original['fecha_inicio'].min()
+        hasta = pd.to_datetime(hasta) if hasta else df_original['fecha_inicio'].max()
+    else:
+        desde = hasta = pd.NaT
+
+    df_filtrado = filter_data_hierarchically(
+        df_original,
+        spec.get('areas'),
+        spec.get('proyectos'),
+        spec.get('estados'),
+        desde,
+        hasta,
+        spec.get('buscar'),
+        spec['tipo']
+    )
+    print(f"{len(df_filtrado)} de {len(df_original)} registros según los filtros.")
+
+    jobs = build_report_jobs(df_filtrado, spec['reports'], spec['split'])
+    os.makedirs(spec['out'], exist_ok=True)
+    for filename, data in run_report_jobs(jobs, df_original, spec.get('workers')):
+        with open(os.path.join(spec['out'], filename), 'wb') as f:
+            f.write(data)
+        print(f"  ✅ {filename}")
+
+    print(f"{len(jobs)} reportes generados en '{spec['out']}' ({time.perf_counter() - started:.1f} s).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
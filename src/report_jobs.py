@@ -0,0 +1,149 @@
+import io
+import os
+import re
+import zipfile
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Optional, Tuple
+
+from gantt_prep import prepare_gantt_frame
+from schedule_analytics import analyze_schedule, workload_matrix
+from views.detailed_report_view import df_to_excel_bytes
+from views.gantt_view import gantt_only_to_excel
+from views.general_activity_report_view import generate_general_report_excel
+from views.unassigned_personnel_view import generate_personnel_report_excel
+from views.workload_view import workload_to_excel
+
+# Nombre base del archivo generado por cada tipo de reporte
+REPORT_FILENAMES = {
+    'detallado': 'reporte_detallado_tareas',
+    'gantt': 'diagrama_gantt',
+    'personal': 'reporte_personal_actividad',
+    'general': 'reporte_general_actividades',
+    'carga': 'carga_de_trabajo',
+    'pdf': 'reporte_actividades',
+}
+# Extensión de los reportes que no son libros Excel
+REPORT_EXTENSIONS = {'pdf': 'pdf'}
+# Reportes que se generan si no se indica ninguno (los libros Excel)
+DEFAULT_REPORTS = [key for key in REPORT_FILENAMES if key not in REPORT_EXTENSIONS]
+SPLIT_OPTIONS = ['ninguno', 'proyecto', 'persona']
+
+# DataFrame completo compartido por los procesos del pool (se fija en el inicializador)
+_worker_original_df: Optional[pd.DataFrame] = None
+
+def _init_worker(original_df: pd.DataFrame):
+    global _worker_original_df
+    _worker_original_df = original_df
+
+def build_report(report_key: str, df: pd.DataFrame, original_df: pd.DataFrame) -> bytes:
+    """
+    Genera los bytes del libro Excel (o del PDF) de un tipo de reporte usando
+    los mismos exportadores que las vistas de la aplicación.
+    """
+    if report_key == 'detallado':
+        return df_to_excel_bytes(df)
+    if report_key == 'gantt':
+        frame = prepare_gantt_frame(df)
+        return gantt_only_to_excel(frame, original_df, analyze_schedule(frame, original_df))
+    if report_key == 'personal':
+        return generate_personnel_report_excel(original_df, df)
+    if report_key == 'general':
+        return generate_general_report_excel(df)
+    if report_key == 'carga':
+        frame = prepare_gantt_frame(df)
+        return workload_to_excel(workload_matrix(frame, df['asignados']), 'Día')
+    if report_key == 'pdf':
+        from pdf_report import build_pdf_report
+        return build_pdf_report(df)
+    raise ValueError(f"Tipo de reporte desconocido: {report_key}")
+
+def _run_job(report_key: str, filename: str, df: pd.DataFrame) -> Tuple[str, bytes]:
+    return filename, build_report(report_key, df, _worker_original_df)
+
+def safe_filename(label: str) -> str:
+    """Convierte una etiqueta (proyecto, persona) en un fragmento válido de nombre de archivo."""
+    return re.sub(r'[^\w\-]+', '_', str(label)).strip('_') or 'sin_nombre'
+
+def split_frame(df: pd.DataFrame, split_by: str) -> Iterator[Tuple[Optional[str], pd.DataFrame]]:
+    """
+    Particiona el DataFrame una sola vez con groupby. Con split_by='persona'
+    cada tarea aparece en la partición de cada uno de sus asignados.
+    """
+    if split_by == 'ninguno':
+        yield None, df
+    elif split_by == 'proyecto':
+        for proyecto, part in df.groupby('proyecto', sort=True, observed=True):
+            yield proyecto, part
+    elif split_by == 'persona':
+        personas = df['asignados'].explode().dropna()
+        for persona, rows in personas.groupby(personas, sort=True).groups.items():
+            yield persona, df.loc[rows.unique()]
+    else:
+        raise ValueError(f"Opción de división desconocida: {split_by}")
+
+def build_report_jobs(df: pd.DataFrame, reports: List[str], split_by: str = 'ninguno') -> List[Tuple[str, str, pd.DataFrame]]:
+    """
+    Devuelve la lista de trabajos (tipo de reporte, nombre de archivo, DataFrame)
+    para los reportes pedidos y la división indicada. Los nombres de archivo
+    son únicos aunque dos etiquetas coincidan tras limpiarlas.
+    """
+    jobs = []
+    used = set()
+    for label, part in split_frame(df, split_by):
+        suffix = f"_{safe_filename(label)}" if label is not None else ''
+        # Etiquetas distintas pueden dar el mismo nombre ('Obra/Norte' y 'Obra Norte'):
+        # se añade un sufijo numérico (sin distinguir mayúsculas, como muchos sistemas de archivos)
+        unique, number = suffix, 2
+        while unique.casefold() in used:
+            unique, number = f"{suffix}_{number}", number + 1
+        used.add(unique.casefold())
+        suffix = unique
+        for report_key in reports:
+            extension = REPORT_EXTENSIONS.get(report_key, 'xlsx')
+            jobs.append((report_key, f"{REPORT_FILENAMES[report_key]}{suffix}.{extension}", part))
+    return jobs
+
+def run_report_jobs(jobs: List[Tuple[str, str, pd.DataFrame]], original_df: pd.DataFrame, max_workers: Optional[int] = None,
+                    processes: bool = True) -> Iterator[Tuple[str, bytes]]:
+    """
+    Genera los libros de los trabajos en paralelo y los devuelve (nombre de
+    archivo, bytes) a medida que terminan. Con un solo trabajo o max_workers=1
+    se ejecuta en el proceso actual.
+
+    Con processes=True (la CLI, un proceso de un solo hilo) se usa un pool de
+    procesos. Con processes=False (la aplicación) se usa un pool de hilos: el
+    servidor de Streamlit tiene varios hilos, por lo que no debe bifurcarse
+    (fork), y así los trabajos leen los DataFrames sin copiarlos ni
+    serializarlos.
+    """
+    max_workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    if max_workers <= 1 or len(jobs) <= 1:
+        for report_key, filename, df in jobs:
+            yield filename, build_report(report_key, df, original_df)
+        return
+
+    if processes:
+        executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(original_df,))
+        run = _run_job
+    else:
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='reportes')
+        run = lambda report_key, filename, df: (filename, build_report(report_key, df, original_df))
+    with executor:
+        futures = [executor.submit(run, *job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+def reports_to_zip(jobs: List[Tuple[str, str, pd.DataFrame]], original_df: pd.DataFrame, max_workers: Optional[int] = None,
+                   processes: bool = True) -> bytes:
+    """
+    Genera los libros en paralelo (ver 'run_report_jobs') y los va escribiendo
+    en un único ZIP a medida que terminan, sin retener todos los libros en
+    memoria a la vez. Los xlsx (y los flujos de los PDF) ya vienen
+    comprimidos, por lo que se almacenan sin volver a comprimir.
+    """
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_STORED) as zf:
+        for filename, data in run_report_jobs(jobs, original_df, max_workers, processes):
+            zf.writestr(filename, data)
+    return output.getvalue()
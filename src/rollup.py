@@ -0,0 +1,107 @@
+import pandas as pd
+from typing import List, Optional
+
+# Dimensiones del cubo. 'mes_inicio' es el mes de 'fecha_inicio' y
+# 'familia_con_fecha' indica si la familia (tarea principal + subtareas)
+# tiene al menos un miembro con fecha de inicio.
+CUBE_DIMENSIONS = [
+    'area', 'proyecto', 'estado', 'prioridad',
+    'is_subtask', 'mes_inicio', 'familia_con_fecha'
+]
+
+
+def family_keys(df: pd.DataFrame) -> pd.Series:
+    """
+    Devuelve la clave de familia de cada fila: el id de la tarea principal
+    para las tareas y el 'parent_id' para las subtareas.
+    """
+    return df['parent_id'].where(df['parent_id'].notna(), df['id'])
+
+
+class RollupCube:
+    """
+    Cubo de conteos precalculado por (área, proyecto, estado, prioridad,
+    tipo, mes de inicio). Permite responder los KPIs y gráficos del dashboard
+    sumando celdas, sin recorrer las filas de tareas. Cada celda guarda
+    además la primera y la última fecha de inicio de sus tareas.
+    """
+    def __init__(self, cells: pd.DataFrame):
+        self.cells = cells
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'RollupCube':
+        """Construye el cubo agrupando una sola vez el DataFrame normalizado."""
+        if df.empty:
+            return cls(pd.DataFrame(columns=CUBE_DIMENSIONS + ['tareas', 'inicio_min', 'inicio_max']))
+
+        keys = pd.DataFrame({
+            'area': df['area'],
+            'proyecto': df['proyecto'],
+            'estado': df['estado'],
+            'prioridad': df['prioridad'],
+            'is_subtask': df['is_subtask'],
+            'mes_inicio': df['fecha_inicio'].dt.to_period('M'),
+            'familia_con_fecha': df['fecha_inicio'].notna().groupby(family_keys(df)).transform('any'),
+            'fecha_inicio': df['fecha_inicio'],
+        })
+        cells = keys.groupby(CUBE_DIMENSIONS, dropna=False, observed=True)['fecha_inicio'].agg(
+            tareas='size', inicio_min='min', inicio_max='max'
+        ).reset_index()
+        return cls(cells)
+
+    def slice(
+        self,
+        areas: Optional[List[str]] = None,
+        proyectos: Optional[List[str]] = None,
+        estados: Optional[List[str]] = None,
+        is_subtask: Optional[bool] = None,
+        familia_con_fecha: Optional[bool] = None,
+    ) -> 'RollupCube':
+        """Devuelve un sub-cubo con las celdas que cumplen los filtros dados."""
+        mask = pd.Series(True, index=self.cells.index)
+        if areas:
+            mask &= self.cells['area'].isin(areas)
+        if proyectos:
+            mask &= self.cells['proyecto'].isin(proyectos)
+        if estados:
+            mask &= self.cells['estado'].isin(estados)
+        if is_subtask is not None:
+            mask &= self.cells['is_subtask'] == is_subtask
+        if familia_con_fecha is not None:
+            mask &= self.cells['familia_con_fecha'] == familia_con_fecha
+        return RollupCube(self.cells[mask])
+
+    def total(self) -> int:
+        """Número total de tareas representadas por el cubo."""
+        return int(self.cells['tareas'].sum())
+
+    def counts_by(self, dimension: str) -> pd.Series:
+        """
+        Suma las celdas por una dimensión, omitiendo nulos y valores en cero,
+        ordenado de mayor a menor como 'value_counts'.
+        """
+        counts = self.cells.groupby(dimension, observed=True)['tareas'].sum()
+        return counts[counts > 0].sort_values(ascending=False, kind='stable')
+
+    def for_filters(self, areas, proyectos, estados, fecha_inicio, fecha_fin, search_term, task_type_filter) -> Optional['RollupCube']:
+        """
+        Traduce los filtros globales de la barra lateral a un sub-cubo.
+        Devuelve None cuando la combinación no puede responderse exactamente
+        con el cubo (búsqueda por nombre, filtro de estado o un rango de fechas
+        parcial), ya que la expansión jerárquica depende de cada familia. El
+        rango es completo si cubre las fechas de inicio de las tareas de las
+        áreas y proyectos elegidos (los límites que ofrece la barra lateral).
+        """
+        if search_term or estados:
+            return None
+        if pd.isna(fecha_inicio) or pd.isna(fecha_fin):
+            return None
+        alcance = self.slice(areas=areas, proyectos=proyectos).cells
+        primera, ultima = alcance['inicio_min'].min(), alcance['inicio_max'].max()
+        # Sin fechas de inicio en el alcance no pasa ninguna tarea, con cualquier rango
+        if pd.notna(primera) and (fecha_inicio > primera or fecha_fin < ultima):
+            return None
+
+        # Con el rango completo, una familia se conserva si algún miembro tiene fecha de inicio.
+        is_subtask = {'Solo Tareas': False, 'Solo Subtareas': True}.get(task_type_filter)
+        return self.slice(areas=areas, proyectos=proyectos, is_subtask=is_subtask, familia_con_fecha=True)
@@ -0,0 +1,219 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+def concurrency_segments(keys: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> pd.DataFrame:
+    """
+    Barrido (sweep-line) sobre eventos de inicio/fin ordenados.
+    'keys' son códigos enteros (p. ej. persona), 'starts' y 'ends' días enteros
+    con fin exclusivo. Devuelve los segmentos [inicio, fin) con el número de
+    intervalos activos de cada clave, sin expandir los intervalos día a día.
+    """
+    # Los intervalos vacíos o invertidos no aportan días activos
+    valid = ends > starts
+    keys, starts, ends = keys[valid], starts[valid], ends[valid]
+    if len(keys) == 0:
+        return pd.DataFrame({'key': [], 'inicio': [], 'fin': [], 'activos': []}, dtype='int64')
+
+    ev_keys = np.concatenate([keys, keys])
+    ev_days = np.concatenate([starts, ends])
+    ev_delta = np.concatenate([np.ones(len(starts), dtype=np.int64), -np.ones(len(ends), dtype=np.int64)])
+
+    # Orden por clave y día; en el mismo día los fines (-1) van antes que los inicios
+    order = np.lexsort((ev_delta, ev_days, ev_keys))
+    ev_keys, ev_days, ev_delta = ev_keys[order], ev_days[order], ev_delta[order]
+
+    # Cada clave suma cero, por lo que la suma acumulada global se reinicia sola
+    activos = np.cumsum(ev_delta)
+
+    same_key = ev_keys[:-1] == ev_keys[1:]
+    segments = pd.DataFrame({
+        'key': ev_keys[:-1][same_key],
+        'inicio': ev_days[:-1][same_key],
+        'fin': ev_days[1:][same_key],
+        'activos': activos[:-1][same_key],
+    })
+    return segments[(segments['fin'] > segments['inicio']) & (segments['activos'] > 0)].reset_index(drop=True)
+
+def explode_assignees(frame: pd.DataFrame, asignados: pd.Series) -> pd.DataFrame:
+    """
+    Expande las tareas del frame por persona asignada, conservando el índice
+    de la tarea, sus fechas y su proyecto.
+    """
+    exploded = asignados.reindex(frame.index).explode().dropna()
+    tasks = frame.loc[exploded.index, ['fecha_inicio', 'fecha_limite', 'proyecto', 'nombre']]
+    return tasks.assign(persona=exploded.to_numpy())
+
+def _to_days(dates: pd.Series) -> np.ndarray:
+    """Convierte fechas a días enteros desde la época."""
+    return dates.to_numpy(dtype='datetime64[D]').astype(np.int64)
+
+def _task_days(tasks: pd.DataFrame):
+    """
+    Días de inicio y de fin (exclusivo) de cada tarea. La fecha límite es
+    inclusiva; si es anterior al inicio, la tarea cuenta solo su día de inicio
+    (el mismo criterio que prepare_gantt_frame).
+    """
+    starts = _to_days(tasks['fecha_inicio'])
+    ends = np.maximum(_to_days(tasks['fecha_limite']) + 1, starts + 1)
+    return starts, ends
+
+def project_spans(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calcula el intervalo total de cada proyecto y la tarea que marca su fin
+    (la última en terminar), a partir del frame preparado del Gantt.
+    """
+    if frame.empty:
+        return pd.DataFrame(columns=['Proyecto', 'Inicio', 'Fin', 'Duración (días)', 'Tareas', 'Tarea que define el fin'])
+
+    spans = frame.groupby('proyecto', observed=True).agg(
+        Inicio=('fecha_inicio', 'min'),
+        Fin=('fecha_limite', 'max'),
+        Tareas=('nombre', 'size'),
+    )
+    ultima = frame.sort_values('fecha_limite', kind='stable').drop_duplicates('proyecto', keep='last')
+    spans['Tarea que define el fin'] = ultima.set_index('proyecto')['nombre']
+    spans['Duración (días)'] = (spans['Fin'] - spans['Inicio']).dt.days + 1
+    spans = spans.reset_index().rename(columns={'proyecto': 'Proyecto'})
+    return spans[['Proyecto', 'Inicio', 'Fin', 'Duración (días)', 'Tareas', 'Tarea que define el fin']]
+
+def assignee_overlaps(frame: pd.DataFrame, asignados: pd.Series) -> pd.DataFrame:
+    """
+    Detecta los periodos en que una persona tiene dos o más tareas activas a la
+    vez. Los días consecutivos con solapamiento se agrupan en un único periodo
+    con el máximo de tareas simultáneas.
+    """
+    columns = ['Persona', 'Desde', 'Hasta', 'Días', 'Máx. tareas simultáneas']
+    tasks = explode_assignees(frame, asignados)
+    if tasks.empty:
+        return pd.DataFrame(columns=columns)
+
+    codes, personas = pd.factorize(tasks['persona'])
+    segments = concurrency_segments(codes.astype(np.int64), *_task_days(tasks))
+    segments = segments[segments['activos'] >= 2]
+    if segments.empty:
+        return pd.DataFrame(columns=columns)
+
+    # Unir segmentos contiguos de la misma persona en un solo periodo
+    nuevo_periodo = (segments['key'].diff() != 0) | (segments['inicio'] != segments['fin'].shift())
+    periodos = segments.groupby(nuevo_periodo.cumsum()).agg(
+        key=('key', 'first'), inicio=('inicio', 'min'), fin=('fin', 'max'), activos=('activos', 'max')
+    )
+
+    epoch = np.datetime64('1970-01-01', 'D')
+    result = pd.DataFrame({
+        'Persona': personas[periodos['key'].to_numpy()],
+        'Desde': pd.to_datetime(epoch + periodos['inicio'].to_numpy()),
+        'Hasta': pd.to_datetime(epoch + periodos['fin'].to_numpy() - 1),
+        'Días': (periodos['fin'] - periodos['inicio']).to_numpy(),
+        'Máx. tareas simultáneas': periodos['activos'].to_numpy(),
+    })
+    return result.sort_values(['Persona', 'Desde']).reset_index(drop=True)
+
+def parent_subtask_violations(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Lista las subtareas cuyas fechas quedan fuera de la ventana de su tarea
+    padre. Solo se comparan las fechas informadas (no las derivadas).
+    """
+    columns = ['Proyecto', 'Tarea Padre', 'Subtarea', 'Regla', 'Fecha Subtarea', 'Fecha Padre']
+    parents = df.loc[~df['is_subtask'], ['id', 'nombre', 'fecha_inicio', 'fecha_limite']].drop_duplicates('id')
+    subtasks = df.loc[df['is_subtask'], ['parent_id', 'nombre', 'proyecto', 'fecha_inicio', 'fecha_limite']]
+    pairs = subtasks.merge(parents, left_on='parent_id', right_on='id', suffixes=('', '_padre'))
+
+    reglas = [
+        ('Inicia antes que la tarea padre', 'fecha_inicio', pairs['fecha_inicio'] < pairs['fecha_inicio_padre']),
+        ('Termina después que la tarea padre', 'fecha_limite', pairs['fecha_limite'] > pairs['fecha_limite_padre']),
+    ]
+    partes = [
+        pd.DataFrame({
+            'Proyecto': pairs.loc[mask, 'proyecto'],
+            'Tarea Padre': pairs.loc[mask, 'nombre_padre'],
+            'Subtarea': pairs.loc[mask, 'nombre'],
+            'Regla': regla,
+            'Fecha Subtarea': pairs.loc[mask, columna],
+            'Fecha Padre': pairs.loc[mask, f'{columna}_padre'],
+        })
+        for regla, columna, mask in reglas
+    ]
+    return pd.concat(partes, ignore_index=True)[columns]
+
+def analyze_schedule(frame: pd.DataFrame, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Ejecuta todos los análisis del cronograma sobre el frame preparado del Gantt.
+    'df' es el DataFrame de origen, del que se toman los asignados y las fechas
+    originales de las tareas incluidas en el frame.
+    """
+    tareas = df.loc[frame.index]
+    return {
+        'Duración por Proyecto': project_spans(frame),
+        'Sobrecarga por Persona': assignee_overlaps(frame, tareas['asignados']),
+        'Inconsistencias de Fechas': parent_subtask_violations(tareas),
+    }
+
+def cached_analysis(store: dict, frame: pd.DataFrame, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Devuelve el análisis del cronograma de un frame de Gantt, recalculándolo
+    solo cuando cambia el frame (que ya se prepara una vez por estado de
+    filtros). 'store' es un diccionario persistente (p. ej. la sesión de Streamlit).
+    """
+    cached = store.get('gantt_analytics')
+    if cached is not None and cached[0] is frame:
+        return cached[1]
+
+    analytics = analyze_schedule(frame, df)
+    store['gantt_analytics'] = (frame, analytics)
+    return analytics
+
+def _monday(days: np.ndarray) -> np.ndarray:
+    """Lunes de la semana de cada día (días enteros desde la época, que fue jueves)."""
+    return days - (days + 3) % 7
+
+def workload_matrix(frame: pd.DataFrame, asignados: pd.Series, freq: str = 'D',
+                    desde: Optional[pd.Timestamp] = None, hasta: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """
+    Calcula la carga de trabajo (tareas activas simultáneas) por persona y día.
+    Un barrido sobre los eventos ordenados de inicio y fin de las tareas da
+    los segmentos de carga constante de cada persona (concurrency_segments);
+    solo se reservan las celdas de los periodos que se muestran, entre 'desde'
+    y 'hasta' (inclusive) si se indican, y si no entre el primer inicio y el
+    último fin. Una fecha límite lejana fuera de esa ventana no agranda la
+    matriz. Con freq='W' devuelve el máximo semanal (semanas que comienzan el
+    lunes).
+    """
+    tasks = explode_assignees(frame, asignados)
+    if tasks.empty:
+        return pd.DataFrame()
+
+    codes, personas = pd.factorize(tasks['persona'], sort=True)
+    # Fin exclusivo y nunca anterior al inicio
+    starts, ends = _task_days(tasks)
+    first_day = int(starts.min()) if desde is None else int(_to_days(pd.Series([pd.Timestamp(desde)]))[0])
+    end_day = int(ends.max()) if hasta is None else int(_to_days(pd.Series([pd.Timestamp(hasta)]))[0]) + 1
+    if end_day <= first_day:
+        return pd.DataFrame()
+
+    segments = concurrency_segments(codes, starts, ends)
+    inicio = np.maximum(segments['inicio'].to_numpy(), first_day)
+    fin = np.minimum(segments['fin'].to_numpy(), end_day)
+    visible = fin > inicio
+    keys, inicio, fin = segments['key'].to_numpy()[visible], inicio[visible], fin[visible]
+    activos = segments['activos'].to_numpy()[visible]
+
+    if freq == 'W':
+        origin = int(_monday(np.array([first_day]))[0])
+        num_periods = (end_day - 1 - origin) // 7 + 1
+        first_period, last_period = (inicio - origin) // 7, (fin - 1 - origin) // 7
+        periods = pd.date_range(pd.Timestamp(np.datetime64(origin, 'D')), periods=num_periods, freq='7D')
+    else:
+        num_periods = end_day - first_day
+        first_period, last_period = inicio - first_day, fin - 1 - first_day
+        periods = pd.date_range(pd.Timestamp(np.datetime64(first_day, 'D')), periods=num_periods, freq='D')
+
+    # Cada segmento cubre los periodos [primero, último]; en la vista semanal
+    # varios segmentos caen en la misma semana y se queda el máximo
+    lengths = last_period - first_period + 1
+    rows = np.repeat(keys, lengths)
+    cols = np.repeat(first_period - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+    carga = np.zeros((len(personas), num_periods), dtype=np.int32)
+    np.maximum.at(carga, (rows, cols), np.repeat(activos, lengths).astype(np.int32))
+    return pd.DataFrame(carga, index=pd.Index(personas, name='Persona'), columns=periods)
@@ -0,0 +1,265 @@
+"""
+Publicación del conjunto de datos normalizado en memoria compartida.
+
+Un proceso cargador normaliza los datos una vez y escribe la representación
+compacta (CompactTasks) como arreglos .npy en un directorio, idealmente en un
+sistema de archivos en memoria como /dev/shm:
+
+    /dev/shm/reporte/
+        ACTUAL                        versión vigente (se reemplaza de forma atómica)
+        v-1741600000000000000/
+            manifiesto.json           columnas, diccionarios, número de filas y huella
+            area.npy, fecha_inicio.npy, nombre_texto.npy, ...   arreglos tipados
+            dic.area.texto.npy, dic.area.offsets.npy          diccionarios en UTF-8
+            calidad.parquet           incidencias de validación
+            cubo.parquet              celdas del cubo del dashboard
+            opciones.parquet          resumen de las opciones de la barra lateral
+            tareas.db                 motor SQL (solo con REPORTE_BACKEND)
+
+Los procesos de la aplicación (REPORTE_FUENTE=compartido) adjuntan la versión
+vigente con np.load(mmap_mode='c'): las páginas de los arreglos las comparten
+todos los procesos del host y el DataFrame se construye como vista sobre
+ellas, incluidos los nombres de las tareas (texto de Arrow sobre el búfer
+mapeado). El cubo, las opciones y el motor SQL se leen de la versión
+publicada en lugar de recalcularse. Lo único que cada réplica decodifica son
+los diccionarios (áreas, proyectos, personas, ids) y, a partir de ellos, las
+columnas 'id', 'parent_id' y 'asignados' del DataFrame.
+
+Uso del cargador (con --historial también anexa cada versión al historial de
+instantáneas, que las réplicas solo leen):
+    python src/shared_dataset.py --data datos.json --dir /dev/shm/reporte --vigilar 2 --historial historial
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+from compact import CompactTasks, encode_texts, texts_array
+from dataset import SQL_BACKEND, Dataset
+from options_index import OptionsIndex
+from rollup import RollupCube
+from sql_backend import SqlBackend
+
+# Directorio compartido por el cargador y las réplicas de la aplicación
+SHARED_DIR = os.environ.get('REPORTE_COMPARTIDO', '/dev/shm/reporte')
+CURRENT_FILE = 'ACTUAL'
+MANIFEST_FILE = 'manifiesto.json'
+ISSUES_FILE = 'calidad.parquet'
+CUBE_FILE = 'cubo.parquet'
+OPTIONS_FILE = 'opciones.parquet'
+DATABASE_FILE = 'tareas.db'
+# Versiones que se conservan: las réplicas pueden seguir usando la anterior
+# hasta su siguiente comprobación (los mapeos abiertos siguen siendo válidos
+# aunque se borren los archivos)
+KEEP_VERSIONS = 2
+
+def decode_texts(data: np.ndarray, offsets: np.ndarray, nulls: Optional[np.ndarray] = None) -> np.ndarray:
+    """Arreglo de objetos con los textos de 'encode_texts' (None para los nulos)."""
+    return texts_array(data, offsets, nulls).to_numpy(dtype=object, na_value=None)
+
+def _save_texts(directory: str, name: str, values) -> None:
+    data, offsets, nulls = encode_texts(values)
+    np.save(os.path.join(directory, f'{name}.texto.npy'), data)
+    np.save(os.path.join(directory, f'{name}.offsets.npy'), offsets)
+    if nulls is not None:
+        np.save(os.path.join(directory, f'{name}.nulos.npy'), nulls)
+
+def _load_texts(directory: str, name: str) -> np.ndarray:
+    nulls_path = os.path.join(directory, f'{name}.nulos.npy')
+    return decode_texts(
+        np.load(os.path.join(directory, f'{name}.texto.npy'), mmap_mode='r'),
+        np.load(os.path.join(directory, f'{name}.offsets.npy'), mmap_mode='r'),
+        np.load(nulls_path) if os.path.exists(nulls_path) else None,
+    )
+
+def _is_text(values: np.ndarray) -> bool:
+    return values.dtype == object
+
+def content_digest(compact: CompactTasks) -> str:
+    """Huella del contenido de la representación compacta (arreglos y diccionarios)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for group, columns in (('arreglos', compact.arrays), ('extras', compact.extras), ('diccionarios', compact.dictionaries)):
+        for name in sorted(columns):
+            values = columns[name]
+            digest.update(f'{group}/{name}/{np.asarray(values).dtype}'.encode('utf-8'))
+            if isinstance(values, pd.Index) or _is_text(values):
+                for buffer in encode_texts(values):
+                    if buffer is not None:
+                        digest.update(buffer.tobytes())
+            else:
+                digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+def _read_table(path: str) -> pd.DataFrame:
+    """Lee una tabla publicada con las categorías como objetos, igual que en memoria."""
+    table = pd.read_parquet(path)
+    for column in table.columns:
+        if isinstance(table[column].dtype, pd.CategoricalDtype):
+            table[column] = table[column].cat.set_categories(table[column].cat.categories.astype(object))
+    return table
+
+def _read_manifest(directory: str) -> dict:
+    with open(os.path.join(directory, MANIFEST_FILE), encoding='utf-8') as f:
+        return json.load(f)
+
+def publish(dataset: Dataset, root: str = SHARED_DIR, engine: Optional[str] = SQL_BACKEND) -> str:
+    """
+    Escribe la representación compacta del Dataset, su cubo, sus opciones
+    y, con 'engine', su base de datos SQL como una versión nueva en 'root' y
+    la marca como vigente. Si el contenido es el de la versión vigente (p. ej.
+    el archivo solo cambió de fecha) no se publica nada. Devuelve el nombre
+    de la versión vigente.
+    """
+    if dataset.compact is None:
+        raise ValueError("No hay datos que publicar.")
+    compact = dataset.compact
+    digest = content_digest(compact)
+    current = current_version(root)
+    if current is not None:
+        try:
+            if _read_manifest(os.path.join(root, current)).get('huella') == digest:
+                return current
+        except OSError:
+            pass
+
+    os.makedirs(root, exist_ok=True)
+    version = f'v-{time.time_ns()}'
+    directory = os.path.join(root, version)
+    os.makedirs(directory)
+
+    manifest = {'filas': len(compact), 'huella': digest, 'arreglos': [], 'textos': [], 'diccionarios': [], 'extras': []}
+    for group, columns in (('arreglos', compact.arrays), ('extras', compact.extras)):
+        for name, values in columns.items():
+            if _is_text(values):
+                _save_texts(directory, name, values)
+                manifest['textos'].append(name)
+            else:
+                np.save(os.path.join(directory, f'{name}.npy'), np.ascontiguousarray(values))
+            manifest[group].append(name)
+    for name, index in compact.dictionaries.items():
+        _save_texts(directory, f'dic.{name}', index)
+        manifest['diccionarios'].append(name)
+    dataset.issues.to_parquet(os.path.join(directory, ISSUES_FILE), index=False)
+    dataset.cube.cells.to_parquet(os.path.join(directory, CUBE_FILE), index=False)
+    dataset.options.summary.to_parquet(os.path.join(directory, OPTIONS_FILE), index=False)
+    if engine:
+        # Las réplicas abren la base de datos publicada en modo de solo lectura
+        SqlBackend.from_dataframe(dataset.df, os.path.join(directory, DATABASE_FILE), engine).close()
+        manifest['motor'] = engine
+    with open(os.path.join(directory, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+    # El puntero a la versión vigente se reemplaza de forma atómica
+    pointer = os.path.join(root, CURRENT_FILE)
+    with open(pointer + '.tmp', 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(pointer + '.tmp', pointer)
+    _remove_old_versions(root, version)
+    return version
+
+def _remove_old_versions(root: str, current: str) -> None:
+    versions = sorted(name for name in os.listdir(root) if name.startswith('v-') and name != current)
+    for name in versions[:max(0, len(versions) - (KEEP_VERSIONS - 1))]:
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+def current_version(root: str = SHARED_DIR) -> Optional[str]:
+    """Nombre de la versión vigente, o None si aún no se publicó ninguna."""
+    try:
+        with open(os.path.join(root, CURRENT_FILE), encoding='utf-8') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+def attach(root: str = SHARED_DIR, version: Optional[str] = None, engine: Optional[str] = SQL_BACKEND) -> Dataset:
+    """
+    Adjunta una versión publicada (la vigente por defecto) y devuelve su
+    Dataset. Los arreglos tipados se mapean en memoria con copia en escritura:
+    se comparten entre procesos y una escritura accidental no afecta al resto.
+    Con 'engine', el motor SQL abre la base de datos publicada (si la hay).
+    """
+    version = version or current_version(root)
+    if version is None:
+        return Dataset(pd.DataFrame())
+    directory = os.path.join(root, version)
+    manifest = _read_manifest(directory)
+
+    def load(name: str) -> np.ndarray:
+        if name in manifest['textos']:
+            return _load_texts(directory, name)
+        # Vista ndarray simple sobre el mapeo (pandas no debe propagar np.memmap)
+        return np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='c').view(np.ndarray)
+
+    arrays: Dict[str, np.ndarray] = {name: load(name) for name in manifest['arreglos']}
+    extras: Dict[str, np.ndarray] = {name: load(name) for name in manifest['extras']}
+    dictionaries = {name: pd.Index(_load_texts(directory, f'dic.{name}'), dtype=object) for name in manifest['diccionarios']}
+    issues = pd.read_parquet(os.path.join(directory, ISSUES_FILE))
+    cube = RollupCube(_read_table(os.path.join(directory, CUBE_FILE)))
+    options = OptionsIndex.from_summary(_read_table(os.path.join(directory, OPTIONS_FILE)))
+    backend = None
+    if engine and manifest.get('motor') == engine:
+        backend = SqlBackend(os.path.join(directory, DATABASE_FILE), engine, read_only=True)
+    return Dataset.from_compact(CompactTasks(arrays, dictionaries, extras), issues, cube, options, backend)
+
+
+class SharedSource:
+    """
+    Fuente de datos para las réplicas de la aplicación: la versión es la
+    publicada en el directorio compartido y cargar es adjuntarla (sin parsear
+    ni normalizar). Se usa con el RefreshWorker como el resto de fuentes.
+    """
+    def __init__(self, root: str = SHARED_DIR):
+        self.root = root
+
+    def version(self) -> Optional[str]:
+        return current_version(self.root)
+
+    def load(self) -> Dataset:
+        return attach(self.root)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    from refresh import data_source
+    from snapshots import SnapshotStore
+
+    parser = argparse.ArgumentParser(description="Publica los datos normalizados en memoria compartida para las réplicas de la aplicación.")
+    parser.add_argument("--data", default=os.environ.get('REPORTE_DATA', 'datos.json'), help="JSON de tareas, directorio o patrón glob.")
+    parser.add_argument("--dir", default=SHARED_DIR, help="Directorio compartido (por defecto REPORTE_COMPARTIDO o /dev/shm/reporte).")
+    parser.add_argument("--vigilar", type=float, default=0, metavar="SEG",
+                        help="Comprueba la fuente cada SEG segundos y publica cada versión nueva.")
+    parser.add_argument("--historial", default=os.environ.get('REPORTE_HISTORIAL'),
+                        help="Anexa una instantánea al historial con cada versión publicada (por defecto REPORTE_HISTORIAL).")
+    args = parser.parse_args(argv)
+
+    # El cargador es el único proceso que escribe el historial; las réplicas solo lo leen
+    store = SnapshotStore(args.historial) if args.historial else None
+    source = data_source(args.data, debounce=1.0 if args.vigilar else 0.0)
+    published = None
+    while True:
+        version = source.version()
+        if version != published:
+            dataset = source.load()
+            if dataset.empty:
+                print(f"No se pudieron cargar datos de '{args.data}'.", file=sys.stderr)
+                if not args.vigilar:
+                    return 1
+            else:
+                vigente = current_version(args.dir)
+                name = publish(dataset, args.dir)
+                published = version
+                # Mismo contenido que la versión vigente (p. ej. solo cambió la fecha del archivo)
+                if name != vigente:
+                    print(f"Publicada {name}: {len(dataset.df)} tareas en {args.dir}")
+                    if store is not None:
+                        store.append(dataset.df)
+        if not args.vigilar:
+            return 0
+        time.sleep(args.vigilar)
+
+if __name__ == "__main__":
+    sys.exit(main())
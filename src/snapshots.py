@@ -0,0 +1,275 @@
+"""
+Historial de instantáneas de las tareas para el análisis de tendencias.
+
+Cada ejecución de 'append' guarda solo las tareas que cambiaron desde la
+instantánea anterior (delta), en archivos Parquet particionados por fecha:
+
+    historial/fecha=2025-03-10/delta-083000.parquet
+    historial/fecha=2025-03-17/clave-083000.parquet
+
+Periódicamente se escribe una instantánea completa ('clave'), de modo que
+una consulta por rango de fechas solo lee desde la última clave anterior al
+rango hasta el final del rango.
+
+Uso desde la línea de comandos (p. ej. después de Json/main.py):
+    python src/snapshots.py --data datos.json --historial historial
+"""
+import argparse
+import contextlib
+import glob
+import os
+import sys
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Tuple
+
+from utils import categoricals_to_object
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
+
+SNAPSHOT_DIR = os.environ.get('REPORTE_HISTORIAL', 'historial')
+# Días máximos entre instantáneas completas
+KEYFRAME_DAYS = 7
+TRACKED_COLUMNS = [
+    'nombre', 'estado', 'asignados', 'fecha_inicio', 'fecha_limite',
+    'prioridad', 'area', 'proyecto', 'parent_id', 'is_subtask'
+]
+SNAPSHOT_COLUMNS = ['snapshot', 'id', 'cambio'] + TRACKED_COLUMNS
+LAST_STATE_FILE = 'ultimo.parquet'
+LOCK_FILE = '.bloqueo'
+
+DONE_STATES = {'completado', 'aprobado'}
+PENDING_STATES = {'pendiente', 'sin estado', 'por hacer', 'to do'}
+
+def _snapshot_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Columnas seguidas de las tareas con id (una fila por id) y su huella de contenido."""
+    frame = categoricals_to_object(df[['id'] + TRACKED_COLUMNS])
+    frame = frame[frame['id'].notna()].drop_duplicates('id').reset_index(drop=True)
+    hashable = frame.assign(asignados=frame['asignados'].map(lambda a: '\x1f'.join(map(str, a)) if isinstance(a, list) else ''))
+    frame['huella'] = pd.util.hash_pandas_object(hashable, index=False).to_numpy()
+    return frame
+
+
+class SnapshotStore:
+    """Almacén de instantáneas de solo-anexado, particionado por fecha."""
+    def __init__(self, root: str = SNAPSHOT_DIR, keyframe_days: int = KEYFRAME_DAYS):
+        self.root = root
+        self.keyframe_days = keyframe_days
+
+    def partitions(self) -> List[Tuple[pd.Timestamp, str, str]]:
+        """Archivos del historial como (instante, tipo 'clave'/'delta', ruta), en orden cronológico."""
+        files = []
+        for path in glob.glob(os.path.join(self.root, 'fecha=*', '*.parquet')):
+            fecha = os.path.basename(os.path.dirname(path))[len('fecha='):]
+            tipo, _, hora = os.path.splitext(os.path.basename(path))[0].partition('-')
+            files.append((pd.Timestamp(f"{fecha} {hora[:2]}:{hora[2:4]}:{hora[4:6]}"), tipo, path))
+        return sorted(files)
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """
+        Bloqueo exclusivo del historial entre procesos: dos escritores no leen
+        el mismo 'ultimo.parquet' ni escriben el mismo delta dos veces.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, LOCK_FILE), 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def append(self, df: pd.DataFrame, taken_at: Optional[pd.Timestamp] = None) -> dict:
+        """
+        Anexa una instantánea del DataFrame normalizado. Solo se escriben las
+        tareas nuevas, modificadas o eliminadas; si nada cambió no se escribe
+        ningún archivo. Devuelve un resumen de lo escrito.
+        """
+        with self._locked():
+            return self._append(df, taken_at)
+
+    def _append(self, df: pd.DataFrame, taken_at: Optional[pd.Timestamp] = None) -> dict:
+        taken_at = pd.Timestamp(taken_at or pd.Timestamp.now()).floor('s')
+        current = _snapshot_frame(df)
+        last_path = os.path.join(self.root, LAST_STATE_FILE)
+        last = pd.read_parquet(last_path) if os.path.exists(last_path) else pd.DataFrame({'id': [], 'huella': []})
+
+        keyframes = [ts for ts, tipo, _ in self.partitions() if tipo == 'clave']
+        is_keyframe = not keyframes or taken_at - keyframes[-1] >= pd.Timedelta(days=self.keyframe_days)
+
+        previous = pd.Series(last['huella'].to_numpy(), index=last['id'].to_numpy())
+        conocidas = current['id'].isin(previous.index).to_numpy()
+        altas = ~conocidas
+        # Las huellas se comparan como uint64 (sin pasar por float con 'map')
+        cambios = np.zeros(len(current), dtype=bool)
+        cambios[conocidas] = previous.loc[current['id'][conocidas]].to_numpy() != current['huella'].to_numpy()[conocidas]
+        bajas = np.setdiff1d(previous.index.to_numpy(dtype=object), current['id'].to_numpy(dtype=object))
+
+        if is_keyframe:
+            rows = current.assign(cambio='clave')
+        else:
+            rows = current[altas | cambios].assign(cambio=np.where(altas[altas | cambios], 'alta', 'cambio'))
+            if len(bajas):
+                rows = pd.concat([rows, pd.DataFrame({'id': bajas, 'cambio': 'baja'})], ignore_index=True)
+
+        summary = {'instante': taken_at, 'clave': is_keyframe, 'altas': int(altas.sum()),
+                   'cambios': int(cambios.sum()), 'bajas': len(bajas), 'archivo': None}
+        if rows.empty:
+            return summary
+
+        rows = rows.assign(snapshot=taken_at)[SNAPSHOT_COLUMNS]
+        partition = os.path.join(self.root, f"fecha={taken_at:%Y-%m-%d}")
+        os.makedirs(partition, exist_ok=True)
+        path = os.path.join(partition, f"{'clave' if is_keyframe else 'delta'}-{taken_at:%H%M%S}.parquet")
+        rows.to_parquet(path, index=False)
+        # El estado anterior se reemplaza de forma atómica (los lectores nunca ven un archivo a medias)
+        current[['id', 'huella']].to_parquet(last_path + '.tmp', index=False)
+        os.replace(last_path + '.tmp', last_path)
+        summary['archivo'] = path
+        return summary
+
+    def files_for_range(self, start=None, end=None) -> List[str]:
+        """
+        Archivos necesarios para reconstruir el historial entre 'start' y 'end':
+        desde la última instantánea completa anterior a 'start' hasta 'end'.
+        """
+        files = self.partitions()
+        if end is not None:
+            end = pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+            files = [f for f in files if f[0] < end]
+        if start is not None:
+            start = pd.Timestamp(start)
+            keyframes = [i for i, (ts, tipo, _) in enumerate(files) if tipo == 'clave' and ts <= start]
+            files = files[keyframes[-1]:] if keyframes else files
+        return [path for _, _, path in files]
+
+    def read(self, start=None, end=None) -> pd.DataFrame:
+        """Filas del historial (instantáneas y deltas) que cubren el rango pedido."""
+        paths = self.files_for_range(start, end)
+        if not paths:
+            return pd.DataFrame(columns=SNAPSHOT_COLUMNS)
+        return pd.concat([pd.read_parquet(path) for path in paths], ignore_index=True)
+
+
+def transitions(history: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cambios de estado por tarea a partir del historial: una fila por
+    (instante, id) con el estado anterior ('desde', nulo al aparecer) y el
+    nuevo ('hacia', nulo al desaparecer). Las instantáneas completas se
+    deduplican contra el estado conocido y generan las bajas implícitas.
+    """
+    columns = ['snapshot', 'id', 'proyecto', 'desde', 'hacia']
+    if history.empty:
+        return pd.DataFrame(columns=columns)
+
+    history = history.sort_values('snapshot', kind='stable')
+    # Bajas implícitas: ids vistos antes de una instantánea completa que no aparecen en ella
+    keyframe_times = history.loc[history['cambio'] == 'clave', 'snapshot'].unique()
+    extra = []
+    for ts in keyframe_times:
+        before = history[history['snapshot'] < ts]
+        if before.empty:
+            continue
+        alive = before.drop_duplicates('id', keep='last')
+        alive = alive.loc[alive['cambio'] != 'baja', 'id']
+        gone = np.setdiff1d(alive.to_numpy(dtype=object), history.loc[history['snapshot'] == ts, 'id'].to_numpy(dtype=object))
+        if len(gone):
+            extra.append(pd.DataFrame({'snapshot': ts, 'id': gone, 'cambio': 'baja'}))
+    if extra:
+        history = pd.concat([history] + extra, ignore_index=True).sort_values('snapshot', kind='stable')
+
+    estado = history['estado'].where(history['cambio'] != 'baja')
+    proyecto = history['proyecto'].groupby(history['id']).ffill()
+    desde = estado.groupby(history['id']).shift()
+    # Primera aparición en el rango leído o estado distinto del anterior
+    first = ~history['id'].duplicated()
+    changed = first | (estado.fillna('\x00') != desde.fillna('\x00'))
+    result = pd.DataFrame({
+        'snapshot': history['snapshot'], 'id': history['id'], 'proyecto': proyecto,
+        'desde': desde.where(~first), 'hacia': estado,
+    })[changed.to_numpy()]
+    return result.reset_index(drop=True)[columns]
+
+def completed_per_week(trans: pd.DataFrame, start=None, end=None) -> pd.Series:
+    """Tareas que pasaron a un estado terminado, por semana (lunes)."""
+    done = trans[trans['hacia'].isin(DONE_STATES) & trans['desde'].notna() & ~trans['desde'].isin(DONE_STATES)]
+    done = _in_range(done, start, end)
+    if done.empty:
+        return pd.Series(dtype='int64', name='completadas')
+    counts = done.set_index('snapshot').resample('W-MON', label='left', closed='left')['id'].count()
+    return counts.rename('completadas')
+
+def wip_per_estado(trans: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """
+    Número de tareas en cada estado tras cada instantánea: +1 al entrar en un
+    estado y -1 al salir, acumulado en el tiempo.
+    """
+    if trans.empty:
+        return pd.DataFrame()
+    entradas = trans.dropna(subset=['hacia']).assign(delta=1, estado=lambda t: t['hacia'])
+    salidas = trans.dropna(subset=['desde']).assign(delta=-1, estado=lambda t: t['desde'])
+    deltas = pd.concat([entradas, salidas], ignore_index=True)
+    wip = deltas.pivot_table(index='snapshot', columns='estado', values='delta', aggfunc='sum', fill_value=0).cumsum()
+    in_range = _in_range(wip.reset_index(), start, end).set_index('snapshot')
+    if start is not None:
+        # El estado vigente al inicio del rango es el de la última instantánea anterior
+        before = wip[wip.index < pd.Timestamp(start)]
+        if not before.empty:
+            at_start = before.iloc[[-1]].set_axis([pd.Timestamp(start)])
+            in_range = pd.concat([at_start, in_range]) if not in_range.empty else at_start
+    return in_range.rename_axis('snapshot')
+
+def cycle_time_per_project(trans: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """
+    Tiempo de ciclo por proyecto: desde que la tarea se observa por primera vez
+    en un estado activo (ni pendiente ni terminado) hasta que pasa a un estado
+    terminado dentro del rango. Las tareas que ya aparecen terminadas se excluyen.
+    """
+    columns = ['Proyecto', 'Tareas', 'Ciclo medio (días)', 'Ciclo mediano (días)']
+    activos = trans[trans['hacia'].notna() & ~trans['hacia'].isin(DONE_STATES | PENDING_STATES)]
+    inicio = activos.groupby('id')['snapshot'].min()
+    done = trans[trans['hacia'].isin(DONE_STATES) & trans['desde'].notna() & ~trans['desde'].isin(DONE_STATES)]
+    fin = _in_range(done, start, end).groupby('id').agg(fin=('snapshot', 'min'), proyecto=('proyecto', 'last'))
+    ciclos = fin.join(inicio.rename('inicio'), how='inner')
+    ciclos = ciclos[ciclos['inicio'] <= ciclos['fin']]
+    if ciclos.empty:
+        return pd.DataFrame(columns=columns)
+    dias = (ciclos['fin'] - ciclos['inicio']).dt.total_seconds() / 86400
+    summary = dias.groupby(ciclos['proyecto']).agg(['count', 'mean', 'median']).reset_index()
+    summary.columns = columns
+    return summary.round(1).sort_values('Ciclo medio (días)', ascending=False, ignore_index=True)
+
+def _in_range(frame: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    mask = pd.Series(True, index=frame.index)
+    if start is not None:
+        mask &= frame['snapshot'] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= frame['snapshot'] < pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+    return frame[mask]
+
+
+def main(argv=None) -> int:
+    from federation import load_tasks
+
+    parser = argparse.ArgumentParser(description="Anexa una instantánea de las tareas al historial.")
+    parser.add_argument('--data', default='datos.json', help="Archivo JSON de tareas (o directorio/patrón glob).")
+    parser.add_argument('--historial', default=SNAPSHOT_DIR, help="Directorio del historial.")
+    args = parser.parse_args(argv)
+
+    df = load_tasks(args.data)
+    if df.empty:
+        print(f"No se pudieron cargar datos desde {args.data}.", file=sys.stderr)
+        return 1
+    summary = SnapshotStore(args.historial).append(df)
+    tipo = 'completa' if summary['clave'] else 'delta'
+    print(f"Instantánea {tipo}: {summary['altas']} altas, {summary['cambios']} cambios, {summary['bajas']} bajas.")
+    print(f"  ✅ {summary['archivo']}" if summary['archivo'] else "  Sin cambios; no se escribió ningún archivo.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+import importlib.util
+import itertools
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import List, Optional
+
+from filter_cache import FILTER_CACHE_SIZE, filter_key
+from rollup import RollupCube
+
+# Columnas de la tabla 'tareas'; 'pos' es la posición de la fila en el DataFrame del Dataset
+TASK_COLUMNS = [
+    'pos', 'id', 'nombre', 'estado', 'fecha_inicio', 'fecha_limite',
+    'prioridad', 'area', 'proyecto', 'parent_id', 'is_subtask'
+]
+SUMMARY_DIMENSIONS = ['area', 'proyecto', 'estado', 'prioridad', 'is_subtask']
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+# Archivos auxiliares que crean los motores junto a la base de datos
+DATABASE_SUFFIXES = ['', '.wal', '-journal', '-wal', '-shm']
+
+_database_counter = itertools.count(1)
+
+def available_engines() -> List[str]:
+    # DuckDB es opcional (sin él se usa SQLite); solo se comprueba si está
+    # instalado, sin importarlo hasta que se crea un motor que lo use
+    return ['duckdb', 'sqlite'] if importlib.util.find_spec('duckdb') is not None else ['sqlite']
+
+def _sql_date(value) -> Optional[str]:
+    return pd.Timestamp(value).strftime(DATE_FORMAT) if pd.notna(value) else None
+
+def _regexp_i(pattern: str, value: Optional[str]) -> bool:
+    """
+    Equivalente de 'str.contains(pattern, case=False, na=False)' con el módulo
+    re de Python ('utils.name_contains'), registrado en SQLite y en DuckDB: el
+    regexp_matches de DuckDB usa RE2, cuya sintaxis y resultados no coinciden
+    siempre con los de re.
+    """
+    return isinstance(value, str) and re.search(pattern, value, flags=re.IGNORECASE) is not None
+
+def dataset_database(database: str) -> str:
+    """
+    Base de datos propia para el motor de un Dataset. Cada versión de los datos
+    (y cada proceso) usa su propio archivo derivado de 'database', de modo que
+    cargar una versión nueva no reemplaza la tabla que aún consultan las
+    sesiones con la anterior. ':memory:' ya es privada de cada conexión.
+    """
+    if database == ':memory:':
+        return database
+    base, ext = os.path.splitext(database)
+    return f"{base}-{os.getpid()}-{next(_database_counter)}{ext or '.db'}"
+
+def _close_database(conn, path: Optional[str]):
+    conn.close()
+    if path is not None:
+        for suffix in DATABASE_SUFFIXES:
+            try:
+                os.remove(path + suffix)
+            except OSError:
+                pass
+
+
+class SqlBackend:
+    """
+    Motor de consultas embebido (DuckDB si está instalado, si no SQLite) con
+    las tareas normalizadas. Traduce los filtros de la barra lateral y las
+    agregaciones del dashboard a SQL: los filtros se aplican en el motor y la
+    expansión jerárquica (tarea principal + subtareas) se resuelve con CTEs.
+    Devuelve posiciones de fila del DataFrame del Dataset, de modo que el
+    resultado es idéntico al de 'filter_data_hierarchically'. Con
+    'temporary' el archivo de la base de datos se borra al liberar el motor.
+
+    El motor solo traslada el filtrado y los conteos a SQL; no reduce la
+    memoria: la tabla es una segunda copia de las tareas del Dataset (en RAM
+    con ':memory:') y las vistas siguen recibiendo las filas filtradas del
+    DataFrame en memoria. Los historiales mayores que la RAM quedan fuera de
+    su alcance.
+    """
+    def __init__(self, database: str = ':memory:', engine: Optional[str] = None, temporary: bool = False,
+                 read_only: bool = False):
+        self.engine = engine or available_engines()[0]
+        if self.engine == 'duckdb':
+            try:
+                import duckdb
+            except ImportError:
+                raise ImportError("El motor 'duckdb' requiere el paquete duckdb.") from None
+            self.conn = duckdb.connect(database, read_only=read_only)
+            self.conn.create_function('regexp_i', _regexp_i, ['VARCHAR', 'VARCHAR'], 'BOOLEAN', side_effects=False)
+        elif self.engine == 'sqlite':
+            # La conexión se comparte entre los hilos de las sesiones (protegida con un lock)
+            if read_only:
+                self.conn = sqlite3.connect(f'file:{database}?mode=ro', uri=True, check_same_thread=False)
+            else:
+                self.conn = sqlite3.connect(database, check_same_thread=False)
+            self.conn.create_function('regexp_i', 2, _regexp_i, deterministic=True)
+        else:
+            raise ValueError(f"Motor SQL desconocido: {self.engine}")
+        self._lock = threading.Lock()
+        # Conteos del dashboard ya calculados, por clave canónica de los filtros
+        self._cubes = OrderedDict()
+        temporary_path = database if temporary and database != ':memory:' else None
+        self._finalizer = weakref.finalize(self, _close_database, self.conn, temporary_path)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, database: str = ':memory:', engine: Optional[str] = None,
+                       temporary: bool = False) -> 'SqlBackend':
+        backend = cls(database, engine, temporary)
+        backend.load(df)
+        return backend
+
+    def close(self):
+        """Cierra la conexión (y borra el archivo si es temporal)."""
+        self._finalizer()
+
+    def _query(self, sql: str, params: list = ()) -> list:
+        with self._lock:
+            return self.conn.execute(sql, list(params)).fetchall()
+
+    def load(self, df: pd.DataFrame):
+        """(Re)crea la tabla 'tareas' con las filas del DataFrame normalizado."""
+        frame = pd.DataFrame({
+            'pos': np.arange(len(df), dtype=np.int64),
+            'id': df['id'].astype(object),
+            'nombre': df['nombre'].astype(object),
+            'estado': df['estado'].astype(object),
+            'fecha_inicio': df['fecha_inicio'].dt.strftime(DATE_FORMAT).astype(object),
+            'fecha_limite': df['fecha_limite'].dt.strftime(DATE_FORMAT).astype(object),
+            'prioridad': df['prioridad'].astype(object),
+            'area': df['area'].astype(object),
+            'proyecto': df['proyecto'].astype(object),
+            'parent_id': df['parent_id'].astype(object),
+            'is_subtask': df['is_subtask'].astype(np.int64),
+        })
+        frame = frame.where(frame.notna(), None)
+
+        with self._lock:
+            self.conn.execute("DROP TABLE IF EXISTS tareas")
+            if self.engine == 'duckdb':
+                # DuckDB lee la tabla de un Parquet temporal en lugar de
+                # registrar el DataFrame (sin tipos de objeto de Python)
+                with tempfile.TemporaryDirectory() as tmp:
+                    path = os.path.join(tmp, 'tareas.parquet')
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+                    # Esquema explícito: una columna sin valores no debe quedar sin tipo
+                    schema = pa.schema([
+                        (column, pa.int64() if column in ('pos', 'is_subtask') else pa.string())
+                        for column in TASK_COLUMNS
+                    ])
+                    pq.write_table(pa.Table.from_pandas(frame[TASK_COLUMNS], schema=schema, preserve_index=False), path)
+                    escaped = path.replace("'", "''")
+                    self.conn.execute(f"CREATE TABLE tareas AS SELECT * FROM read_parquet('{escaped}')")
+            else:
+                self.conn.execute(
+                    "CREATE TABLE tareas (pos INTEGER PRIMARY KEY, id TEXT, nombre TEXT, estado TEXT, "
+                    "fecha_inicio TEXT, fecha_limite TEXT, prioridad TEXT, area TEXT, proyecto TEXT, "
+                    "parent_id TEXT, is_subtask INTEGER)"
+                )
+                self.conn.executemany(
+                    f"INSERT INTO tareas VALUES ({', '.join('?' * len(TASK_COLUMNS))})",
+                    frame[TASK_COLUMNS].itertuples(index=False, name=None)
+                )
+            self.conn.execute("CREATE INDEX idx_tareas_filtros ON tareas (area, proyecto, estado)")
+            self.conn.execute("CREATE INDEX idx_tareas_id ON tareas (id)")
+            self.conn.execute("CREATE INDEX idx_tareas_parent ON tareas (parent_id)")
+            self.conn.commit()
+
+    def _where(self, areas, proyectos, estados, fecha_inicio, fecha_fin, search_term):
+        """Condiciones y parámetros de los filtros estándar (paso 1 de la lógica jerárquica)."""
+        conditions, params = [], []
+        for column, values in (('area', areas), ('proyecto', proyectos), ('estado', estados)):
+            if values:
+                conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if pd.notna(fecha_inicio) and pd.notna(fecha_fin):
+            conditions.append("fecha_inicio IS NOT NULL AND fecha_inicio >= ? AND fecha_inicio <= ?")
+            params.extend([_sql_date(fecha_inicio), _sql_date(fecha_fin)])
+        if search_term:
+            # La misma búsqueda (re de Python) en los dos motores y en pandas
+            conditions.append("regexp_i(?, nombre)")
+            params.append(search_term)
+        return ' AND '.join(conditions) or '1 = 1', params
+
+    def _hierarchical_sql(self, areas, proyectos, estados, fecha_inicio, fecha_fin, search_term, task_type_filter):
+        """
+        Consulta con las filas del resultado jerárquico: las familias (id de la
+        tarea principal) de las filas que cumplen los filtros se expanden a la
+        tarea principal y todas sus subtareas.
+        """
+        where, params = self._where(areas, proyectos, estados, fecha_inicio, fecha_fin, search_term)
+        type_condition = {'Solo Tareas': 'AND t.is_subtask = 0', 'Solo Subtareas': 'AND t.is_subtask = 1'}.get(task_type_filter, '')
+        sql = f"""
+            WITH filtradas AS (
+                SELECT id, parent_id, is_subtask FROM tareas WHERE {where}
+            ),
+            familias AS (
+                SELECT id AS familia FROM filtradas WHERE is_subtask = 0 AND id IS NOT NULL
+                UNION
+                SELECT parent_id FROM filtradas WHERE is_subtask = 1 AND parent_id IS NOT NULL
+            ),
+            -- En pandas, una tarea principal sin id incluida en el filtro hace que
+            -- 'isin' coincida con todas las filas cuyo id o parent_id es nulo.
+            sin_id AS (
+                SELECT COUNT(*) > 0 AS presente FROM filtradas WHERE is_subtask = 0 AND id IS NULL
+            )
+            SELECT t.* FROM tareas t, sin_id
+            WHERE (
+                t.id IN (SELECT familia FROM familias)
+                OR t.parent_id IN (SELECT familia FROM familias)
+                OR (sin_id.presente AND (t.id IS NULL OR t.parent_id IS NULL))
+            ) {type_condition}
+        """
+        return sql, params
+
+    def filter_positions(self, areas, proyectos, estados, fecha_inicio, fecha_fin, search_term, task_type_filter) -> np.ndarray:
+        """Posiciones (ordenadas) de las filas que devuelve 'filter_data_hierarchically'."""
+        sql, params = self._hierarchical_sql(areas, proyectos, estados, fecha_inicio, fecha_fin, search_term, task_type_filter)
+        rows = self._query(f"SELECT pos FROM ({sql}) ORDER BY pos", params)
+        return np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+
+    def summary_cube(self, areas, proyectos, estados, fecha_inicio, fecha_fin, search_term, task_type_filter) -> RollupCube:
+        """
+        Conteos del resultado filtrado agrupados en el motor por área,
+        proyecto, estado, prioridad y tipo, como un RollupCube para el dashboard.
+        Se memorizan por clave canónica de los filtros (el motor es de una sola
+        versión de los datos), como las posiciones en FilterResultCache.
+        """
+        key = filter_key((areas, proyectos, estados, fecha_inicio, fecha_fin, search_term, task_type_filter))
+        with self._lock:
+            cube = self._cubes.get(key)
+            if cube is not None:
+                self._cubes.move_to_end(key)
+                return cube
+
+        sql, params = self._hierarchical_sql(areas, proyectos, estados, fecha_inicio, fecha_fin, search_term, task_type_filter)
+        dims = ', '.join(SUMMARY_DIMENSIONS)
+        rows = self._query(f"SELECT {dims}, COUNT(*) AS tareas FROM ({sql}) GROUP BY {dims}", params)
+        cells = pd.DataFrame(rows, columns=SUMMARY_DIMENSIONS + ['tareas'])
+        cells['is_subtask'] = cells['is_subtask'].astype(bool)
+        cube = RollupCube(cells)
+        with self._lock:
+            self._cubes[key] = cube
+            while len(self._cubes) > FILTER_CACHE_SIZE:
+                self._cubes.popitem(last=False)
+        return cube
+
+    def unique_values(self, column: str, areas: Optional[List[str]] = None) -> List[str]:
+        """Valores distintos no nulos de una columna (opcionalmente dentro de unas áreas), ordenados."""
+        if column not in TASK_COLUMNS:
+            raise ValueError(f"Columna desconocida: {column}")
+        sql = f"SELECT DISTINCT {column} FROM tareas WHERE {column} IS NOT NULL"
+        params = []
+        if areas:
+            sql += f" AND area IN ({', '.join('?' * len(areas))})"
+            params.extend(areas)
+        return sorted(row[0] for row in self._query(sql, params))
@@ -0,0 +1,85 @@
+import os
+import re
+import sys
+import importlib
+import subprocess
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
+
+# Rutas comunes del navegador que usa Kaleido; la primera que exista se usa
+BROWSER_CANDIDATES = (
+    "/usr/bin/chromium",
+    "/usr/bin/chromium-browser",
+    "/usr/bin/google-chrome-stable",
+)
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+@lru_cache(maxsize=None)
+def configure_kaleido() -> Optional[str]:
+    """
+    Busca el binario de Chrome/Chromium y lo deja en BROWSER_PATH para Kaleido.
+    Se llama al crear el grupo de renderizadores de imágenes (no al arrancar
+    la aplicación) y la búsqueda se hace una vez por proceso.
+    """
+    for candidate in BROWSER_CANDIDATES:
+        if os.path.exists(candidate):
+            os.environ["BROWSER_PATH"] = candidate
+            return candidate
+    # Si no se encuentra ningún binario, emitimos un warning
+    print("⚠️ WARNING: No se detectó Chrome/Chromium. Verifica packages.txt")
+    return None
+
+def load_view(module: str, function: str) -> Callable:
+    """
+    Importa el módulo de una vista la primera vez que se muestra y devuelve
+    su función de renderizado. Las siguientes llamadas usan sys.modules.
+    """
+    return getattr(importlib.import_module(module), function)
+
+def import_times(module: str = 'app') -> List[Tuple[str, int, int]]:
+    """
+    Importa 'module' en un intérprete nuevo con '-X importtime' y devuelve
+    (módulo, microsegundos propios, microsegundos acumulados) de los módulos
+    importados directamente por él.
+    """
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=src_dir, capture_output=True, text=True
+    )
+    children = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        name, level = match.group(4), len(match.group(3)) // 2
+        entry = (name, int(match.group(1)), int(match.group(2)))
+        # Las importaciones directas (nivel 1) se listan antes que su módulo (nivel 0)
+        if level == 0:
+            if name == module:
+                return [entry] + children
+            children = []
+        elif level == 1:
+            children.append(entry)
+    return []
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Informe del tiempo de importación de la aplicación.")
+    parser.add_argument("modulo", nargs="?", default="app", help="Módulo a importar (por defecto 'app').")
+    parser.add_argument("--top", type=int, default=15, help="Número de importaciones a mostrar.")
+    args = parser.parse_args(argv)
+
+    times = import_times(args.modulo)
+    if not times:
+        print(f"No se pudo importar '{args.modulo}'.")
+        return 1
+    total = times[0][2]
+    print(f"Importar '{args.modulo}': {total / 1000:.0f} ms")
+    for name, _, cumulative in sorted(times[1:], key=lambda t: t[2], reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
+import re
+import numpy as np
 import pandas as pd
-from typing import Any
+from typing import Any, Hashable, Tuple
 
 def safe_date_for_excel(date_value: Any) -> Any:
     """
@@ -21,4 +23,35 @@ def format_date_for_display(date_value: Any) -> str:
     try:
         return date_value.strftime('%d/%m/%Y')
     except (AttributeError, ValueError):
-        return ""
\ No newline at end of file
+        return ""
+
+def categoricals_to_object(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convierte las columnas de tipo 'category' a texto (object). Se usa antes de
+    operaciones que introducen valores fuera de las categorías, como fillna('').
+    """
+    category_columns = df.select_dtypes('category').columns
+    if len(category_columns) == 0:
+        return df
+    return df.astype({col: object for col in category_columns})
+
+def frame_signature(df: pd.DataFrame, version: Hashable = None) -> Tuple:
+    """
+    Firma de un DataFrame filtrado para las exportaciones guardadas en la
+    sesión: versión de los datos, número de filas y huella del índice. Cada
+    versión publicada es inmutable, así que dentro de ella el índice basta
+    para identificar el contenido; al cambiar la versión cambia la firma.
+    """
+    return (version, len(df), int(pd.util.hash_pandas_object(df.index).sum()))
+
+def name_contains(values: pd.Series, pattern: str) -> pd.Series:
+    """
+    Equivalente de 'str.contains(pattern, case=False, na=False)' con el módulo
+    re de Python sea cual sea el tipo de la columna: con texto de Arrow pandas
+    usaría RE2, que no admite, por ejemplo, lookbehind ni referencias. Los
+    motores SQL usan la misma búsqueda, de modo que los resultados coinciden.
+    """
+    regex = re.compile(pattern, flags=re.IGNORECASE)
+    matches = np.fromiter((isinstance(value, str) and regex.search(value) is not None for value in values),
+                          dtype=bool, count=len(values))
+    return pd.Series(matches, index=values.index)
@@ -1,126 +1,273 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-import io
-
-def charts_to_excel(figs: dict) -> bytes:
-    """
-    Convierte un diccionario de figuras de Plotly en un archivo Excel,
-    insertando cada gráfico como una imagen.
-    """
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        workbook = writer.book
-        worksheet = workbook.add_worksheet('Gráficos del Dashboard')
-        
-        # Formato para los títulos
-        header_format = workbook.add_format({
-            'bold': True,
-            'bg_color': '#DDEBF7',
-            'font_color': 'black',
-            'border': 1
-        })
-        
-        row_offset = 1
-        for title, fig in figs.items():
-            # Usar un tema claro para la exportación para evitar fondos negros
-            fig.layout.template = "plotly_white"
-
-            # Cambiar colores para la exportación
-            if title == "Tareas por Prioridad":
-                new_colors = px.colors.qualitative.Pastel
-                for i, trace in enumerate(fig.data):
-                    if hasattr(trace, 'marker'):
-                        trace.marker.color = new_colors[i % len(new_colors)]
-
-            image_data = io.BytesIO(fig.to_image(format="png", scale=2))
-            worksheet.write(f'A{row_offset}', title, header_format)
-            worksheet.insert_image(f'A{row_offset + 1}', title, {'image_data': image_data})
-            row_offset += 30
-
-    output.seek(0)
-    return output.getvalue()
-
-def render_dashboard(df: pd.DataFrame):
-    """
-    Renderiza la vista del dashboard ejecutivo con KPIs y gráficos.
-    """
-    st.header("📊 Dashboard Ejecutivo")
-
-    if df.empty:
-        st.warning("No hay datos disponibles para los filtros seleccionados.")
-        return
-
-    # --- KPIs ---
-    total_tareas = len(df)
-    tareas_pendientes = len(df[df['estado'] == 'pendiente'])
-    tareas_en_progreso = len(df[df['estado'] == 'en progreso'])
-    tareas_completadas = len(df[df['estado'] == 'completado'])
-    tareas_aprobadas = len(df[df['estado'] == 'aprobado'])
-
-    col1, col2, col3, col4, col5 = st.columns(5)
-    col1.metric("Total Tareas", total_tareas)
-    col2.metric("Pendientes", tareas_pendientes)
-    col3.metric("En Progreso", tareas_en_progreso)
-    col4.metric("Completadas", tareas_completadas)
-    col5.metric("Aprobados", tareas_aprobadas)
-    
-
-    st.markdown("---")
-
-    # --- Gráficos ---
-    figs_to_export = {}
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.subheader("Distribución por Estado")
-        estado_counts = df['estado'].value_counts()
-        fig_pie = px.pie(
-            values=estado_counts.values, 
-            names=estado_counts.index, 
-            title="Tareas por Estado"
-        )
-        st.plotly_chart(fig_pie, use_container_width=True)
-        figs_to_export["Tareas por Estado"] = fig_pie
-
-    with col2:
-        st.subheader("Distribución de Tareas por Prioridad")
-        
-        # Traducción de los valores de prioridad
-        priority_translation = {
-            'normal': 'Normal',
-            'high': 'Alta',
-            'low': 'Baja',
-            'urgent': 'Urgente'
-        }
-        
-        # Copia para evitar SettingWithCopyWarning
-        df_copy = df.copy()
-        df_copy['prioridad_traducida'] = df_copy['prioridad'].map(priority_translation)
-        
-        prioridad_counts = df_copy['prioridad_traducida'].value_counts().reset_index()
-        prioridad_counts.columns = ['Prioridad', 'Número de Tareas']
-        
-        fig_bar = px.bar(
-            prioridad_counts,
-            x='Prioridad', 
-            y='Número de Tareas',
-            title="Tareas por Prioridad",
-            labels={'x': 'Prioridad', 'y': 'Número de Tareas'},
-            color='Prioridad',
-            color_discrete_sequence=px.colors.qualitative.Vivid
-        )
-        st.plotly_chart(fig_bar, use_container_width=True)
-        figs_to_export["Tareas por Prioridad"] = fig_bar
-
-    # --- Botón de Descarga ---
-    st.markdown("---")
-    
-    excel_data = charts_to_excel(figs_to_export)
-    
-    st.download_button(
-        label="📥 Descargar Gráficos en Excel",
-        data=excel_data,
-        file_name="dashboard_graficos.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from typing import Optional, Tuple
+from rollup import RollupCube
+from export_engine import Chart, Image, SheetSpec, TablePlacement, build_workbook, frame_columns
+from burndown import compute_burndown, total_burndown, velocity
+from image_export import get_image_pool
+from utils import frame_signature
+
+# Máximo de proyectos (por alcance) con serie propia en el gráfico de Excel
+BURNDOWN_MAX_SERIES = 50
+
+# Formato de los títulos de los gráficos exportados como imagen
+CHART_TITLE_FORMAT = {'bold': True, 'bg_color': '#DDEBF7', 'font_color': 'black', 'border': 1}
+
+# Traducción de los valores de prioridad
+PRIORITY_TRANSLATION = {
+    'normal': 'Normal',
+    'high': 'Alta',
+    'low': 'Baja',
+    'urgent': 'Urgente'
+}
+
+def charts_to_excel(figs: dict) -> bytes:
+    """
+    Convierte un diccionario de figuras de Plotly en un archivo Excel,
+    insertando cada gráfico como una imagen. Las imágenes se generan en
+    lote con el grupo de renderizadores Kaleido (en paralelo y memorizadas).
+    """
+    for title, fig in figs.items():
+        # Usar un tema claro para la exportación para evitar fondos negros
+        fig.layout.template = "plotly_white"
+
+        # Cambiar colores para la exportación
+        if title == "Tareas por Prioridad":
+            new_colors = px.colors.qualitative.Pastel
+            for i, trace in enumerate(fig.data):
+                if hasattr(trace, 'marker'):
+                    trace.marker.color = new_colors[i % len(new_colors)]
+
+    images = get_image_pool().render_many(list(figs.values()), format="png", scale=2)
+    # Cada gráfico ocupa 30 filas: el título y la imagen debajo
+    spec = SheetSpec('Gráficos del Dashboard', [], images=[
+        Image(image, (offset * 30, 0), title, CHART_TITLE_FORMAT) for offset, (title, image) in enumerate(zip(figs, images))
+    ])
+    return build_workbook([(spec, pd.DataFrame())])
+
+def _burndown_chart(title: str, columns: list, anchor, height: int, colors: Optional[list] = None):
+    """Gráfico de líneas nativo de Excel con una serie por columna, sobre el eje de fechas."""
+    def chart(placement: TablePlacement) -> Chart:
+        series = []
+        for i, column in enumerate(columns):
+            options = {'name': {'header': column}, 'categories': 'Fecha', 'values': column}
+            if colors:
+                options['line'] = {'color': colors[i], 'width': 2}
+            series.append(options)
+        return Chart(
+            {'type': 'line'}, series, anchor,
+            title={'name': title},
+            x_axis={'date_axis': True, 'num_format': 'dd/mm/yy'},
+            y_axis={'name': 'Tareas'},
+            size={'width': 900, 'height': height},
+        )
+    return chart
+
+def burndown_to_excel(burndown: pd.DataFrame) -> bytes:
+    """
+    Genera un Excel con el burndown total y por proyecto, cada uno con un
+    gráfico de líneas nativo de Excel (no imágenes) sobre los datos de la hoja.
+    """
+    total = total_burndown(burndown).reset_index()
+    total.columns = ['Fecha', 'Alcance', 'Completadas', 'Pendientes']
+    total_columns = frame_columns(total, width=14, date_width=12)
+
+    # Tareas pendientes por proyecto (una columna y una serie por proyecto)
+    pendientes = burndown.pivot(index='fecha', columns='proyecto', values='pendientes')
+    alcance_final = burndown.groupby('proyecto')['alcance'].max().sort_values(ascending=False)
+    pendientes = pendientes[alcance_final.index[:BURNDOWN_MAX_SERIES]].rename_axis('Fecha').reset_index()
+    pendientes.columns = [str(c) for c in pendientes.columns]
+    proyectos = list(pendientes.columns[1:])
+    pendientes_columns = frame_columns(pendientes, width=16, date_width=12)
+
+    return build_workbook([
+        (SheetSpec('Burndown', total_columns, charts=[_burndown_chart(
+            'Alcance vs. completadas (todos los proyectos)', ['Alcance', 'Completadas', 'Pendientes'],
+            'F2', 420, ['#4472C4', '#70AD47', '#ED7D31'])]), total),
+        (SheetSpec('Pendientes por Proyecto', pendientes_columns, charts=[_burndown_chart(
+            'Tareas pendientes por proyecto', proyectos,
+            (1, len(proyectos) + 2), 480)]), pendientes),
+    ])
+
+def cached_burndown(store: dict, df: pd.DataFrame) -> Tuple[Tuple, pd.DataFrame]:
+    """
+    Devuelve (firma, burndown) de las filas filtradas, recalculando la serie
+    solo cuando cambia la firma (versión de los datos, índice y rango de
+    fechas) y no en cada ejecución del dashboard. El eje de días es el rango
+    del filtro de fechas ('date_range'), si lo hay. 'store' es un diccionario
+    persistente (p. ej. la sesión de Streamlit).
+    """
+    desde, hasta = store.get('date_range') or (None, None)
+    signature = (frame_signature(df, store.get('dataset_version')), desde, hasta)
+    cached = store.get('burndown_serie')
+    if cached is None or cached[0] != signature:
+        cached = store['burndown_serie'] = (signature, compute_burndown(df, desde, hasta))
+    return cached
+
+def _render_burndown(df: pd.DataFrame):
+    """Gráfico de burndown (alcance, completadas, pendientes) y velocidad semanal por proyecto."""
+    st.subheader("Burndown y Velocidad por Proyecto")
+    signature, burndown = cached_burndown(st.session_state, df)
+    if burndown.empty:
+        st.write("No hay tareas con fechas para calcular el burndown.")
+        return
+
+    proyectos = ['Todos los proyectos'] + sorted(burndown['proyecto'].unique())
+    proyecto = st.selectbox("Proyecto", proyectos, key='burndown_proyecto')
+    if proyecto == 'Todos los proyectos':
+        serie = total_burndown(burndown)
+        semanal = velocity(burndown).sum(axis=1)
+    else:
+        serie = burndown[burndown['proyecto'] == proyecto].set_index('fecha')[['alcance', 'completadas', 'pendientes']]
+        semanal = velocity(burndown)[proyecto]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        fig_line = px.line(
+            serie.rename(columns={'alcance': 'Alcance', 'completadas': 'Completadas', 'pendientes': 'Pendientes'}),
+            labels={'fecha': 'Fecha', 'value': 'Tareas', 'variable': ''},
+            title="Alcance acumulado vs. completadas"
+        )
+        st.plotly_chart(fig_line, use_container_width=True)
+    with col2:
+        fig_vel = px.bar(x=semanal.index, y=semanal.values, labels={'x': 'Semana', 'y': 'Tareas completadas'}, title="Velocidad semanal")
+        st.plotly_chart(fig_vel, use_container_width=True)
+    st.caption(
+        "Una tarea entra en el alcance en su fecha de inicio y, si está completada o aprobada, "
+        "se cuenta como cerrada en su fecha límite. Se muestran los días del filtro de fechas."
+    )
+
+    # El Excel (con gráficos nativos) se genera solo al pulsar el botón y se
+    # guarda en la sesión mientras no cambie la firma de las filas filtradas
+    if st.button("📊 Preparar Burndown en Excel", key='burndown_excel_button'):
+        with st.spinner("Generando Excel de burndown..."):
+            st.session_state.burndown_excel = (signature, burndown_to_excel(burndown))
+
+    cached = st.session_state.get('burndown_excel')
+    if cached is not None and cached[0] == signature:
+        st.download_button(
+            label="📥 Descargar Burndown en Excel",
+            data=cached[1],
+            file_name="burndown_por_proyecto.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            key='burndown_download'
+        )
+
+def _observed_counts(counts: pd.Series) -> pd.Series:
+    """
+    Deja solo los valores presentes (las columnas categóricas cuentan también
+    las categorías sin filas) y usa etiquetas de texto simples para los gráficos.
+    """
+    counts = counts[counts > 0]
+    counts.index = counts.index.astype(object)
+    return counts
+
+def render_dashboard(df: pd.DataFrame, cube: Optional[RollupCube] = None):
+    """
+    Renderiza la vista del dashboard ejecutivo con KPIs y gráficos.
+    Si se recibe un sub-cubo de conteos, los KPIs y gráficos se calculan
+    sumando sus celdas en lugar de recorrer las filas del DataFrame.
+    """
+    st.header("📊 Dashboard Ejecutivo")
+
+    if df.empty:
+        st.warning("No hay datos disponibles para los filtros seleccionados.")
+        return
+
+    # --- Conteos (desde el cubo o con una sola pasada sobre las filas) ---
+    if cube is not None:
+        total_tareas = cube.total()
+        estado_counts = _observed_counts(cube.counts_by('estado'))
+        prioridad_counts = _observed_counts(cube.counts_by('prioridad'))
+    else:
+        total_tareas = len(df)
+        estado_counts = _observed_counts(df['estado'].value_counts())
+        prioridad_counts = _observed_counts(df['prioridad'].value_counts())
+
+    # --- KPIs ---
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Total Tareas", total_tareas)
+    col2.metric("Pendientes", int(estado_counts.get('pendiente', 0)))
+    col3.metric("En Progreso", int(estado_counts.get('en progreso', 0)))
+    col4.metric("Completadas", int(estado_counts.get('completado', 0)))
+    col5.metric("Aprobados", int(estado_counts.get('aprobado', 0)))
+    
+
+    st.markdown("---")
+
+    # --- Gráficos ---
+    figs_to_export = {}
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("Distribución por Estado")
+        fig_pie = px.pie(
+            values=estado_counts.values, 
+            names=estado_counts.index, 
+            title="Tareas por Estado"
+        )
+        st.plotly_chart(fig_pie, use_container_width=True)
+        figs_to_export["Tareas por Estado"] = fig_pie
+
+    with col2:
+        st.subheader("Distribución de Tareas por Prioridad")
+        
+        # Traducción de los valores de prioridad sobre los conteos (sin copiar el DataFrame)
+        prioridad_counts = prioridad_counts[prioridad_counts.index.isin(PRIORITY_TRANSLATION.keys())]
+        prioridad_counts = prioridad_counts.rename(index=PRIORITY_TRANSLATION).reset_index()
+        prioridad_counts.columns = ['Prioridad', 'Número de Tareas']
+        
+        fig_bar = px.bar(
+            prioridad_counts,
+            x='Prioridad', 
+            y='Número de Tareas',
+            title="Tareas por Prioridad",
+            labels={'x': 'Prioridad', 'y': 'Número de Tareas'},
+            color='Prioridad',
+            color_discrete_sequence=px.colors.qualitative.Vivid
+        )
+        st.plotly_chart(fig_bar, use_container_width=True)
+        figs_to_export["Tareas por Prioridad"] = fig_bar
+
+    st.markdown("---")
+    _render_burndown(df)
+
+    # --- Botón de Descarga ---
+    st.markdown("---")
+    # Crea (una vez por proceso) el grupo de Kaleido, que se calienta en segundo plano
+    get_image_pool()
+
+    # Las imágenes se generan con Kaleido solo al pulsar el botón; se guardan
+    # en la sesión mientras los conteos de los gráficos no cambien
+    signature = (tuple(estado_counts.items()), tuple(prioridad_counts.itertuples(index=False)))
+    if st.button("🖼️ Preparar Gráficos en Excel", key='dashboard_images_button'):
+        with st.spinner("Generando imágenes de los gráficos..."):
+            st.session_state.dashboard_images = (signature, charts_to_excel(figs_to_export))
+
+    cached = st.session_state.get('dashboard_images')
+    if cached is not None and cached[0] == signature:
+        st.download_button(
+            label="📥 Descargar Gráficos en Excel",
+            data=cached[1],
+            file_name="dashboard_graficos.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+
+    # --- Reporte PDF (dashboard, Gantt y reporte general) ---
+    # Se dibuja con formas vectoriales a partir del mismo DataFrame filtrado
+    # que reciben los exportadores de Excel; se genera solo al pulsar el botón
+    pdf_signature = frame_signature(df, st.session_state.get('dataset_version'))
+    if st.button("📄 Preparar Reporte PDF", key='dashboard_pdf_button'):
+        from pdf_report import build_pdf_report
+        with st.spinner("Generando reporte PDF..."):
+            st.session_state.dashboard_pdf = (pdf_signature, build_pdf_report(df))
+
+    cached = st.session_state.get('dashboard_pdf')
+    if cached is not None and cached[0] == pdf_signature:
+        st.download_button(
+            label="📥 Descargar Reporte PDF",
+            data=cached[1],
+            file_name="reporte_actividades.pdf",
+            mime="application/pdf"
+        )
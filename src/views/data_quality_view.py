@@ -0,0 +1,57 @@
+import streamlit as st
+import pandas as pd
+from export_engine import LIGHT_HEADER_FORMAT, SheetSpec, build_workbook, frame_columns
+from utils import frame_signature
+
+def issues_to_excel(issues: pd.DataFrame) -> bytes:
+    """
+    Genera un Excel con el resumen de incidencias por regla y la tabla
+    completa de incidencias detectadas en la carga.
+    """
+    summary = issues.groupby(['regla', 'descripcion']).size().rename('incidencias').reset_index()
+    return build_workbook([
+        (SheetSpec('Resumen', frame_columns(summary, widths={'descripcion': 50}),
+                   header_format=LIGHT_HEADER_FORMAT, autofilter=True), summary),
+        (SheetSpec('Incidencias', frame_columns(issues, widths={'descripcion': 50, 'valor': 50}),
+                   header_format=LIGHT_HEADER_FORMAT, autofilter=True), issues),
+    ])
+
+def render_data_quality_view(issues: pd.DataFrame, df: pd.DataFrame):
+    """
+    Renderiza el reporte de calidad de datos generado durante la carga:
+    fechas inválidas, asignados mal formados, ids duplicados o faltantes,
+    subtareas huérfanas y fechas límite anteriores al inicio.
+    """
+    st.header("🧪 Calidad de Datos")
+    st.write("Incidencias detectadas al cargar el archivo de datos. Las filas se refieren a la posición de la tarea en el conjunto cargado.")
+
+    if issues.empty:
+        st.success(f"No se detectaron incidencias en las {len(df)} tareas cargadas.")
+        return
+
+    col1, col2 = st.columns(2)
+    col1.metric("Incidencias", len(issues))
+    col2.metric("Tareas afectadas", issues['fila'].nunique())
+
+    summary = issues.groupby('descripcion').size().sort_values(ascending=False).rename('Incidencias')
+    st.dataframe(summary)
+
+    reglas = st.multiselect("Filtrar por regla", sorted(issues['regla'].unique()), key='calidad_reglas')
+    tabla = issues[issues['regla'].isin(reglas)] if reglas else issues
+    st.dataframe(tabla, hide_index=True)
+
+    # El Excel se genera solo al pulsar el botón y se guarda en la sesión
+    # mientras no cambie la versión de los datos cargados
+    signature = frame_signature(issues, st.session_state.get('dataset_version'))
+    if st.button("📊 Preparar Incidencias en Excel", key='calidad_excel_button'):
+        with st.spinner("Generando Excel de incidencias..."):
+            st.session_state.calidad_excel = (signature, issues_to_excel(issues))
+
+    cached = st.session_state.get('calidad_excel')
+    if cached is not None and cached[0] == signature:
+        st.download_button(
+            label="📥 Descargar Incidencias en Excel",
+            data=cached[1],
+            file_name='calidad_de_datos.xlsx',
+            mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
@@ -1,124 +1,209 @@
-import streamlit as st
-import pandas as pd
-import io
-import xlsxwriter
-import plotly.express as px
-from utils import safe_date_for_excel, format_date_for_display
-
-def df_to_excel_bytes(df: pd.DataFrame) -> bytes:
-    """
-    Convierte un DataFrame a un archivo Excel en memoria con formato de tabla nativa
-    para permitir filtros y ordenamiento, incluyendo detalles de tareas y subtareas.
-    """
-    output = io.BytesIO()
-    writer = pd.ExcelWriter(output, engine='xlsxwriter')
-    
-    # --- 1. Preparar el DataFrame para el reporte ---
-    df_report = df.copy()
-    
-    # Añadir columna de tipo (Tarea/Subtarea)
-    df_report['tipo'] = df_report['parent_id'].apply(lambda x: 'Subtarea' if pd.notna(x) else 'Tarea')
-    
-    # Mapeo de IDs de tareas padres a nombres
-    # Se usa el mismo df filtrado para el mapeo. Si una tarea padre no está en el
-    # conjunto filtrado, su nombre no aparecerá.
-    parent_task_map = df.set_index('id')['nombre'].to_dict()
-    df_report['tarea_padre'] = df_report['parent_id'].map(parent_task_map).fillna('')
-    
-    # Convertir lista de asignados a un string
-    df_report['asignados'] = df_report['asignados'].apply(lambda x: ', '.join(x) if isinstance(x, list) else '')
-    
-    # Convertir fechas NaT a None para evitar problemas en Excel
-    df_report['fecha_inicio'] = df_report['fecha_inicio'].apply(safe_date_for_excel)
-    df_report['fecha_limite'] = df_report['fecha_limite'].apply(safe_date_for_excel)
-    
-    # Mapeo de nombres de columnas a español
-    column_map = {
-        'proyecto': 'Carpeta',
-        'estado': 'Estado',
-        'nombre': 'Nombre de tarea',
-        'asignados': 'Asignados',
-        'fecha_inicio': 'Fecha inic.',
-        'fecha_limite': 'Fecha límite',
-        'prioridad': 'Prioridad',
-        'tipo': 'Tipo',
-        'tarea_padre': 'Tarea Padre'
-    }
-    
-    # Seleccionar, renombrar y reordenar columnas
-    df_to_write = df_report[list(column_map.keys())].rename(columns=column_map)
-    final_columns_order = ['Carpeta', 'Estado', 'Tipo', 'Nombre de tarea', 'Tarea Padre', 'Asignados', 'Fecha inic.', 'Fecha límite', 'Prioridad']
-    df_to_write = df_to_write[final_columns_order]
-
-    # --- 2. Escribir la tabla de datos en Excel ---
-    sheet_name = 'Reporte Detallado'
-    df_to_write.to_excel(writer, index=False, sheet_name=sheet_name)
-    
-    workbook = writer.book
-    worksheet = writer.sheets[sheet_name]
-    
-    # Definir el rango de la tabla
-    (max_row, max_col) = df_to_write.shape
-    
-    # Crear la tabla nativa de Excel
-    worksheet.add_table(0, 0, max_row, max_col - 1, {
-        'columns': [{'header': col_name} for col_name in df_to_write.columns],
-        'style': 'Table Style Medium 9',
-    })
-
-    # --- 3. Ajustar formato y ancho de columnas ---
-    date_format = workbook.add_format({'num_format': 'dd/mm/yy'})
-    worksheet.set_column('G:H', 12, date_format) # Formato para columnas de fecha
-    
-    # Auto-ajustar ancho de las otras columnas
-    worksheet.set_column('A:A', 20)
-    worksheet.set_column('B:B', 15)
-    worksheet.set_column('C:C', 10)
-    worksheet.set_column('D:D', 50)
-    worksheet.set_column('E:E', 50)
-    worksheet.set_column('F:F', 30)
-    worksheet.set_column('I:I', 12)
-
-    writer.close()
-    return output.getvalue()
-
-
-def render_detailed_report(df: pd.DataFrame):
-    """
-    Renderiza la vista del reporte detallado.
-    Muestra una tabla con los datos filtrados y un botón de descarga de Excel.
-    """
-    st.header("📄 Reporte Detallado de Tareas")
-
-    if df.empty:
-        st.warning("No hay datos disponibles para los filtros seleccionados.")
-        return
-
-    # Preparar DataFrame para mostrar en la app
-    display_df = df.copy()
-    display_df['tipo'] = display_df['is_subtask'].apply(lambda x: 'Subtarea' if x else 'Tarea')
-    
-    # Formatear fechas para una mejor visualización
-    display_df['fecha_inicio'] = display_df['fecha_inicio'].dt.strftime('%d/%m/%Y').fillna('N/A')
-    display_df['fecha_limite'] = display_df['fecha_limite'].dt.strftime('%d/%m/%Y').fillna('N/A')
-    
-    # Convertir lista de asignados a un string
-    display_df['asignados'] = display_df['asignados'].apply(lambda x: ', '.join(x) if isinstance(x, list) and x else 'N/A')
-
-    # Seleccionar y reordenar columnas para la tabla
-    columns_to_display = [
-        'nombre', 'tipo', 'estado', 'proyecto', 
-        'asignados', 'fecha_inicio', 'fecha_limite', 'prioridad'
-    ]
-    st.dataframe(display_df[columns_to_display])
-
-    # Botón de descarga de Excel
-    st.markdown("---")
-    excel_bytes = df_to_excel_bytes(df)
-    st.download_button(
-        label="📊 Descargar Reporte Detallado",
-        data=excel_bytes,
-        file_name='reporte_detallado_tareas.xlsx',
-        mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        help="Descarga la tabla detallada de tareas y subtareas en formato Excel."
-    )
+import streamlit as st
+import pandas as pd
+import numpy as np
+from typing import List, Optional, Tuple
+from export_engine import Column, SheetSpec, build_workbook, spec_frame
+from data_export import DATA_FORMATS, export_data
+from views.split_export import render_split_export
+from utils import frame_signature
+
+def assignees_text(df: pd.DataFrame) -> list:
+    """Lista de asignados de cada tarea como texto separado por comas."""
+    return [', '.join(x) if isinstance(x, list) else '' for x in df['asignados']]
+
+def parent_names(df: pd.DataFrame) -> pd.Series:
+    """
+    Nombre de la tarea padre de cada subtarea. Se usa el mismo df filtrado para
+    el mapeo: si una tarea padre no está en el conjunto filtrado, su nombre no aparecerá.
+    """
+    nombres = df.drop_duplicates('id', keep='last').dropna(subset=['id']).set_index('id')['nombre']
+    return df['parent_id'].map(nombres).fillna('')
+
+# Hoja del reporte detallado: tabla nativa de Excel para permitir filtros y ordenamiento
+DETAILED_SHEET = SheetSpec('Reporte Detallado', [
+    Column('Carpeta', 'proyecto', width=20),
+    Column('Estado', 'estado', width=15),
+    Column('Tipo', lambda df: np.where(df['parent_id'].notna(), 'Subtarea', 'Tarea'), width=10),
+    Column('Nombre de tarea', 'nombre', width=50),
+    Column('Tarea Padre', parent_names, width=50),
+    Column('Asignados', assignees_text, width=30),
+    Column('Fecha inic.', 'fecha_inicio', kind='date', width=12),
+    Column('Fecha límite', 'fecha_limite', kind='date', width=12),
+    Column('Prioridad', 'prioridad', width=12),
+], native_table=True, date_format='dd/mm/yy')
+
+def df_to_excel_bytes(df: pd.DataFrame) -> bytes:
+    """
+    Convierte un DataFrame a un archivo Excel en memoria con formato de tabla nativa
+    para permitir filtros y ordenamiento, incluyendo detalles de tareas y subtareas.
+    """
+    return build_workbook([(DETAILED_SHEET, df)])
+
+def detailed_data_bytes(df: pd.DataFrame, data_format: str) -> bytes:
+    """
+    Exporta la tabla del reporte detallado (mismas columnas que el Excel) en un
+    formato de datos comprimido: 'csv' (gzip), 'parquet' o 'arrow'.
+    """
+    return export_data(spec_frame(DETAILED_SHEET, df), data_format)
+
+# Formatos de datos ofrecidos en la vista
+DATA_FORMAT_LABELS = {"CSV (gzip)": 'csv', "Parquet": 'parquet', "Arrow IPC": 'arrow'}
+
+def render_data_export(df: pd.DataFrame):
+    """
+    Exportación de la tabla en formatos de datos para cargas masivas (BI). El
+    archivo se genera solo al pulsar el botón y se guarda en la sesión
+    mientras no cambien el formato, la versión de los datos ni las filas filtradas.
+    """
+    st.subheader("Exportar datos para cargas masivas")
+    col1, col2 = st.columns([2, 1])
+    format_label = col1.selectbox("Formato", list(DATA_FORMAT_LABELS), key='detallado_data_format')
+    data_format = DATA_FORMAT_LABELS[format_label]
+
+    signature = (data_format,) + frame_signature(df, st.session_state.get('dataset_version'))
+    if col2.button("Generar archivo", key='detallado_data_button'):
+        with st.spinner(f"Generando {format_label}..."):
+            st.session_state.detallado_data_export = (signature, detailed_data_bytes(df, data_format))
+
+    cached = st.session_state.get('detallado_data_export')
+    if cached is not None and cached[0] == signature:
+        extension, mime = DATA_FORMATS[data_format]
+        st.download_button(
+            label=f"📦 Descargar {format_label}",
+            data=cached[1],
+            file_name=f'reporte_detallado_tareas.{extension}',
+            mime=mime,
+            key='detallado_data_download'
+        )
+
+# Etiquetas de las columnas de la tabla en pantalla
+DISPLAY_COLUMNS = {
+    'nombre': 'Nombre', 'tipo': 'Tipo', 'estado': 'Estado', 'proyecto': 'Proyecto',
+    'asignados': 'Asignados', 'fecha_inicio': 'Fecha inicio', 'fecha_limite': 'Fecha límite', 'prioridad': 'Prioridad',
+}
+# Columnas por las que se puede ordenar (se ordena sobre el tipo original: fechas, categorías)
+SORT_COLUMNS = ['fecha_limite', 'fecha_inicio', 'nombre', 'estado', 'proyecto', 'prioridad', 'tipo']
+PAGE_SIZES = [50, 100, 250, 500]
+
+def table_positions(df: pd.DataFrame, sort_by: Optional[str] = None, ascending: bool = True,
+                    prioridades: Optional[List[str]] = None, personas: Optional[List[str]] = None) -> np.ndarray:
+    """
+    Posiciones (iloc) de las filas de la tabla tras aplicar los filtros de
+    columna y el orden, calculadas sobre las columnas tipadas sin formatear
+    nada. Los nulos quedan al final en ambos sentidos; el orden es estable.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    if prioridades:
+        mask &= df['prioridad'].isin(prioridades).to_numpy()
+    if personas:
+        asignados = df['asignados'].reset_index(drop=True).explode()
+        mask &= asignados.isin(personas).groupby(level=0).any().reindex(range(len(df)), fill_value=False).to_numpy()
+    positions = np.flatnonzero(mask)
+
+    if sort_by:
+        if sort_by == 'tipo':
+            values = pd.Series(df['is_subtask'].to_numpy()[positions])
+        else:
+            values = df[sort_by].iloc[positions].reset_index(drop=True)
+        order = values.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+        positions = positions[order]
+    return positions
+
+def format_page(page: pd.DataFrame) -> pd.DataFrame:
+    """Da formato de presentación (fechas, asignados, tipo) solo a las filas de la página."""
+    display_df = pd.DataFrame({
+        'nombre': page['nombre'],
+        'tipo': np.where(page['is_subtask'].to_numpy(dtype=bool), 'Subtarea', 'Tarea'),
+        'estado': page['estado'],
+        'proyecto': page['proyecto'],
+        'asignados': [', '.join(x) if isinstance(x, list) and x else 'N/A' for x in page['asignados']],
+        'fecha_inicio': page['fecha_inicio'].dt.strftime('%d/%m/%Y').fillna('N/A'),
+        'fecha_limite': page['fecha_limite'].dt.strftime('%d/%m/%Y').fillna('N/A'),
+        'prioridad': page['prioridad'],
+    }, index=page.index)
+    return display_df
+
+def table_options(store: dict, df: pd.DataFrame) -> Tuple[list, list]:
+    """
+    Opciones de los filtros de columna (prioridades y personas asignadas).
+    Se recalculan solo cuando cambia la firma de las filas filtradas (versión
+    de los datos e índice), no en cada nuevo recorte del mismo conjunto;
+    'store' es un diccionario persistente (p. ej. la sesión de Streamlit).
+    """
+    signature = frame_signature(df, store.get('dataset_version'))
+    cached = store.get('detallado_opciones')
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    options = (sorted(df['prioridad'].dropna().unique()), sorted(df['asignados'].explode().dropna().unique()))
+    store['detallado_opciones'] = (signature, options)
+    return options
+
+def render_table(df: pd.DataFrame):
+    """
+    Tabla paginada: filtros de columna y orden se resuelven en el servidor y
+    solo se formatea y se envía al navegador la página visible.
+    """
+    col1, col2, col3, col4 = st.columns([2, 1, 2, 2])
+    sort_by = col1.selectbox("Ordenar por", SORT_COLUMNS, format_func=DISPLAY_COLUMNS.get, key='detallado_sort_by')
+    ascending = col2.radio("Orden", ["Asc.", "Desc."], key='detallado_sort_order', horizontal=True) == "Asc."
+    prioridad_options, persona_options = table_options(st.session_state, df)
+    prioridades = col3.multiselect("Prioridad", prioridad_options, key='detallado_prioridades')
+    personas = col4.multiselect("Asignado a", persona_options, key='detallado_personas')
+
+    positions = table_positions(df, sort_by, ascending, prioridades, personas)
+
+    col1, col2, col3 = st.columns([1, 1, 3])
+    page_size = col1.selectbox("Filas por página", PAGE_SIZES, key='detallado_page_size')
+    n_pages = max(1, -(-len(positions) // page_size))
+    # Al reducirse el resultado, la página guardada puede quedar fuera de rango
+    if st.session_state.get('detallado_page', 1) > n_pages:
+        st.session_state.detallado_page = 1
+    page = col2.number_input("Página", min_value=1, max_value=n_pages, step=1, key='detallado_page')
+    first = (page - 1) * page_size
+    page_positions = positions[first:first + page_size]
+    if len(positions):
+        col3.caption(f"Filas {first + 1}–{first + len(page_positions)} de {len(positions)} · página {page} de {n_pages}")
+    else:
+        col3.caption("Ninguna fila coincide con los filtros de la tabla.")
+
+    st.dataframe(format_page(df.iloc[page_positions]), hide_index=True)
+
+def render_detailed_report(df: pd.DataFrame):
+    """
+    Renderiza la vista del reporte detallado.
+    Muestra una tabla paginada con los datos filtrados y un botón de descarga de Excel.
+    """
+    st.header("📄 Reporte Detallado de Tareas")
+
+    if df.empty:
+        st.warning("No hay datos disponibles para los filtros seleccionados.")
+        return
+
+    render_table(df)
+
+    # Botón de descarga de Excel: el libro se genera solo al pulsar el botón y
+    # se guarda en la sesión mientras no cambien la versión de los datos ni las filas filtradas
+    st.markdown("---")
+    signature = frame_signature(df, st.session_state.get('dataset_version'))
+    if st.button("📊 Preparar Reporte Detallado", key='detallado_excel_button'):
+        with st.spinner("Generando Excel..."):
+            st.session_state.detallado_excel = (signature, df_to_excel_bytes(df))
+
+    cached = st.session_state.get('detallado_excel')
+    if cached is not None and cached[0] == signature:
+        st.download_button(
+            label="📊 Descargar Reporte Detallado",
+            data=cached[1],
+            file_name='reporte_detallado_tareas.xlsx',
+            mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            help="Descarga la tabla detallada de tareas y subtareas en formato Excel."
+        )
+
+    # Exportación en formatos de datos (CSV, Parquet, Arrow)
+    st.markdown("---")
+    render_data_export(df)
+
+    # Exportación dividida por proyecto o persona
+    st.markdown("---")
+    render_split_export(df, 'detallado', key='detallado')
@@ -1,205 +1,204 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import io
-from utils import safe_date_for_excel
+import plotly.graph_objects as go
+from typing import Dict, Optional
+from export_engine import HEADER_FORMAT, Chart, Column, SheetSpec, TablePlacement, build_workbook, frame_columns
+from gantt_prep import cached_gantt_frame
+from schedule_analytics import cached_analysis
 
-def gantt_only_to_excel(df: pd.DataFrame, original_df: pd.DataFrame) -> bytes:
+def gantt_chart(placement: TablePlacement) -> Chart:
+    """Gantt como gráfico de barras apiladas: una serie invisible de inicio y otra de duración."""
+    return Chart(
+        {'type': 'bar', 'subtype': 'stacked'},
+        [
+            # Serie invisible para el "inicio" (para posicionar las barras)
+            {'name': 'Inicio', 'categories': 'Tarea', 'values': 'Inicio (días)',
+             'fill': {'none': True}, 'border': {'none': True}},
+            # Serie visible para la "duración" (las barras del Gantt)
+            {'name': 'Duración de Tareas', 'categories': 'Tarea', 'values': 'Duración',
+             'fill': {'color': '#4472C4'}, 'border': {'color': '#2F4F8F', 'width': 1}},
+        ],
+        anchor='F6',
+        title={'name': 'Cronograma de Tareas', 'name_font': {'size': 14, 'bold': True}},
+        x_axis={'name': 'Días desde el inicio del proyecto', 'name_font': {'size': 12}, 'num_font': {'size': 10}},
+        y_axis={'name': 'Tareas', 'name_font': {'size': 12}, 'reverse': True},
+        size={'width': 800, 'height': max(400, placement.n_rows * 25)},
+        legend={'position': 'bottom'},
+    )
+
+def gantt_period(gantt_frame: pd.DataFrame) -> str:
+    return f"Período: {gantt_frame['fecha_inicio'].min().strftime('%d/%m/%Y')} - {gantt_frame['fecha_limite'].max().strftime('%d/%m/%Y')}"
+
+def gantt_summary(gantt_frame: pd.DataFrame) -> list:
+    duracion_total = (gantt_frame['fecha_limite'].max() - gantt_frame['fecha_inicio'].min()).days + 1
+    return [
+        f'Total de tareas: {len(gantt_frame)}',
+        f'Duración total del proyecto: {duracion_total} días',
+        f'Proyectos involucrados: {gantt_frame["proyecto"].nunique()}',
+    ]
+
+GANTT_CHART_SHEET = SheetSpec('Diagrama de Gantt', [
+    Column('Tarea', 'tarea_display', width=40),
+    Column('Inicio (días)', 'inicio_dias', kind='number'),
+    Column('Duración', 'duracion', kind='number'),
+    Column('Proyecto', 'proyecto'),
+], header_format=HEADER_FORMAT, title='DIAGRAMA DE GANTT - CRONOGRAMA DE TAREAS', subtitle=gantt_period,
+   charts=[gantt_chart])
+
+DATE_CELL = {'border': 1}
+
+def gantt_data_sheet(parent_names: pd.Series) -> SheetSpec:
+    """Hoja de datos detallados; 'parent_names' es el nombre de cada id en el DataFrame completo."""
+    return SheetSpec('Datos Detallados', [
+        Column('Tarea/Subtarea', 'nombre', width=40),
+        Column('Proyecto', 'proyecto', width=20),
+        Column('Tipo', 'tipo', width=10),
+        Column('Fecha Inicio', 'fecha_inicio', kind='date', width=12, cell_format=DATE_CELL),
+        Column('Fecha Fin', 'fecha_limite', kind='date', width=12, cell_format=DATE_CELL),
+        Column('Duración (días)', 'duracion', kind='number'),
+        Column('Tarea Padre', lambda frame: frame['parent_id'].map(parent_names).fillna('')),
+    ], header_format=HEADER_FORMAT, notes=gantt_summary, notes_title='RESUMEN:')
+
+def gantt_only_to_excel(gantt_frame: pd.DataFrame, original_df: pd.DataFrame, analytics: Optional[Dict[str, pd.DataFrame]] = None) -> bytes:
     """
     Genera únicamente el diagrama de Gantt en Excel usando un gráfico de barras apiladas real.
+    Recibe el frame ya preparado por 'prepare_gantt_frame' y, opcionalmente, los
+    resultados de 'analyze_schedule', que se añaden como hojas adicionales.
     """
-    import xlsxwriter
-    
-    output = io.BytesIO()
-    
-    # Preparar el DataFrame para el Gantt
-    gantt_df = df.copy()
-    
-    # Lógica para manejar fechas faltantes
-    gantt_df.loc[gantt_df['fecha_inicio'].isnull() & gantt_df['fecha_limite'].notnull(), 'fecha_inicio'] = gantt_df['fecha_limite'] - pd.Timedelta(days=1)
-    gantt_df.loc[gantt_df['fecha_limite'].isnull() & gantt_df['fecha_inicio'].notnull(), 'fecha_limite'] = gantt_df['fecha_inicio'] + pd.Timedelta(days=1)
-
-    # Filtrar las tareas que tienen ambas fechas
-    gantt_valid_df = gantt_df.dropna(subset=['fecha_inicio', 'fecha_limite']).copy()
-    
-    if gantt_valid_df.empty:
+    if gantt_frame.empty:
         # Si no hay datos válidos, crear una hoja con mensaje
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            worksheet = writer.book.add_worksheet('Sin Datos')
-            worksheet.write('A1', 'No hay tareas con fechas válidas para mostrar en el diagrama de Gantt')
-        return output.getvalue()
-    
-    # Preparar datos para el Gantt
-    gantt_valid_df = gantt_valid_df.sort_values(['proyecto', 'fecha_inicio'])
-    
-    # Calcular fechas base
-    fecha_minima = gantt_valid_df['fecha_inicio'].min()
-    fecha_maxima = gantt_valid_df['fecha_limite'].max()
-    
-    # Convertir fechas a números de días desde la fecha mínima
-    gantt_valid_df['inicio_dias'] = (gantt_valid_df['fecha_inicio'] - fecha_minima).dt.days
-    gantt_valid_df['duracion'] = (gantt_valid_df['fecha_limite'] - gantt_valid_df['fecha_inicio']).dt.days + 1
-    
-    # Crear nombres de tareas más cortos
-    gantt_valid_df['tarea_display'] = gantt_valid_df.apply(
-        lambda row: f"  - {row['nombre']}" if pd.notna(row['parent_id']) else row['nombre'],
-        axis=1
+        message = 'No hay tareas con fechas válidas para mostrar en el diagrama de Gantt'
+        return build_workbook([(SheetSpec('Sin Datos', [], empty_message=message), gantt_frame)])
+
+    parent_names = original_df.drop_duplicates('id', keep='last').dropna(subset=['id']).set_index('id')['nombre']
+    sheets = [(GANTT_CHART_SHEET, gantt_frame), (gantt_data_sheet(parent_names), gantt_frame)]
+    # Hojas con el análisis del cronograma
+    for sheet_name, analysis_df in (analytics or {}).items():
+        columns = frame_columns(analysis_df, width=30, date_width=14, date_cell_format=DATE_CELL)
+        sheets.append((SheetSpec(sheet_name, columns, header_format=HEADER_FORMAT), analysis_df))
+    return build_workbook(sheets)
+
+# Por encima de este número de tareas el Gantt arranca en modo resumen
+GANTT_AGGREGATE_THRESHOLD = 300
+GANTT_PAGE_SIZES = [25, 50, 100, 200]
+GANTT_ROW_HEIGHT = 25
+GANTT_COLORS = {
+    'Tarea': '#1f77b4',
+    'Subtarea': '#ff7f0e',
+    'Proyecto': '#2F5597',
+    'Tarea principal': '#4472C4'
+}
+
+def aggregate_gantt(gantt_df: pd.DataFrame, level: str) -> pd.DataFrame:
+    """
+    Agrega las tareas del Gantt en una barra resumen por proyecto
+    (level='proyecto') o por tarea principal con sus subtareas (level='familia').
+    """
+    keys = ['proyecto']
+    if level == 'familia':
+        gantt_df = gantt_df.assign(familia=gantt_df['parent_id'].where(gantt_df['parent_id'].notna(), gantt_df['id']))
+        keys = ['proyecto', 'familia']
+
+    summary = gantt_df.groupby(keys, sort=True, observed=True).agg(
+        fecha_inicio=('fecha_inicio', 'min'),
+        fecha_limite=('fecha_limite', 'max'),
+        tareas=('nombre', 'size'),
+        primer_nombre=('nombre', 'first'),
+    ).reset_index()
+
+    if level == 'familia':
+        nombres = gantt_df.drop_duplicates('id').set_index('id')['nombre']
+        nombre_familia = summary['familia'].map(nombres).fillna(summary['primer_nombre'])
+        summary['task_label'] = summary['proyecto'].astype(str) + ' - ' + nombre_familia.astype(str)
+        summary['tipo'] = 'Tarea principal'
+    else:
+        summary['task_label'] = summary['proyecto'].astype(str)
+        summary['tipo'] = 'Proyecto'
+
+    summary['task_label'] = summary['task_label'] + ' (' + summary['tareas'].astype(str) + ')'
+    return summary.sort_values(keys[:1] + ['fecha_inicio']).reset_index(drop=True)
+
+def build_gantt_figure(gantt_df: pd.DataFrame, label_col: str, color_col: str, title: str) -> go.Figure:
+    """
+    Construye el Gantt con una traza de barras horizontales por categoría.
+    Las fechas se envían como texto corto (base) y las duraciones en milisegundos;
+    el único dato personalizado por barra es la fecha de fin para el tooltip.
+    """
+    fig = go.Figure()
+    inicio = gantt_df['fecha_inicio']
+    duracion_ms = (gantt_df['fecha_limite'] - inicio).dt.total_seconds().mul(1000).astype('int64')
+    base = inicio.dt.strftime('%Y-%m-%d')
+    fin = gantt_df['fecha_limite'].dt.strftime('%d/%m/%Y')
+
+    for categoria, idx in gantt_df.groupby(color_col, sort=False, observed=True).indices.items():
+        fig.add_trace(go.Bar(
+            name=str(categoria),
+            y=gantt_df[label_col].to_numpy()[idx],
+            x=duracion_ms.to_numpy()[idx],
+            base=base.to_numpy()[idx],
+            customdata=fin.to_numpy()[idx],
+            orientation='h',
+            marker_color=GANTT_COLORS.get(categoria),
+            hovertemplate='%{y}<br>Inicio: %{base|%d/%m/%Y}<br>Fin: %{customdata}<extra></extra>',
+        ))
+
+    fig.update_layout(
+        title=title,
+        barmode='overlay',
+        height=max(400, len(gantt_df) * GANTT_ROW_HEIGHT + 150),
+        legend_title_text='Tipo',
+        xaxis=dict(type='date', range=[inicio.min(), gantt_df['fecha_limite'].max()]),
+        yaxis=dict(autorange='reversed', type='category', title='Tarea'),
     )
-    
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        workbook = writer.book
-        worksheet = workbook.add_worksheet('Diagrama de Gantt')
-        
-        # Configurar formatos
-        title_format = workbook.add_format({
-            'bold': True,
-            'font_size': 16,
-            'bg_color': '#2F5597',
-            'font_color': 'white',
-            'align': 'center',
-            'border': 1
-        })
-        
-        header_format = workbook.add_format({
-            'bold': True,
-            'bg_color': '#4472C4',
-            'font_color': 'white',
-            'border': 1,
-            'align': 'center'
-        })
-        
-        # Escribir título
-        worksheet.merge_range('A1:H1', 'DIAGRAMA DE GANTT - CRONOGRAMA DE TAREAS', title_format)
-        
-        # Información del período
-        info_format = workbook.add_format({
-            'font_size': 11,
-            'bg_color': '#D9E2F3',
-            'border': 1,
-            'align': 'center'
-        })
-        periodo_text = f"Período: {fecha_minima.strftime('%d/%m/%Y')} - {fecha_maxima.strftime('%d/%m/%Y')}"
-        worksheet.merge_range('A2:H2', periodo_text, info_format)
-        
-        # Preparar datos para el gráfico
-        chart_start_row = 4
-        
-        # Escribir headers para los datos del gráfico
-        worksheet.write('A4', 'Tarea', header_format)
-        worksheet.write('B4', 'Inicio (días)', header_format)
-        worksheet.write('C4', 'Duración', header_format)
-        worksheet.write('D4', 'Proyecto', header_format)
-        
-        # Escribir los datos
-        for i, (_, task) in enumerate(gantt_valid_df.iterrows()):
-            row = chart_start_row + 1 + i
-            worksheet.write(row, 0, task['tarea_display'])
-            worksheet.write(row, 1, task['inicio_dias'])
-            worksheet.write(row, 2, task['duracion'])
-            worksheet.write(row, 3, task['proyecto'])
-        
-        # Crear el gráfico de Gantt
-        chart = workbook.add_chart({'type': 'bar', 'subtype': 'stacked'})
-        
-        num_tasks = len(gantt_valid_df)
-        
-        # Agregar serie invisible para el "inicio" (para posicionar las barras)
-        chart.add_series({
-            'name': 'Inicio',
-            'categories': [worksheet.name, chart_start_row + 1, 0, chart_start_row + num_tasks, 0],
-            'values': [worksheet.name, chart_start_row + 1, 1, chart_start_row + num_tasks, 1],
-            'fill': {'none': True},
-            'border': {'none': True},
-        })
-        
-        # Agregar serie visible para la "duración" (las barras del Gantt)
-        chart.add_series({
-            'name': 'Duración de Tareas',
-            'categories': [worksheet.name, chart_start_row + 1, 0, chart_start_row + num_tasks, 0],
-            'values': [worksheet.name, chart_start_row + 1, 2, chart_start_row + num_tasks, 2],
-            'fill': {'color': '#4472C4'},
-            'border': {'color': '#2F4F8F', 'width': 1},
-        })
-        
-        # Configurar el gráfico
-        chart.set_title({
-            'name': 'Cronograma de Tareas',
-            'name_font': {'size': 14, 'bold': True}
-        })
-        
-        chart.set_x_axis({
-            'name': 'Días desde el inicio del proyecto',
-            'name_font': {'size': 12},
-            'num_font': {'size': 10}
-        })
-        
-        chart.set_y_axis({
-            'name': 'Tareas',
-            'name_font': {'size': 12},
-            'reverse': True
-        })
-        
-        chart.set_size({
-            'width': 800,
-            'height': max(400, num_tasks * 25)
-        })
-        
-        chart.set_legend({'position': 'bottom'})
-        
-        # Insertar el gráfico en la hoja
-        worksheet.insert_chart('F6', chart)
-        
-        # Ajustar anchos de columna
-        worksheet.set_column('A:A', 40)
-        worksheet.set_column('B:D', 15)
-        worksheet.set_column('F:N', 12)
-        
-        # Crear una segunda hoja con tabla detallada
-        worksheet_data = workbook.add_worksheet('Datos Detallados')
-        
-        # Preparar datos detallados
-        parent_task_map = original_df.set_index('id')['nombre'].to_dict()
-        detailed_data = gantt_valid_df[['nombre', 'proyecto', 'fecha_inicio', 'fecha_limite', 'duracion', 'parent_id']].copy()
-        detailed_data['tipo'] = detailed_data['parent_id'].apply(lambda x: 'Subtarea' if pd.notna(x) else 'Tarea')
-        
-        # Escribir encabezados detallados
-        detailed_headers = ['Tarea/Subtarea', 'Proyecto', 'Tipo', 'Fecha Inicio', 'Fecha Fin', 'Duración (días)', 'Tarea Padre']
-        for col, header in enumerate(detailed_headers):
-            worksheet_data.write(0, col, header, header_format)
-        
-        # Escribir datos detallados
-        for i, (_, task_data) in enumerate(detailed_data.iterrows()):
-            row = i + 1
-            worksheet_data.write(row, 0, task_data['nombre'])
-            worksheet_data.write(row, 1, task_data['proyecto'])
-            worksheet_data.write(row, 2, task_data['tipo'])
-            worksheet_data.write(row, 3, task_data['fecha_inicio'])
-            worksheet_data.write(row, 4, task_data['fecha_limite'])
-            worksheet_data.write(row, 5, task_data['duracion'])
-            parent_name = parent_task_map.get(task_data['parent_id'], '')
-            worksheet_data.write(row, 6, parent_name)
-        
-        # Ajustar anchos en la hoja de datos
-        worksheet_data.set_column('A:A', 40)
-        worksheet_data.set_column('B:B', 20)
-        worksheet_data.set_column('C:C', 10)
-        worksheet_data.set_column('D:E', 12)
-        worksheet_data.set_column('F:G', 15)
-        
-        # Agregar formato de fecha a las columnas de fecha
-        date_format = workbook.add_format({'num_format': 'dd/mm/yyyy', 'border': 1})
-        worksheet_data.set_column('D:E', 12, date_format)
-        
-        # Añadir información de resumen
-        summary_row = len(detailed_data) + 3
-        summary_format = workbook.add_format({'bold': True, 'font_size': 12, 'bg_color': '#E6F2FF'})
-        
-        worksheet_data.write(summary_row, 0, 'RESUMEN:', summary_format)
-        worksheet_data.write(summary_row + 1, 0, f'Total de tareas: {len(gantt_valid_df)}')
-        worksheet_data.write(summary_row + 2, 0, f'Duración total del proyecto: {(fecha_maxima - fecha_minima).days + 1} días')
-        worksheet_data.write(summary_row + 3, 0, f'Proyectos involucrados: {len(gantt_valid_df["proyecto"].unique())}')
-    
-    return output.getvalue()
+    return fig
+
+def window_rows(df: pd.DataFrame, page: int, page_size: int) -> pd.DataFrame:
+    """Devuelve únicamente las filas de la página solicitada (1-indexada)."""
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size]
+
+def _render_windowed_gantt(gantt_df: pd.DataFrame, label_col: str, color_col: str, title: str, key: str):
+    """
+    Dibuja el Gantt mostrando solo una ventana de filas; el resto se recorre
+    con el paginador para que el navegador reciba un número acotado de barras.
+    """
+    page_size = GANTT_PAGE_SIZES[1]
+    page = 1
+    if len(gantt_df) > GANTT_PAGE_SIZES[0]:
+        size_key, page_key = f"{key}_page_size", f"{key}_page"
+        st.session_state.setdefault(size_key, page_size)
+        col_size, col_page = st.columns(2)
+        page_size = col_size.select_slider("Filas por página", options=GANTT_PAGE_SIZES, key=size_key)
+
+        # Ajustar la página actual si el número de páginas cambió con los filtros
+        num_pages = max(1, -(-len(gantt_df) // page_size))
+        st.session_state[page_key] = min(st.session_state.get(page_key, 1), num_pages)
+        page = col_page.number_input(f"Página (de {num_pages})", min_value=1, max_value=num_pages, step=1, key=page_key)
+
+    fig = build_gantt_figure(window_rows(gantt_df, page, page_size), label_col, color_col, title)
+    st.plotly_chart(fig, use_container_width=True)
+
+def _render_schedule_analytics(analytics: Dict[str, pd.DataFrame]):
+    """
+    Muestra el resumen del análisis del cronograma: duración de cada proyecto,
+    sobrecarga de personas y subtareas fuera de la ventana de su tarea padre.
+    """
+    spans = analytics['Duración por Proyecto']
+    overlaps = analytics['Sobrecarga por Persona']
+    violations = analytics['Inconsistencias de Fechas']
+
+    with st.expander("📐 Análisis del cronograma", expanded=False):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Proyectos", len(spans))
+        col2.metric("Personas con tareas simultáneas", overlaps['Persona'].nunique())
+        col3.metric("Subtareas fuera de su tarea padre", len(violations))
+
+        st.subheader("Duración por proyecto")
+        st.dataframe(spans, hide_index=True)
+        st.subheader("Periodos con tareas simultáneas por persona")
+        st.dataframe(overlaps, hide_index=True)
+        st.subheader("Subtareas fuera de la ventana de su tarea padre")
+        st.dataframe(violations, hide_index=True)
 
 def render_gantt_view(df: pd.DataFrame):
     """
@@ -222,9 +221,6 @@ def render_gantt_view(df: pd.DataFrame):
         st.warning("Por favor, selecciona al menos un proyecto para visualizar el Gantt.")
         return
 
-    # Filtrar el DataFrame por los proyectos seleccionados en el estado de sesión del Gantt
-    gantt_df = df[df['proyecto'].isin(st.session_state.gantt_selected_proyectos)].copy()
-
     # --- Filtro de Subtareas ---
     if 'gantt_include_subtasks' not in st.session_state:
         st.session_state.gantt_include_subtasks = True
@@ -235,57 +231,41 @@ def render_gantt_view(df: pd.DataFrame):
         help="Marca esta casilla para mostrar las subtareas. Desmárcala para ver solo las tareas principales."
     )
 
-    if not st.session_state.gantt_include_subtasks:
-        gantt_df = gantt_df[gantt_df['parent_id'].isnull()]
-
-    # Lógica para manejar fechas faltantes: si solo falta una, se calcula.
-    gantt_df.loc[gantt_df['fecha_inicio'].isnull() & gantt_df['fecha_limite'].notnull(), 'fecha_inicio'] = gantt_df['fecha_limite'] - pd.Timedelta(days=1)
-    gantt_df.loc[gantt_df['fecha_limite'].isnull() & gantt_df['fecha_inicio'].notnull(), 'fecha_limite'] = gantt_df['fecha_inicio'] + pd.Timedelta(days=1)
-    
-    # Filtrar las tareas que aún no tienen ambas fechas
-    gantt_df = gantt_df.dropna(subset=['fecha_inicio', 'fecha_limite'])
+    # Frame de Gantt preparado una sola vez por estado de filtros (pantalla y Excel)
+    gantt_df = cached_gantt_frame(
+        st.session_state,
+        df,
+        st.session_state.gantt_selected_proyectos,
+        st.session_state.gantt_include_subtasks
+    )
 
     if gantt_df.empty:
         st.warning("Los proyectos seleccionados no tienen tareas con fechas de inicio y fin definidas o derivables.")
         return
 
-    gantt_df['tipo'] = gantt_df['parent_id'].apply(lambda x: 'Subtarea' if pd.notna(x) else 'Tarea')
-    
-    if st.session_state.gantt_include_subtasks:
-        gantt_df['task_label'] = gantt_df.apply(
-            lambda row: f"  - {row['nombre']}" if pd.notna(row['parent_id']) else f"{row['proyecto']} - {row['nombre']}",
-            axis=1
-        )
+    # --- Modo escalable: agregación, paginación y trazas ligeras ---
+    niveles = ["Tareas individuales", "Resumen por tarea principal", "Resumen por proyecto"]
+    if 'gantt_nivel' not in st.session_state:
+        # Con muchas tareas se empieza por el resumen por proyecto
+        st.session_state.gantt_nivel = niveles[2] if len(gantt_df) > GANTT_AGGREGATE_THRESHOLD else niveles[0]
+    nivel = st.radio("Nivel de detalle", niveles, key='gantt_nivel', horizontal=True)
+
+    if nivel == "Tareas individuales":
+        _render_windowed_gantt(gantt_df, 'task_label', 'tipo', "Cronograma de Tareas por Proyecto", key='gantt_tareas')
     else:
-        gantt_df['task_label'] = gantt_df.apply(lambda row: f"{row['proyecto']} - {row['nombre']}", axis=1)
-
-    # Usar una altura dinámica para el gráfico
-    chart_height = max(600, len(gantt_df) * 25)
-
-    # Usar una paleta de colores más vibrante y pasar las fechas como objetos datetime
-    fig = px.timeline(
-        gantt_df,
-        x_start="fecha_inicio",
-        x_end="fecha_limite",
-        y="task_label",
-        color="tipo",
-        title="Cronograma de Tareas por Proyecto",
-        labels={"task_label": "Tarea", "tipo": "Tipo"},
-        color_discrete_map={
-            'Tarea': '#1f77b4',
-            'Subtarea': '#ff7f0e'
-        },
-        height=chart_height
-    )
+        level = 'proyecto' if nivel == "Resumen por proyecto" else 'familia'
+        summary_df = aggregate_gantt(gantt_df, level)
+        _render_windowed_gantt(summary_df, 'task_label', 'tipo', f"Cronograma resumido ({nivel.lower()})", key='gantt_resumen')
 
-    # Dejar que Plotly maneje el formato del eje X automáticamente para la exportación
-    min_date = gantt_df['fecha_inicio'].min()
-    max_date = gantt_df['fecha_limite'].max()
-    fig.update_xaxes(range=[min_date, max_date])
-    
-    fig.update_yaxes(autorange="reversed")
-    
-    st.plotly_chart(fig, use_container_width=True)
+        # Drill-down: detalle de las tareas de un proyecto concreto
+        proyecto_detalle = st.selectbox(
+            "Ver el detalle de un proyecto",
+            options=["(ninguno)"] + sorted(gantt_df['proyecto'].unique()),
+            key='gantt_drilldown'
+        )
+        if proyecto_detalle != "(ninguno)":
+            detalle_df = gantt_df[gantt_df['proyecto'] == proyecto_detalle]
+            _render_windowed_gantt(detalle_df, 'task_label', 'tipo', f"Tareas de {proyecto_detalle}", key='gantt_detalle')
 
     # Informar al usuario sobre los proyectos que no se pueden mostrar
     original_projects = df['proyecto'].unique()
@@ -295,15 +275,24 @@ def render_gantt_view(df: pd.DataFrame):
     if excluded_projects:
         st.info(f"Nota: Los siguientes proyectos no se muestran en el Gantt porque sus tareas filtradas no tienen fechas de inicio y fin definidas: {', '.join(sorted(list(excluded_projects)))}")
 
+    # --- Análisis del cronograma (una vez por frame, no en cada paginación) ---
+    analytics = cached_analysis(st.session_state, gantt_df, df)
+    _render_schedule_analytics(analytics)
+
     # --- Botón de Descarga ---
+    # El libro se genera solo al pulsar el botón y se guarda en la sesión
+    # mientras no cambie el frame de Gantt
     st.markdown("---")
-    
-    excel_data = gantt_only_to_excel(gantt_df, df)
-    
-    st.download_button(
-        label="📈 Descargar Diagrama de Gantt",
-        data=excel_data,
-        file_name="diagrama_gantt_optimizado.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        help="Descarga el diagrama de Gantt con gráfico nativo de Excel"
-    )
+    if st.button("📈 Preparar Diagrama de Gantt en Excel", key='gantt_excel_button'):
+        with st.spinner("Generando Excel del Gantt..."):
+            st.session_state.gantt_excel = (gantt_df, gantt_only_to_excel(gantt_df, df, analytics))
+
+    cached = st.session_state.get('gantt_excel')
+    if cached is not None and cached[0] is gantt_df:
+        st.download_button(
+            label="📈 Descargar Diagrama de Gantt",
+            data=cached[1],
+            file_name="diagrama_gantt_optimizado.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            help="Descarga el diagrama de Gantt con gráfico nativo de Excel"
+        )
@@ -1,95 +1,77 @@
 import streamlit as st
 import pandas as pd
-import io
-from utils import safe_date_for_excel, format_date_for_display
+from export_engine import Chart, Column, FormatCache, SheetSpec, TablePlacement, build_workbook, insert_chart, write_table
+from views.split_export import render_split_export
+
+HEADER = {'bold': True, 'bg_color': '#D7E4BC', 'border': 1, 'valign': 'vcenter'}
+CELL = {'border': 1, 'valign': 'vcenter'}
+SUMMARY_STATES = ['pendiente', 'progreso', 'completado']
+
+# Bloques repetidos por persona: tabla de tareas y tabla de resumen de estado
+PERSON_TASKS = SheetSpec('Reporte General', [
+    Column('Nombre', 'asignados', cell_format=CELL),
+    Column('Tarea', 'nombre', cell_format=CELL),
+    Column('fecha inicio', 'fecha_inicio', kind='date', cell_format=CELL),
+    Column('fecha fin', 'fecha_limite', kind='date', cell_format=CELL),
+    Column('estado', 'estado', cell_format=CELL),
+], header_format=HEADER)
+PERSON_SUMMARY = SheetSpec('Reporte General', [
+    Column('EstadoTarea', 'estado', cell_format=CELL),
+    Column('Total de tareas', 'total', kind='number', cell_format=CELL),
+], header_format={'bold': True, 'border': 1})
+
+def status_pie(placement: TablePlacement) -> Chart:
+    """Gráfico de torta con el total de tareas según estado de una persona."""
+    return Chart(
+        {'type': 'pie'},
+        [{
+            'name': 'Total de tareas',
+            'categories': 'EstadoTarea',
+            'values': 'Total de tareas',
+            'points': [
+                {'fill': {'color': '#4F81BD'}}, # Azul para pendiente
+                {'fill': {'color': '#C0504D'}}, # Rojo para progreso
+                {'fill': {'color': '#9BBB59'}}, # Verde para completado
+            ],
+        }],
+        anchor=(placement.header_row, 3),
+        title={'name': 'Total de tareas segun estado'},
+        insert_options={'x_offset': 25, 'y_offset': 10},
+    )
 
 def generate_general_report_excel(df: pd.DataFrame) -> bytes:
     """
     Genera un reporte complejo en Excel agrupado por persona, incluyendo tablas y gráficos.
     """
-    output = io.BytesIO()
-    writer = pd.ExcelWriter(output, engine='xlsxwriter')
-    workbook = writer.book
-    worksheet = workbook.add_worksheet('Reporte General')
-
-    # --- Formatos ---
-    header_format = workbook.add_format({'bold': True, 'bg_color': '#D7E4BC', 'border': 1, 'valign': 'vcenter'})
-    cell_format = workbook.add_format({'border': 1, 'valign': 'vcenter'})
-    title_format = workbook.add_format({'bold': True, 'font_size': 14})
-    bold_format = workbook.add_format({'bold': True, 'border': 1})
-
-    # --- Lógica del Reporte ---
     df_exploded = df.explode('asignados').dropna(subset=['asignados'])
-    if df_exploded.empty:
-        worksheet.write(0, 0, "No hay datos para los filtros seleccionados.")
-        writer.close()
-        return output.getvalue()
 
-    assignees = df_exploded['asignados'].unique()
-    
-    worksheet.set_column('A:A', 25)
-    worksheet.set_column('B:B', 50)
-    worksheet.set_column('C:E', 15)
-    worksheet.set_column('G:H', 15)
-    worksheet.set_column('J:J', 35)
-
-
-    current_row = 0
-    worksheet.write(current_row, 0, "Reporte de General Actividades", title_format)
-    current_row += 2
+    def write_report(workbook, formats: FormatCache):
+        worksheet = workbook.add_worksheet('Reporte General')
+        if df_exploded.empty:
+            worksheet.write(0, 0, "No hay datos para los filtros seleccionados.")
+            return
 
-    for assignee in assignees:
-        person_df = df_exploded[df_exploded['asignados'] == assignee].copy()
-        
-        # --- 1. Tabla de Tareas por Persona ---
-        task_headers = ["Nombre", "Tarea", "fecha inicio", "fecha fin", "estado"]
-        for col_num, header in enumerate(task_headers):
-            worksheet.write(current_row, col_num, header, header_format)
-        current_row += 1
+        worksheet.set_column('A:A', 25)
+        worksheet.set_column('B:B', 50)
+        worksheet.set_column('C:E', 15)
+        worksheet.set_column('G:H', 15)
+        worksheet.set_column('J:J', 35)
+        worksheet.write(0, 0, "Reporte de General Actividades", formats.get({'bold': True, 'font_size': 14}))
 
-        for _, task in person_df.iterrows():
-            worksheet.write(current_row, 0, assignee, cell_format)
-            worksheet.write(current_row, 1, task['nombre'], cell_format)
-            worksheet.write(current_row, 2, format_date_for_display(task['fecha_inicio']), cell_format)
-            worksheet.write(current_row, 3, format_date_for_display(task['fecha_limite']), cell_format)
-            worksheet.write(current_row, 4, task['estado'], cell_format)
-            current_row += 1
-        
-        summary_start_row = current_row + 1
+        current_row = 2
+        for _, person_df in df_exploded.groupby('asignados', sort=False):
+            # --- 1. Tabla de Tareas por Persona ---
+            tasks = write_table(workbook, worksheet, formats, PERSON_TASKS, person_df, current_row)
 
-        # --- 2. Tabla de Resumen de Estado ---
-        status_summary = person_df['estado'].value_counts().reindex(['pendiente', 'progreso', 'completado'], fill_value=0)
-        worksheet.write(summary_start_row, 0, "EstadoTarea", bold_format)
-        worksheet.write(summary_start_row, 1, "Total de tareas", bold_format)
-        
-        summary_data_row = summary_start_row + 1
-        for status, count in status_summary.items():
-            worksheet.write(summary_data_row, 0, status, cell_format)
-            worksheet.write(summary_data_row, 1, count, cell_format)
-            summary_data_row += 1
-
-        # --- 3. Gráfico de Torta ---
-        chart = workbook.add_chart({'type': 'pie'})
-        chart.set_title({'name': 'Total de tareas segun estado'})
-        
-        # [sheetname, first_row, first_col, last_row, last_col]
-        chart.add_series({
-            'name':       'Total de tareas',
-            'categories': ['Reporte General', summary_start_row + 1, 0, summary_start_row + len(status_summary), 0],
-            'values':     ['Reporte General', summary_start_row + 1, 1, summary_start_row + len(status_summary), 1],
-            'points': [
-                {'fill': {'color': '#4F81BD'}}, # Azul para pendiente
-                {'fill': {'color': '#C0504D'}}, # Rojo para progreso
-                {'fill': {'color': '#9BBB59'}}, # Verde para completado
-            ],
-        })
-        
-        worksheet.insert_chart(summary_start_row, 3, chart, {'x_offset': 25, 'y_offset': 10})
+            # --- 2. Tabla de Resumen de Estado y 3. Gráfico de Torta ---
+            status_summary = person_df['estado'].value_counts().reindex(SUMMARY_STATES, fill_value=0)
+            summary_df = pd.DataFrame({'estado': SUMMARY_STATES, 'total': status_summary.to_numpy()})
+            summary = write_table(workbook, worksheet, formats, PERSON_SUMMARY, summary_df, tasks.last_row + 2)
+            insert_chart(workbook, worksheet, status_pie(summary), summary)
 
-        current_row = summary_data_row + 5 # Dejar espacio para el siguiente reporte
+            current_row = summary.last_row + 6 # Dejar espacio para el siguiente reporte
 
-    writer.close()
-    return output.getvalue()
+    return build_workbook([], extra=write_report)
 
 def render_general_activity_report(df: pd.DataFrame):
     """
@@ -110,3 +92,7 @@ def render_general_activity_report(df: pd.DataFrame):
         file_name='reporte_general_actividades.xlsx',
         mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
     )
+
+    # Exportación dividida por proyecto o persona
+    st.markdown("---")
+    render_split_export(df, 'general', key='general')
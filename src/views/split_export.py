@@ -0,0 +1,40 @@
+import streamlit as st
+import pandas as pd
+from utils import frame_signature
+
+SPLIT_LABELS = {"Proyecto": 'proyecto', "Persona": 'persona'}
+
+def render_split_export(df: pd.DataFrame, report_key: str, key: str):
+    """
+    Muestra la exportación "un libro por proyecto/persona": particiona el
+    DataFrame una vez, genera los libros en paralelo con un pool de hilos (el
+    servidor tiene varios hilos y no debe bifurcarse) y los entrega en un
+    único ZIP. Se genera solo al pulsar el botón.
+    """
+    # Importación diferida: report_jobs importa a su vez los módulos de vistas
+    from report_jobs import build_report_jobs, reports_to_zip
+
+    st.subheader("Exportar un libro por proyecto o por persona")
+    col1, col2 = st.columns([2, 1])
+    split_label = col1.selectbox("Dividir por", list(SPLIT_LABELS), key=f"{key}_split_by")
+    split_by = SPLIT_LABELS[split_label]
+
+    # El ZIP generado solo es válido para la misma división, la misma versión
+    # de los datos y el mismo conjunto de filas
+    signature = (split_by,) + frame_signature(df, st.session_state.get('dataset_version'))
+    state_key = f"{key}_split_zip"
+
+    if col2.button("Generar ZIP", key=f"{key}_split_button"):
+        jobs = build_report_jobs(df, [report_key], split_by)
+        with st.spinner(f"Generando {len(jobs)} libros..."):
+            st.session_state[state_key] = (signature, reports_to_zip(jobs, df, processes=False))
+
+    cached = st.session_state.get(state_key)
+    if cached is not None and cached[0] == signature:
+        st.download_button(
+            label=f"🗜️ Descargar ZIP por {split_label.lower()}",
+            data=cached[1],
+            file_name=f"{report_key}_por_{split_by}.zip",
+            mime='application/zip',
+            key=f"{key}_split_download"
+        )
@@ -0,0 +1,92 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from export_engine import SheetSpec, build_workbook, frame_columns
+from snapshots import SnapshotStore, completed_per_week, cycle_time_per_project, transitions, wip_per_estado
+
+def _trend_sheet(name: str, frame: pd.DataFrame):
+    columns = frame_columns(frame, width=16, date_width=16)
+    columns[0].width = 22
+    return SheetSpec(name, columns), frame
+
+def trends_to_excel(completadas: pd.Series, wip: pd.DataFrame, ciclos: pd.DataFrame) -> bytes:
+    """Genera un Excel con una hoja por métrica de tendencia."""
+    return build_workbook([
+        _trend_sheet('Completadas por Semana', completadas.rename_axis('Semana').reset_index()),
+        _trend_sheet('Tareas por Estado', wip.rename_axis('Instantánea').reset_index()),
+        _trend_sheet('Tiempo de Ciclo', ciclos),
+    ])
+
+def render_trends_view(store: SnapshotStore):
+    """
+    Renderiza las tendencias calculadas sobre el historial de instantáneas:
+    tareas completadas por semana, tareas en cada estado a lo largo del tiempo
+    y tiempo de ciclo por proyecto. Solo se leen las particiones del rango.
+    """
+    st.header("📉 Tendencias")
+
+    partitions = store.partitions()
+    if not partitions:
+        st.info(
+            "Todavía no hay historial. Las instantáneas se guardan con "
+            "`python src/snapshots.py` (p. ej. después de `Json/main.py`) o "
+            "automáticamente al actualizar los datos si se define REPORTE_HISTORIAL."
+        )
+        return
+
+    first, last = partitions[0][0].date(), partitions[-1][0].date()
+    rango = st.date_input(
+        "Rango del historial", value=(first, last), min_value=first, max_value=last, key='trends_range'
+    )
+    if len(rango) != 2:
+        st.warning("Selecciona la fecha de inicio y de fin.")
+        return
+    start, end = pd.Timestamp(rango[0]), pd.Timestamp(rango[1])
+
+    trans = transitions(store.read(start, end))
+    completadas = completed_per_week(trans, start, end)
+    wip = wip_per_estado(trans, start, end)
+    ciclos = cycle_time_per_project(trans, start, end)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Instantáneas en el rango", sum(start <= ts.normalize() <= end for ts, _, _ in partitions))
+    col2.metric("Tareas completadas", int(completadas.sum()))
+    col3.metric("Proyectos con tiempo de ciclo", len(ciclos))
+
+    st.subheader("Tareas Completadas por Semana")
+    if completadas.empty:
+        st.write("No se completaron tareas en el rango seleccionado.")
+    else:
+        fig = px.bar(x=completadas.index, y=completadas.values, labels={'x': 'Semana', 'y': 'Tareas completadas'})
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("Tareas por Estado (WIP)")
+    if wip.empty:
+        st.write("No hay instantáneas en el rango seleccionado.")
+    else:
+        fig = px.area(wip, labels={'snapshot': 'Fecha', 'value': 'Tareas', 'estado': 'Estado'})
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("Tiempo de Ciclo por Proyecto")
+    st.caption("Días desde que la tarea se observa en un estado activo hasta que pasa a completada o aprobada.")
+    if ciclos.empty:
+        st.write("No hay tareas con un ciclo completo dentro del rango.")
+    else:
+        st.dataframe(ciclos, use_container_width=True, hide_index=True)
+
+    st.markdown("---")
+    # El Excel se genera solo al pulsar el botón y se guarda en la sesión
+    # mientras no cambien el rango ni las instantáneas del historial
+    signature = (store.root, start, end, len(partitions), partitions[-1][0])
+    if st.button("📊 Preparar Tendencias en Excel", key='trends_excel_button'):
+        with st.spinner("Generando Excel de tendencias..."):
+            st.session_state.trends_excel = (signature, trends_to_excel(completadas, wip, ciclos))
+
+    cached = st.session_state.get('trends_excel')
+    if cached is not None and cached[0] == signature:
+        st.download_button(
+            label="📥 Descargar Tendencias en Excel",
+            data=cached[1],
+            file_name='tendencias.xlsx',
+            mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
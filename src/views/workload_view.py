@@ -0,0 +1,106 @@
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+from export_engine import HEADER_FORMAT, Column, ConditionalFormat, SheetSpec, build_workbook
+from gantt_prep import prepare_gantt_frame
+from schedule_analytics import workload_matrix
+
+GRANULARIDADES = {"Día": 'D', "Semana": 'W'}
+
+# Formatos de la hoja de carga de trabajo
+PERIOD_HEADER_FORMAT = dict(HEADER_FORMAT, rotation=90)
+NAME_FORMAT = {'bold': True, 'border': 1}
+LOAD_FORMAT = {'border': 1, 'align': 'center'}
+# Escala de calor: blanco (sin carga) -> amarillo -> rojo (máxima carga)
+HEAT_SCALE = {'type': '3_color_scale', 'min_color': '#FFFFFF', 'mid_color': '#FFEB84', 'max_color': '#F8696B'}
+
+def workload_spec(matrix: pd.DataFrame, granularidad: str) -> SheetSpec:
+    """
+    Hoja de la matriz de carga (personas x periodos): una columna por periodo
+    coloreada con una escala de calor nativa de Excel (formato condicional).
+    """
+    periods = [
+        Column(period.strftime('%d/%m/%y'), lambda m, period=period: m[period], 'number', 4, LOAD_FORMAT)
+        for period in matrix.columns
+    ]
+    return SheetSpec(
+        'Carga de Trabajo',
+        [Column('Persona', lambda m: m.index, width=30, cell_format=NAME_FORMAT, header_format=NAME_FORMAT)] + periods,
+        header_format=PERIOD_HEADER_FORMAT,
+        title=f"Carga de trabajo por persona ({granularidad.lower()}): tareas activas simultáneas",
+        title_width=len(periods) + 1,
+        conditional_formats=[ConditionalFormat(HEAT_SCALE, [column.header for column in periods])],
+        empty_message="No hay tareas con fechas y asignados para los filtros seleccionados.",
+        header_height=60, freeze_header=True, freeze_columns=1,
+    )
+
+def workload_to_excel(matrix: pd.DataFrame, granularidad: str) -> bytes:
+    """Genera el Excel de la matriz de carga con el motor de exportación."""
+    return build_workbook([(workload_spec(matrix, granularidad), matrix)])
+
+def render_workload_view(df: pd.DataFrame):
+    """
+    Renderiza el mapa de calor de carga de trabajo por persona a lo largo del
+    tiempo, calculado con un barrido de eventos de inicio/fin de las tareas.
+    """
+    st.header("🔥 Carga de Trabajo por Persona")
+
+    if df.empty:
+        st.warning("No hay datos disponibles para los filtros seleccionados.")
+        return
+
+    granularidad = st.radio("Granularidad", list(GRANULARIDADES), horizontal=True, key='workload_granularidad')
+
+    # Se reutiliza la misma imputación de fechas que el Gantt; solo se
+    # calculan los periodos del filtro de fechas de la barra lateral
+    frame = prepare_gantt_frame(df)
+    desde, hasta = st.session_state.get('date_range') or (None, None)
+    matrix = workload_matrix(frame, df['asignados'], GRANULARIDADES[granularidad], desde, hasta)
+
+    if matrix.empty:
+        st.warning("No hay tareas con fechas y personas asignadas para los filtros seleccionados.")
+        return
+
+    st.write(
+        "Cada celda indica cuántas tareas tiene activas la persona ese periodo "
+        "(en la vista semanal, el máximo de la semana)."
+    )
+
+    col1, col2 = st.columns(2)
+    col1.metric("Personas", len(matrix))
+    col2.metric("Máximo de tareas simultáneas", int(matrix.to_numpy().max()))
+
+    fig = go.Figure(go.Heatmap(
+        z=matrix.to_numpy(),
+        x=matrix.columns,
+        y=matrix.index,
+        colorscale='YlOrRd',
+        colorbar=dict(title='Tareas'),
+        hovertemplate='%{y}<br>%{x|%d/%m/%Y}: %{z} tareas<extra></extra>',
+    ))
+    fig.update_layout(
+        title="Tareas activas simultáneas por persona",
+        height=max(400, len(matrix) * 18 + 150),
+        yaxis=dict(autorange='reversed'),
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("---")
+    # El Excel se genera solo al pulsar el botón y se guarda en la sesión
+    # mientras no cambien la granularidad ni el contenido de la matriz
+    signature = (
+        granularidad, matrix.shape, matrix.columns[0], matrix.columns[-1],
+        int(pd.util.hash_pandas_object(matrix, index=True).sum()),
+    )
+    if st.button("📊 Preparar Carga de Trabajo en Excel", key='workload_excel_button'):
+        with st.spinner("Generando Excel de carga de trabajo..."):
+            st.session_state.workload_excel = (signature, workload_to_excel(matrix, granularidad))
+
+    cached = st.session_state.get('workload_excel')
+    if cached is not None and cached[0] == signature:
+        st.download_button(
+            label="📥 Descargar Carga de Trabajo en Excel",
+            data=cached[1],
+            file_name='carga_de_trabajo.xlsx',
+            mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
@@ -0,0 +1,95 @@
+import os
+import sys
+import json
+import time
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import uvicorn
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from api import create_app
+from dataset import load_dataset
+from filter_cache import FilterResultCache
+from processors import filter_data_hierarchically, unassigned_personnel
+from refresh import DatasetHolder
+
+DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'datos.json'))
+
+@pytest.fixture(scope='module')
+def api():
+    dataset = load_dataset(DATA_PATH)
+    holder = DatasetHolder(dataset, 'v1')
+    cache = FilterResultCache()
+    server = uvicorn.Server(uvicorn.Config(create_app(holder, cache), host='127.0.0.1', port=0, log_level='warning'))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.02)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    yield f'http://127.0.0.1:{port}', holder, cache
+    server.should_exit = True
+    thread.join()
+
+def get(url, headers=None):
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, dict(response.headers), response.read().decode('utf-8')
+    except urllib.error.HTTPError as error:
+        return error.code, dict(error.headers), error.read().decode('utf-8')
+
+def test_tasks_match_app_filters(api):
+    base, holder, _ = api
+    df = holder.get().df
+    proyecto = sorted(df['proyecto'].unique())[-1]
+    expected = filter_data_hierarchically(df, [], [proyecto], ['pendiente'], df['fecha_inicio'].min(), df['fecha_inicio'].max(), '', 'Todas')
+
+    status, _, body = get(f'{base}/api/tareas?proyecto={proyecto}&estado=pendiente&tamano=3&pagina=2')
+    page = json.loads(body)
+    assert status == 200 and page['total'] == len(expected) and page['paginas'] == -(-len(expected) // 3)
+    assert [row['id'] for row in page['filas']] == expected['id'].tolist()[3:6]
+
+    status, headers, body = get(f'{base}/api/tareas?proyecto={proyecto}&estado=pendiente', {'Accept': 'application/x-ndjson'})
+    rows = [json.loads(line) for line in body.splitlines()]
+    assert headers['content-type'] == 'application/x-ndjson'
+    assert [row['id'] for row in rows] == expected['id'].tolist()
+
+def test_kpis_and_personnel(api):
+    base, holder, _ = api
+    df = holder.get().df
+    inicio, fin = df['fecha_inicio'].min(), df['fecha_inicio'].max()
+    for query, estados in (('', []), ('?estado=completado', ['completado'])):
+        expected = filter_data_hierarchically(df, [], [], estados, inicio, fin, '', 'Todas')
+        kpis = json.loads(get(f'{base}/api/kpis{query}')[2])
+        assert kpis['total'] == len(expected)
+        assert kpis['subtareas'] == int(expected['is_subtask'].sum())
+        assert kpis['por_estado'] == {k: v for k, v in expected['estado'].value_counts().items() if v}
+
+    proyecto = sorted(df['proyecto'].unique())[-1]
+    expected = filter_data_hierarchically(df, [], [proyecto], [], inicio, fin, '', 'Todas')
+    assert json.loads(get(f'{base}/api/personal-sin-tareas?proyecto={proyecto}')[2])['personas'] == unassigned_personnel(df, expected)
+    assert get(f'{base}/api/tareas?tipo=otro')[0] == 400
+
+def test_etag_revalidation(api):
+    base, holder, _ = api
+    status, headers, _ = get(f'{base}/api/gantt?tamano=5')
+    etag = headers['etag']
+    assert status == 200 and get(f'{base}/api/gantt?tamano=5', {'If-None-Match': etag})[0] == 304
+    # Otra consulta u otra versión de los datos invalidan el ETag
+    assert get(f'{base}/api/gantt?tamano=6', {'If-None-Match': etag})[0] == 200
+    holder.swap(holder.get(), 'v2')
+    assert get(f'{base}/api/gantt?tamano=5', {'If-None-Match': etag})[0] == 200
+
+def test_concurrent_identical_queries_compute_once(api):
+    base, _, cache = api
+    misses = cache.misses
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda _: get(f'{base}/api/tareas?buscar=de&tamano=1'), range(32)))
+    assert {status for status, _, _ in results} == {200}
+    assert len({body for _, _, body in results}) == 1
+    assert cache.misses == misses + 1
@@ -0,0 +1,81 @@
+import io
+import os
+import sys
+import zipfile
+import numpy as np
+import pandas as pd
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from burndown import compute_burndown, cumulative_counts, velocity
+from views.dashboard_view import burndown_to_excel, cached_burndown
+
+def test_cumulative_counts_matches_daily_loop():
+    rng = np.random.default_rng(3)
+    keys = rng.integers(0, 4, 300)
+    days = rng.integers(-5, 40, 300)
+
+    counts = cumulative_counts(keys, days, 4, 30)
+
+    for k in range(4):
+        for d in range(30):
+            assert counts[k, d] == ((keys == k) & (days <= d)).sum()
+
+def sample_df():
+    t = pd.Timestamp
+    return pd.DataFrame([
+        {'proyecto': 'P1', 'estado': 'completado', 'fecha_inicio': t('2025-01-06'), 'fecha_limite': t('2025-01-08')},
+        {'proyecto': 'P1', 'estado': 'en progreso', 'fecha_inicio': t('2025-01-07'), 'fecha_limite': t('2025-01-20')},
+        {'proyecto': 'P1', 'estado': 'aprobado', 'fecha_inicio': pd.NaT, 'fecha_limite': t('2025-01-14')},
+        {'proyecto': 'P2', 'estado': 'completado', 'fecha_inicio': t('2025-01-13'), 'fecha_limite': pd.NaT},
+        {'proyecto': 'P2', 'estado': 'pendiente', 'fecha_inicio': pd.NaT, 'fecha_limite': pd.NaT},
+    ])
+
+def test_compute_burndown_and_velocity():
+    burndown = compute_burndown(sample_df()).set_index(['proyecto', 'fecha'])
+
+    assert burndown.loc[('P1', pd.Timestamp('2025-01-07'))].tolist() == [2, 0, 2]
+    assert burndown.loc[('P1', pd.Timestamp('2025-01-14'))].tolist() == [3, 2, 1]
+    assert burndown.loc[('P2', pd.Timestamp('2025-01-13'))].tolist() == [1, 1, 0]
+
+    weekly = velocity(burndown.reset_index())
+    assert weekly['P1'].tolist() == [1, 1]
+    assert weekly['P2'].tolist() == [0, 1]
+
+def test_burndown_day_axis_is_clipped_to_the_range():
+    df = sample_df()
+    df.loc[1, 'fecha_limite'] = pd.Timestamp('2099-12-31')
+    full = compute_burndown(df).set_index(['proyecto', 'fecha'])
+    burndown = compute_burndown(df, pd.Timestamp('2025-01-07'), pd.Timestamp('2025-01-14'))
+    # Solo los días del rango, con lo anterior acumulado en el primero
+    assert burndown['fecha'].min() == pd.Timestamp('2025-01-07')
+    assert burndown['fecha'].max() == pd.Timestamp('2025-01-14')
+    assert len(burndown) == 2 * 8
+    pd.testing.assert_frame_equal(
+        burndown.set_index(['proyecto', 'fecha']),
+        full.loc[(slice(None), slice('2025-01-07', '2025-01-14')), :],
+    )
+    assert compute_burndown(df, pd.Timestamp('2025-02-01'), pd.Timestamp('2025-01-01')).empty
+
+def test_burndown_excel_has_native_line_charts():
+    data = burndown_to_excel(compute_burndown(sample_df()))
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        charts = [name for name in zf.namelist() if name.startswith('xl/charts/chart')]
+        assert len(charts) == 2
+        assert b'<c:lineChart>' in zf.read(charts[0])
+
+def test_cached_burndown_reused_per_signature():
+    df = sample_df()
+    store = {'dataset_version': 1}
+    signature, burndown = cached_burndown(store, df)
+    # Un nuevo recorte de las mismas filas reutiliza la serie
+    assert cached_burndown(store, df.iloc[[0, 1, 2, 3, 4]])[1] is burndown
+    assert cached_burndown(store, df.iloc[[0, 1]])[0] != signature
+    store['dataset_version'] = 2
+    assert cached_burndown(store, df)[1] is not burndown
+    # Otro rango de fechas es otra serie
+    burndown = cached_burndown(store, df)[1]
+    store['date_range'] = (pd.Timestamp('2025-01-07').date(), pd.Timestamp('2025-01-10').date())
+    signature, clipped = cached_burndown(store, df)
+    assert clipped is not burndown and clipped['fecha'].nunique() == 4
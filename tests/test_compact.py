@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from compact import CompactTasks
+from data_loader import load_and_normalize_json, normalize_tasks
+from dataset import Dataset
+
+DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'datos.json'))
+
+def test_round_trip_preserves_values():
+    df = load_and_normalize_json(DATA_PATH)
+    compact = CompactTasks.from_frame(df)
+    decoded = compact.to_frame()
+
+    assert list(decoded.columns) == list(df.columns)
+    assert isinstance(decoded['estado'].dtype, pd.CategoricalDtype)
+    for col in df.columns:
+        assert decoded[col].astype(object).where(decoded[col].notna(), None).tolist() == \
+            df[col].astype(object).where(df[col].notna(), None).tolist(), col
+
+def test_keys_and_csr_assignees():
+    df = pd.DataFrame([
+        {'id': 't1', 'nombre': 'A', 'estado': 'pendiente', 'asignados': ['Ana', 'Luis'], 'fecha_inicio': pd.NaT,
+         'fecha_limite': pd.NaT, 'prioridad': None, 'area': 'X', 'proyecto': 'P', 'parent_id': None, 'is_subtask': False},
+        {'id': 'sub_t9_0', 'nombre': 'B', 'estado': 'pendiente', 'asignados': [], 'fecha_inicio': pd.NaT,
+         'fecha_limite': pd.NaT, 'prioridad': None, 'area': 'X', 'proyecto': 'P', 'parent_id': 't9', 'is_subtask': True},
+        {'id': 't2', 'nombre': 'C', 'estado': 'completado', 'asignados': ['Luis'], 'fecha_inicio': pd.NaT,
+         'fecha_limite': pd.NaT, 'prioridad': 'high', 'area': 'X', 'proyecto': 'P', 'parent_id': None, 'is_subtask': False},
+    ])
+    compact = CompactTasks.from_frame(df)
+
+    assert compact.arrays['asignados_offsets'].tolist() == [0, 2, 2, 3]
+    assert compact.personas.tolist() == ['Ana', 'Luis']
+    assert compact.asignados([2, 0]) == [['Luis'], ['Ana', 'Luis']]
+    # El padre inexistente conserva su id a través del diccionario común de claves
+    assert compact.column('parent_id').tolist() == [None, 't9', None]
+
+    exploded = compact.explode_asignados([0, 2])
+    assert exploded['fila'].tolist() == [0, 0, 2]
+    assert exploded['persona'].astype(str).tolist() == ['Ana', 'Luis', 'Luis']
+
+def test_null_assignees_keep_offsets_in_sync():
+    df = pd.DataFrame([
+        {'id': 't1', 'nombre': 'A', 'estado': 'pendiente', 'asignados': [None, 'Ana'], 'fecha_inicio': pd.NaT,
+         'fecha_limite': pd.NaT, 'prioridad': None, 'area': 'X', 'proyecto': 'P', 'parent_id': None, 'is_subtask': False},
+        {'id': 't2', 'nombre': 'B', 'estado': 'pendiente', 'asignados': ['Bob'], 'fecha_inicio': pd.NaT,
+         'fecha_limite': pd.NaT, 'prioridad': None, 'area': 'X', 'proyecto': 'P', 'parent_id': None, 'is_subtask': False},
+    ])
+    compact = CompactTasks.from_frame(df)
+
+    # El usuario nulo se omite sin desplazar los asignados de las tareas siguientes
+    assert compact.arrays['asignados_offsets'].tolist() == [0, 1, 2]
+    assert compact.asignados() == [['Ana'], ['Bob']]
+    exploded = compact.explode_asignados()
+    assert exploded['fila'].tolist() == [0, 1]
+    assert exploded['persona'].astype(str).tolist() == ['Ana', 'Bob']
+
+def test_store_does_not_keep_the_source_frame_alive():
+    df = load_and_normalize_json(DATA_PATH)
+    compact = CompactTasks.from_frame(df)
+
+    # Los nombres se guardan en un búfer propio, no como vista del DataFrame original
+    assert compact.arrays['nombre_texto'].flags.owndata
+
+    # Las tareas con los mismos asignados comparten la lista decodificada
+    asignados = compact.asignados()
+    por_contenido = {}
+    for lista in asignados:
+        assert por_contenido.setdefault(tuple(lista), lista) is lista
+
+def test_dataset_keeps_the_compact_store_instead_of_a_second_copy():
+    # Registros como los produce json.loads: un objeto de texto por valor y fila
+    tasks = [{
+        'id': f'tarea{i}', 'nombre': f'Tarea {i}', 'estado': ''.join(['pendiente'][:1]),
+        'asignados': [f'Persona {i % 7}', f'Persona {i % 3}'], 'fecha_inicio': f'{1 + i % 28:02d}/01/25',
+        'fecha_limite': None, 'prioridad': f'{"normal"}', 'area': f'Área {i % 4}', 'proyecto': f'Proyecto {i % 40}',
+        'parent_id': None, 'is_subtask': False,
+    } for i in range(20000)]
+    df, _ = normalize_tasks(tasks)
+    dataset = Dataset(df)
+
+    # Fechas, tipo, códigos de categoría y nombres son vistas sobre los arreglos compactos
+    for col in ('fecha_inicio', 'is_subtask'):
+        assert np.shares_memory(dataset.df[col].to_numpy(), dataset.compact.arrays[col]), col
+    assert np.shares_memory(dataset.df['estado'].array.codes, dataset.compact.arrays['estado'])
+    nombres = dataset.df['nombre'].array.__arrow_array__().chunk(0)
+    assert nombres.buffers()[2].address == dataset.compact.arrays['nombre_texto'].ctypes.data
+    assert dataset.df['nombre'].iloc[5] == 'Tarea 5'
+
+    # Conjunto completo (compacto + DataFrame) muy por debajo del DataFrame del
+    # cargador; el resto lo ocupan sobre todo los textos de los ids (todos distintos)
+    loader_bytes = int(df.memory_usage(deep=True, index=False).sum())
+    id_bytes = int(dataset.compact.dictionaries['id'].memory_usage(deep=True))
+    assert dataset.nbytes() < loader_bytes * 0.6
+    assert dataset.nbytes() - id_bytes < (loader_bytes - id_bytes) / 2.5
+    assert Dataset(None).empty
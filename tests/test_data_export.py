@@ -0,0 +1,48 @@
+import io
+import os
+import sys
+import gzip
+import pandas as pd
+import pyarrow as pa
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from data_export import export_data, to_csv_gz
+from export_engine import spec_frame
+from views.detailed_report_view import DETAILED_SHEET
+
+def sample_df():
+    return pd.DataFrame({
+        'id': ['1', '2', '3'],
+        'parent_id': [None, '1', None],
+        'nombre': ['Padre', 'Hija', 'Otra'],
+        'proyecto': ['P1', 'P1', 'P2'],
+        'estado': ['pendiente', 'completado', 'pendiente'],
+        'asignados': [['Ana', 'Luis'], [], None],
+        'fecha_inicio': pd.to_datetime(['2025-01-06', None, '2025-02-01']),
+        'fecha_limite': pd.to_datetime(['2025-01-10', '2025-01-08', None]),
+        'prioridad': ['alta', None, 'normal'],
+    })
+
+def test_spec_frame_uses_sheet_headers_and_types():
+    frame = spec_frame(DETAILED_SHEET, sample_df())
+    assert list(frame.columns) == [column.header for column in DETAILED_SHEET.columns]
+    assert frame['Tipo'].tolist() == ['Tarea', 'Subtarea', 'Tarea']
+    assert frame['Tarea Padre'].tolist() == ['', 'Padre', '']
+    assert frame['Asignados'].tolist() == ['Ana, Luis', '', '']
+    assert pd.api.types.is_datetime64_any_dtype(frame['Fecha inic.'])
+
+def test_formats_round_trip():
+    frame = spec_frame(DETAILED_SHEET, sample_df())
+    from_parquet = pd.read_parquet(io.BytesIO(export_data(frame, 'parquet')))
+    from_arrow = pa.ipc.open_file(export_data(frame, 'arrow')).read_pandas()
+    from_csv = pd.read_csv(io.BytesIO(gzip.decompress(export_data(frame, 'csv'))), parse_dates=['Fecha inic.', 'Fecha límite'])
+    for result in (from_parquet, from_arrow):
+        pd.testing.assert_frame_equal(result, frame, check_dtype=False)
+    assert from_csv['Fecha inic.'].tolist()[0] == pd.Timestamp('2025-01-06')
+    assert from_csv['Prioridad'].isna().tolist() == [False, True, False]
+
+def test_csv_chunks_match_single_write():
+    frame = pd.DataFrame({'a': range(25), 'b': [f'x{i}' for i in range(25)]})
+    assert gzip.decompress(to_csv_gz(frame, chunk_rows=7)).decode() == frame.to_csv(index=False)
@@ -7,7 +7,7 @@ import sys
 # Añadir el directorio raíz del proyecto al sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.data_loader import load_and_normalize_json
+from src.data_loader import load_and_normalize_json, parse_and_correct_date, parse_dates_vectorized
 
 @pytest.fixture
 def sample_json_data():
@@ -81,3 +81,50 @@ def test_load_and_normalize_json(temp_json_file):
     # 5. Verificar que 'asignados' es una lista
     assert isinstance(df['asignados'].iloc[0], list)
     assert isinstance(df['asignados'].iloc[1], list)
+
+
+def test_load_and_normalize_json_reports_issues(tmp_path):
+    data = {
+        "Area1": {
+            "Proyecto1": {
+                "Tareas": {
+                    "pendiente": [
+                        {"id": "t1", "nombre": "Fecha rota", "estado": "pendiente", "asignados": "User A",
+                         "fecha_inicio": "31/02/25", "fecha_limite": "01/03/25", "prioridad": None, "subtareas": []},
+                        {"id": "t1", "nombre": "Duplicada", "estado": "pendiente", "asignados": [],
+                         "fecha_inicio": "10/03/25", "fecha_limite": "01/03/25", "prioridad": None, "subtareas": []},
+                        {"id": "t3", "nombre": "Usuario nulo", "estado": "pendiente", "asignados": [None, "User B"],
+                         "fecha_inicio": "01/03/25", "fecha_limite": "10/03/25", "prioridad": None, "subtareas": []},
+                    ]
+                }
+            }
+        }
+    }
+    file_path = tmp_path / "issues.json"
+    file_path.write_text(json.dumps(data), encoding='utf-8')
+
+    df, issues = load_and_normalize_json(str(file_path), with_issues=True)
+
+    # La normalización sigue corrigiendo los valores en silencio
+    assert pd.isna(df['fecha_inicio'].iloc[0])
+    assert df['asignados'].iloc[0] == []
+
+    found = set(zip(issues['fila'], issues['regla']))
+    assert found == {
+        (0, 'fecha_invalida'),
+        (0, 'asignados_no_lista'),
+        (0, 'id_duplicado'),
+        (1, 'id_duplicado'),
+        (1, 'fecha_limite_anterior'),
+        (2, 'asignado_nulo'),
+    }
+
+
+def test_parse_dates_vectorized_matches_parse_and_correct_date():
+    values = pd.Series([
+        '01/01/25', '1/2/25', '15/03/2025', '31/02/25', '01/01/25 ', '01/01/ 25', '01/01/25\n',
+        ' 01/01/25', '01 /01/25', '١/١/25', '001/01/25', '1/1/125', '1/1/1500', '1/1/99999', '1/1/99999999999999999999',
+        '2025-01-01', '', None, 25,
+    ], dtype=object)
+    expected = values.map(parse_and_correct_date)
+    pd.testing.assert_series_equal(parse_dates_vectorized(values), expected, check_names=False, check_dtype=False)
@@ -0,0 +1,54 @@
+import os
+import sys
+import pandas as pd
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from views.detailed_report_view import format_page, table_options, table_positions
+
+def sample_df():
+    return pd.DataFrame({
+        'nombre': ['b', 'a', 'c', 'd'],
+        'is_subtask': [False, True, False, True],
+        'estado': ['pendiente', 'completado', 'pendiente', 'en curso'],
+        'proyecto': ['P1', 'P1', 'P2', 'P2'],
+        'asignados': [['Ana'], ['Luis', 'Ana'], [], None],
+        'fecha_inicio': pd.to_datetime(['2025-01-06', None, '2025-02-01', '2025-01-01']),
+        'fecha_limite': pd.to_datetime(['2025-03-01', '2025-01-08', None, '2025-02-01']),
+        'prioridad': ['alta', None, 'normal', 'alta'],
+    }, index=[10, 11, 12, 13])
+
+def test_sort_on_typed_columns_keeps_nulls_last():
+    df = sample_df()
+    assert table_positions(df).tolist() == [0, 1, 2, 3]
+    assert table_positions(df, 'fecha_limite').tolist() == [1, 3, 0, 2]
+    assert table_positions(df, 'fecha_limite', ascending=False).tolist() == [0, 3, 1, 2]
+    assert table_positions(df, 'tipo').tolist() == [0, 2, 1, 3]
+
+def test_column_filters():
+    df = sample_df()
+    assert table_positions(df, 'nombre', prioridades=['alta']).tolist() == [0, 3]
+    assert table_positions(df, 'nombre', personas=['Ana']).tolist() == [1, 0]
+    assert table_positions(df, None, prioridades=['alta'], personas=['Luis']).tolist() == []
+
+def test_format_page_only_formats_given_rows():
+    df = sample_df()
+    page = format_page(df.iloc[table_positions(df, 'nombre')[:2]])
+    assert page['nombre'].tolist() == ['a', 'b']
+    assert page['tipo'].tolist() == ['Subtarea', 'Tarea']
+    assert page['asignados'].tolist() == ['Luis, Ana', 'Ana']
+    assert page['fecha_inicio'].tolist() == ['N/A', '06/01/2025']
+
+def test_table_options_reused_per_frame():
+    df = sample_df()
+    store = {'dataset_version': 1}
+    options = table_options(store, df)
+    assert options == (['alta', 'normal'], ['Ana', 'Luis'])
+    # La app recorta un DataFrame nuevo en cada ejecución: mismas filas, misma firma
+    assert table_options(store, df.iloc[[0, 1, 2, 3]]) is options
+    reduced = table_options(store, df.iloc[[0, 2]])
+    assert reduced == (['alta', 'normal'], ['Ana'])
+    # Una nueva versión de los datos invalida las opciones aunque el índice coincida
+    store['dataset_version'] = 2
+    assert table_options(store, df.iloc[[0, 2]]) is not reduced
@@ -0,0 +1,85 @@
+import io
+import base64
+import os
+import sys
+import zipfile
+import openpyxl
+import pandas as pd
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from export_engine import Chart, Column, ConditionalFormat, Image, SheetSpec, build_workbook, frame_columns
+
+def sample_df():
+    return pd.DataFrame({
+        'nombre': ['Tarea A', None, 'Tarea C'],
+        'horas': [1.5, float('nan'), 3],
+        'inicio': pd.to_datetime(['2025-01-06', None, '2025-02-01']),
+        'estado': pd.Categorical(['pendiente', 'completado', 'pendiente']),
+    })
+
+def test_sheet_spec_writes_typed_columns_and_native_table():
+    spec = SheetSpec('Datos', [
+        Column('Nombre', 'nombre', width=30),
+        Column('Horas', 'horas', kind='number'),
+        Column('Inicio', 'inicio', kind='date'),
+        Column('Estado', 'estado', cell_format={'border': 1}),
+        Column('Doble', lambda df: df['horas'] * 2, kind='number'),
+    ], native_table=True, notes=lambda df: [f'Total: {len(df)}'])
+
+    wb = openpyxl.load_workbook(io.BytesIO(build_workbook([(spec, sample_df())])))
+    ws = wb['Datos']
+    rows = [[cell.value for cell in row] for row in ws.iter_rows(max_row=4)]
+    assert rows[0] == ['Nombre', 'Horas', 'Inicio', 'Estado', 'Doble']
+    assert rows[1][:2] == ['Tarea A', 1.5] and rows[1][2] == pd.Timestamp('2025-01-06')
+    assert rows[2][:3] == [None, None, None] and rows[2][3] == 'completado'
+    assert ws['C2'].number_format == 'dd/mm/yyyy'
+    assert ws.tables['Table1'].ref == 'A1:E4'
+    assert ws['A7'].value == 'Total: 3'
+    assert ws.column_dimensions['A'].width > 29
+
+def test_charts_reference_columns_by_header():
+    df = sample_df()
+    def chart(placement):
+        return Chart({'type': 'bar'}, [{'name': 'Horas', 'categories': 'nombre', 'values': 'horas'}], anchor='H2')
+    spec = SheetSpec('Gráfico', frame_columns(df), title='Título', subtitle=lambda df: f'{len(df)} filas', charts=[chart])
+
+    data = build_workbook([(spec, df)])
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        xml = zf.read('xl/charts/chart1.xml').decode()
+    # Título y subtítulo ocupan las filas 1-2; la tabla empieza en la fila 4
+    assert 'Gráfico!$A$5:$A$7' in xml and 'Gráfico!$B$5:$B$7' in xml
+
+def test_empty_message():
+    spec = SheetSpec('Sin Datos', [], empty_message='No hay datos')
+    wb = openpyxl.load_workbook(io.BytesIO(build_workbook([(spec, pd.DataFrame())])))
+    assert wb['Sin Datos']['A1'].value == 'No hay datos'
+
+def test_conditional_format_covers_the_data_rows_of_the_columns():
+    spec = SheetSpec('Calor', frame_columns(sample_df()), title='Título', conditional_formats=[
+        ConditionalFormat({'type': '3_color_scale'}, ['horas']),
+        ConditionalFormat({'type': 'data_bar'}),
+    ])
+    wb = openpyxl.load_workbook(io.BytesIO(build_workbook([(spec, sample_df())])))
+    ranges = sorted(str(rule.sqref) for rule in wb['Calor'].conditional_formatting)
+    # Título en la fila 1 y encabezados en la 3: los datos ocupan las filas 4-6
+    assert ranges == ['A4:D6', 'B4:B6']
+
+def test_images_with_titles():
+    png = base64.b64decode(
+        'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8DwHwAFBQIAX8jx0gAAAABJRU5ErkJggg=='
+    )
+    spec = SheetSpec('Imágenes', [], images=[
+        Image(png, (0, 0), 'Primero', {'bold': True}), Image(png, (30, 0), 'Segundo'),
+    ])
+    data = build_workbook([(spec, pd.DataFrame())])
+    wb = openpyxl.load_workbook(io.BytesIO(data))
+    ws = wb['Imágenes']
+    assert ws['A1'].value == 'Primero' and ws['A1'].font.bold
+    assert ws['A31'].value == 'Segundo'
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        drawing = zf.read('xl/drawings/drawing1.xml').decode()
+    # Cada imagen va en la fila siguiente a su título (filas 2 y 32, base 0: 1 y 31)
+    assert drawing.count('<xdr:pic>') == 2
+    assert '<xdr:row>1</xdr:row>' in drawing and '<xdr:row>31</xdr:row>' in drawing
@@ -0,0 +1,46 @@
+import os
+import shutil
+import sys
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import federation
+from data_loader import load_and_normalize_json
+from dataset import load_dataset
+
+DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'datos.json'))
+
+def make_spaces(tmp_path):
+    spaces = tmp_path / 'espacios'
+    spaces.mkdir()
+    shutil.copy(DATA_PATH, spaces / 'sistemas.json')
+    shutil.copy(DATA_PATH, spaces / 'administracion.json')
+    (spaces / 'notas.txt').write_text('no es una exportación', encoding='utf-8')
+    return spaces
+
+def test_federated_load_adds_space_and_reuses_cache(tmp_path, monkeypatch):
+    spaces = make_spaces(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    single = load_and_normalize_json(DATA_PATH)
+
+    df, issues = federation.load_federated(str(spaces), with_issues=True, cache_dir=cache_dir, max_workers=2)
+    assert len(df) == 2 * len(single)
+    assert df['space'].unique().tolist() == ['administracion', 'sistemas']
+    # Los mismos ids en dos espacios se detectan al validar la tabla unida
+    assert (issues['regla'] == 'id_duplicado').sum() >= len(single['id'].dropna())
+
+    # Segunda carga: ningún archivo se vuelve a parsear
+    def fail(path):
+        raise AssertionError(f"se volvió a parsear {path}")
+    monkeypatch.setattr(federation, 'read_tasks', fail)
+    cached = federation.load_federated(str(spaces / '*.json'), cache_dir=cache_dir)
+    assert cached.equals(df)
+
+def test_dataset_keeps_space_column(tmp_path, monkeypatch):
+    spaces = make_spaces(tmp_path)
+    monkeypatch.setattr(federation, 'CACHE_DIR', str(tmp_path / 'cache'))
+
+    dataset = load_dataset(str(spaces))
+    assert dataset.df['space'].astype(str).value_counts().to_dict() == {'administracion': 100, 'sistemas': 100}
+    assert dataset.df.loc[0, 'asignados'] == load_and_normalize_json(DATA_PATH).loc[0, 'asignados']
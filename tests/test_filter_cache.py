@@ -0,0 +1,41 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+from urllib.parse import parse_qs
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from filter_cache import FilterResultCache, filter_key, filter_params, filters_from_params
+
+def test_equivalent_filters_share_key_and_round_trip():
+    inicio, fin = pd.Timestamp('2025-01-01'), pd.Timestamp('2025-01-31')
+    a = (['Sistemas'], ['P2', 'P1', 'P1'], [], inicio, fin, '', 'Todas')
+    b = (['Sistemas'], ['P1', 'P2'], None, inicio, fin, None, 'Todas')
+    assert filter_key(a) == filter_key(b) == 'area=Sistemas&proyecto=P1&proyecto=P2&desde=2025-01-01&hasta=2025-01-31'
+    assert filter_key(a) != filter_key((['Sistemas'], ['P1'], [], inicio, fin, '', 'Solo Tareas'))
+
+    state = filters_from_params(parse_qs(filter_key((['A y B'], [], ['pendiente'], inicio, fin, 'diseño', 'Solo Subtareas'))))
+    assert state == {
+        'selected_areas': ['A y B'], 'selected_estados': ['pendiente'], 'search_term': 'diseño',
+        'task_type_filter': 'Solo Subtareas', 'date_range': (inicio, fin),
+    }
+    assert filter_params(([], [], [], pd.NaT, pd.NaT, '', 'Todas')) == {}
+    assert filters_from_params({'tipo': ['otro'], 'desde': ['no-es-fecha'], 'hasta': ['2025-01-01']}) == {}
+
+def test_cache_is_lru_per_data_version():
+    cache = FilterResultCache(size=2)
+    calls = []
+    def compute(value):
+        return lambda: calls.append(value) or np.array([value])
+
+    assert cache.positions(1, 'a', compute(1)).tolist() == [1]
+    assert cache.positions(1, 'a', compute(99)).tolist() == [1]
+    assert not cache.positions(1, 'a', compute(99)).flags.writeable
+    cache.positions(2, 'a', compute(2))
+    cache.positions(1, 'b', compute(3))
+    # (1, 'a') fue la menos usada y salió de la memoria
+    assert cache.positions(1, 'a', compute(4)).tolist() == [4]
+    assert calls == [1, 2, 3, 4]
+    assert (cache.hits, cache.misses) == (2, 4)
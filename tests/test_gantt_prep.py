@@ -0,0 +1,55 @@
+import pytest
+import pandas as pd
+import os
+import sys
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from gantt_prep import prepare_gantt_frame, cached_gantt_frame
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame([
+        {'id': 't1', 'parent_id': None, 'is_subtask': False, 'nombre': 'Tarea 1', 'proyecto': 'P1',
+         'fecha_inicio': pd.Timestamp('2025-01-10'), 'fecha_limite': pd.Timestamp('2025-01-20')},
+        {'id': 'sub_t1_0', 'parent_id': 't1', 'is_subtask': True, 'nombre': 'Sub 1', 'proyecto': 'P1',
+         'fecha_inicio': pd.NaT, 'fecha_limite': pd.Timestamp('2025-01-12')},
+        {'id': 't2', 'parent_id': None, 'is_subtask': False, 'nombre': 'Tarea 2', 'proyecto': 'P1',
+         'fecha_inicio': pd.Timestamp('2025-01-01'), 'fecha_limite': pd.NaT},
+        {'id': 't3', 'parent_id': None, 'is_subtask': False, 'nombre': 'Sin fechas', 'proyecto': 'P2',
+         'fecha_inicio': pd.NaT, 'fecha_limite': pd.NaT},
+    ])
+
+def test_prepare_gantt_frame_imputes_and_orders(sample_df):
+    frame = prepare_gantt_frame(sample_df)
+
+    # La tarea sin fechas se descarta; las fechas faltantes se derivan con un día
+    assert frame['id'].tolist() == ['t2', 't1', 'sub_t1_0']
+    assert frame.set_index('id').loc['t2', 'fecha_limite'] == pd.Timestamp('2025-01-02')
+    assert frame.set_index('id').loc['sub_t1_0', 'fecha_inicio'] == pd.Timestamp('2025-01-11')
+
+    assert frame['inicio_dias'].tolist() == [0, 9, 10]
+    assert frame['duracion'].tolist() == [2, 11, 2]
+    assert frame['tipo'].astype(str).tolist() == ['Tarea', 'Tarea', 'Subtarea']
+    assert frame['task_label'].tolist() == ['P1 - Tarea 2', 'P1 - Tarea 1', '  - Sub 1']
+    assert frame['tarea_display'].tolist() == ['Tarea 2', 'Tarea 1', '  - Sub 1']
+
+def test_prepare_gantt_frame_without_subtasks(sample_df):
+    frame = prepare_gantt_frame(sample_df, include_subtasks=False)
+    assert not frame['is_subtask'].any()
+
+def test_cached_gantt_frame_reuses_result(sample_df):
+    store = {}
+    first = cached_gantt_frame(store, sample_df, ['P1'], True)
+    assert cached_gantt_frame(store, sample_df, ['P1'], True) is first
+    assert cached_gantt_frame(store, sample_df, ['P1'], False) is not first
+
+def test_prepare_gantt_frame_clips_inverted_dates():
+    df = pd.DataFrame([
+        {'id': 't1', 'parent_id': None, 'is_subtask': False, 'nombre': 'Invertida', 'proyecto': 'P1',
+         'fecha_inicio': pd.Timestamp('2025-01-10'), 'fecha_limite': pd.Timestamp('2025-01-02')},
+    ])
+    frame = prepare_gantt_frame(df)
+    assert frame['fecha_limite'].tolist() == [pd.Timestamp('2025-01-10')]
+    assert frame['duracion'].tolist() == [1]
@@ -0,0 +1,108 @@
+import os
+import sys
+import threading
+import time
+import plotly.graph_objects as go
+import pytest
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from image_export import ImageRendererPool
+
+class FakeScope:
+    """Sustituto de PlotlyScope: devuelve el título y registra la concurrencia."""
+    active = 0
+    max_active = 0
+    calls = 0
+    lock = threading.Lock()
+
+    def transform(self, figure, format=None, width=None, height=None, scale=None):
+        with FakeScope.lock:
+            FakeScope.calls += 1
+            FakeScope.active += 1
+            FakeScope.max_active = max(FakeScope.max_active, FakeScope.active)
+        time.sleep(0.05)
+        with FakeScope.lock:
+            FakeScope.active -= 1
+        return f"{figure['layout']['title']['text']}-{format}".encode()
+
+def figure(title):
+    return go.Figure(go.Bar(x=[1, 2], y=[3, 4]), layout={'title': {'text': title}})
+
+def test_batch_renders_concurrently_and_memoizes():
+    FakeScope.calls = FakeScope.max_active = 0
+    pool = ImageRendererPool(size=3, scope_factory=FakeScope)
+    try:
+        figs = [figure('a'), figure('b'), figure('c'), figure('a')]
+        assert pool.render_many(figs) == [b'a-png', b'b-png', b'c-png', b'a-png']
+        # Las figuras idénticas del lote se renderizan una sola vez
+        assert FakeScope.calls == 3
+        assert FakeScope.max_active > 1
+        assert len(pool._scopes) <= 3
+
+        # Volver a exportar sin cambios no llama al renderizador
+        assert pool.render(figure('b')) == b'b-png'
+        assert FakeScope.calls == 3 and pool.hits == 1
+
+        # Otras opciones de exportación son otra entrada de la memoria
+        assert pool.render(figure('b'), format='svg') == b'b-svg'
+        assert FakeScope.calls == 4
+    finally:
+        pool.close()
+
+def test_cache_is_bounded():
+    pool = ImageRendererPool(size=1, cache_size=2, scope_factory=FakeScope)
+    try:
+        pool.render_many([figure('a'), figure('b'), figure('c')])
+        assert len(pool._cache) == 2
+    finally:
+        pool.close()
+
+def test_kaleido_renders_png():
+    pytest.importorskip('kaleido')
+    pool = ImageRendererPool(size=1)
+    try:
+        image = pool.render(figure('kaleido'), width=200, height=150)
+    except Exception as exc:  # Sin Chromium utilizable en el entorno
+        pytest.skip(f"Kaleido no disponible: {exc}")
+    finally:
+        pool.close()
+    assert image.startswith(b'\x89PNG')
+
+def test_pool_is_warmed_in_background_when_created(monkeypatch):
+    import image_export
+    FakeScope.calls = 0
+    monkeypatch.setattr(image_export, 'configure_kaleido', lambda: None)
+    monkeypatch.setattr(image_export, 'ImageRendererPool', lambda: ImageRendererPool(size=2, scope_factory=FakeScope))
+    monkeypatch.setattr(image_export.atexit, 'register', lambda function: None)
+    monkeypatch.setattr(image_export, '_pool', None)
+    pool = image_export.get_image_pool()
+    try:
+        assert image_export.get_image_pool() is pool
+        pool.warming.join(timeout=5)
+        # Un renderizado por proceso del grupo, sin esperar a la primera exportación
+        assert FakeScope.calls == 2 and len(pool._scopes) == 2
+        assert pool.warm_error is None
+    finally:
+        pool.close()
+
+def test_warm_failure_is_recorded():
+    def broken():
+        raise RuntimeError("sin Chromium")
+    pool = ImageRendererPool(size=1, scope_factory=broken)
+    try:
+        pool.start_warming().join(timeout=5)
+        assert isinstance(pool.warm_error, RuntimeError)
+    finally:
+        pool.close()
+
+def test_close_releases_renderers():
+    import gc
+    import weakref
+    pool = ImageRendererPool(size=1, scope_factory=FakeScope)
+    pool.render(figure('a'))
+    scope = weakref.ref(pool._scopes[0])
+    pool.close()
+    gc.collect()
+    assert scope() is None
@@ -0,0 +1,130 @@
+import json
+import os
+import sys
+import time
+import pandas as pd
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import incremental
+from dataset import load_dataset
+from incremental import IncrementalLoader, project_spans
+from refresh import FileSource
+
+DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'datos.json'))
+
+def as_records(df):
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+def test_reload_renormalizes_only_changed_projects(tmp_path):
+    path = str(tmp_path / 'datos.json')
+    with open(DATA_PATH, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+    loader = IncrementalLoader(path)
+    first = loader.load()
+    assert loader.changed == [(area, proyecto) for area, proyectos in data.items() for proyecto in proyectos]
+    assert loader.load() is first
+
+    # Modificar una tarea y eliminar otro proyecto
+    area = next(iter(data))
+    proyectos = list(data[area])
+    lista = next(iter(data[area][proyectos[0]].values()))
+    tarea = next(iter(lista.values()))[0]
+    tarea['nombre'] = 'Tarea renombrada'
+    tarea['fecha_inicio'] = '99/99/99'
+    del data[area][proyectos[1]]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+    updated = loader.load()
+    assert loader.changed == [(area, proyectos[0])]
+
+    expected = load_dataset(path)
+    assert as_records(updated.df) == as_records(expected.df)
+    pd.testing.assert_frame_equal(updated.issues, expected.issues)
+    assert 'Tarea renombrada' in set(updated.df['nombre'])
+
+def write_like_clickup(path, data):
+    # Mismo formato que Json/main.py (guardar_estructura)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+def test_project_spans_follow_the_clickup_layout(tmp_path):
+    with open(DATA_PATH, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    data['Área vacía'] = {'Sin tareas': {}, 'Nulo': None}
+    path = tmp_path / 'datos.json'
+    write_like_clickup(path, data)
+    content = path.read_bytes()
+
+    spans = project_spans(content)
+    assert [key for key, _, _ in spans] == [(a, p) for a, proyectos in data.items() for p in proyectos]
+    for (area, proyecto), start, end in spans:
+        assert json.loads(content[start:end]) == data[area][proyecto]
+    # Otro formato (sin sangría o con otra) se parsea completo
+    assert project_spans(json.dumps(data).encode('utf-8')) is None
+    assert project_spans(json.dumps(data, indent=2).encode('utf-8')) is None
+
+def test_reload_only_touches_changed_projects(tmp_path, monkeypatch):
+    path = str(tmp_path / 'datos.json')
+    with open(DATA_PATH, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    write_like_clickup(path, data)
+    loader = IncrementalLoader(path)
+    loader.load()
+
+    # Registrar qué proyectos se parsean, codifican, agregan y validan en la recarga
+    touched = []
+    def spy(name, function):
+        def wrapper(df, *args):
+            touched.append((name, set(df['proyecto'].astype(str))))
+            return function(df, *args)
+        return wrapper
+    monkeypatch.setattr(incremental.RollupCube, 'from_dataframe', spy('cubo', incremental.RollupCube.from_dataframe))
+    monkeypatch.setattr(incremental.OptionsIndex, 'summarize', spy('opciones', incremental.OptionsIndex.summarize))
+    monkeypatch.setattr(incremental.CompactTasks, 'from_frame', spy('compacto', incremental.CompactTasks.from_frame))
+    monkeypatch.setattr(incremental, 'row_issues', spy('calidad', incremental.row_issues))
+    parsed = []
+    loads = json.loads
+    monkeypatch.setattr(incremental.json, 'loads', lambda text, **kw: parsed.append(len(text.encode('utf-8'))) or loads(text, **kw))
+
+    area = next(iter(data))
+    proyecto = next(iter(data[area]))
+    lista = next(iter(data[area][proyecto].values()))
+    tarea = next(iter(lista.values()))[0]
+    tarea['nombre'] = 'Tarea renombrada'
+    tarea['fecha_limite'] = '01/01/20'
+    write_like_clickup(path, data)
+    updated = loader.load()
+
+    assert loader.changed == [(area, proyecto)]
+    assert {name for name, _ in touched} == {'cubo', 'opciones', 'compacto', 'calidad'}
+    assert all(proyectos == {proyecto} for _, proyectos in touched)
+    # Solo se decodifican el esqueleto y el proyecto modificado, no el archivo completo
+    monkeypatch.undo()
+    with open(path, 'rb') as f:
+        span = next(end - start for key, start, end in project_spans(f.read()) if key == (area, proyecto))
+    assert len(parsed) == 2 and max(parsed) == span and min(parsed) < span
+
+    expected = load_dataset(path)
+    assert as_records(updated.df) == as_records(expected.df)
+    pd.testing.assert_frame_equal(updated.issues, expected.issues)
+    for dimension in ('estado', 'proyecto', 'prioridad'):
+        assert updated.cube.counts_by(dimension).to_dict() == expected.cube.counts_by(dimension).to_dict()
+    assert updated.options.projects() == expected.options.projects()
+    assert updated.options.date_bounds([proyecto]) == expected.options.date_bounds([proyecto])
+
+def test_file_source_debounces_changes(tmp_path):
+    path = tmp_path / 'datos.json'
+    path.write_text('{}', encoding='utf-8')
+    source = FileSource(str(path), debounce=0.2)
+    initial = source.version()
+
+    path.write_text('{"Área": {}}', encoding='utf-8')
+    assert source.version() == initial
+    time.sleep(0.25)
+    assert source.version() != initial
@@ -0,0 +1,34 @@
+import os
+import sys
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from dataset import load_dataset
+from processors import DataManager
+
+DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'datos.json'))
+
+def test_options_match_data_manager():
+    dataset = load_dataset(DATA_PATH)
+    df, options = dataset.df, dataset.options
+    manager = DataManager(df)
+    assert options.areas == manager.get_unique_values('area')
+    assert options.projects() == manager.get_unique_values('proyecto')
+    assert options.estados_for() == manager.get_unique_values('estado')
+    assert options.date_bounds() == (df['fecha_inicio'].min(), df['fecha_inicio'].max())
+
+    for area in options.areas:
+        assert options.projects([area]) == manager.filter_by_area([area]).get_unique_values('proyecto')
+    assert options.projects(options.areas[:2]) == manager.filter_by_area(options.areas[:2]).get_unique_values('proyecto')
+
+    proyectos = sorted(options.date_bounds_by_project)[:2]
+    subset = manager.filter_by_project(proyectos).get_data()
+    assert options.estados_for(proyectos) == manager.filter_by_project(proyectos).get_unique_values('estado')
+    assert options.date_bounds(proyectos) == (subset['fecha_inicio'].min(), subset['fecha_inicio'].max())
+    # Proyectos sin fechas de inicio: se usan los límites de todo el conjunto
+    sin_fechas = [p for p in options.projects() if p not in options.date_bounds_by_project]
+    if sin_fechas:
+        assert options.date_bounds(sin_fechas[:1]) == options.date_bounds()
+    # La segunda consulta se resuelve desde la memoria
+    assert options.estados_for(list(reversed(proyectos))) is options.estados_for(proyectos)
@@ -0,0 +1,65 @@
+import os
+import re
+import sys
+import pandas as pd
+import pytest
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+pytest.importorskip('fpdf')
+
+from pdf_report import ReportPDF, build_pdf_report, crosstab_widths
+from report_jobs import build_report_jobs, run_report_jobs
+
+def tasks(n):
+    inicio = pd.Timestamp('2025-01-06') + pd.to_timedelta(pd.RangeIndex(n) % 60, unit='D')
+    return pd.DataFrame({
+        'id': [f't{i}' for i in range(n)],
+        'parent_id': [None] * n,
+        'nombre': [f'Tarea número {i} con un nombre bastante largo para recortar en la tabla' for i in range(n)],
+        'estado': ['pendiente', 'en progreso', 'completado', 'aprobado'] * (n // 4),
+        'asignados': [['Ana'], ['Luis', 'Ana'], [], ['Marta']] * (n // 4),
+        'fecha_inicio': inicio,
+        'fecha_limite': inicio + pd.Timedelta(days=5),
+        'prioridad': ['high', 'normal', None, 'urgent'] * (n // 4),
+        'proyecto': [f'P{i % 7}' for i in range(n)],
+        'is_subtask': [False] * n,
+    })
+
+def page_count(pdf: bytes) -> int:
+    return len(re.findall(rb'/Type /Page\b', pdf))
+
+def test_pdf_report_paginates_gantt_and_tables():
+    small = build_pdf_report(tasks(8))
+    large = build_pdf_report(tasks(400))
+
+    assert small.startswith(b'%PDF')
+    assert page_count(small) == 3
+    # Gantt paginado y tablas por persona que continúan en páginas nuevas
+    assert page_count(large) > 20
+
+def test_pdf_sections_and_report_jobs():
+    df = tasks(8)
+    assert page_count(build_pdf_report(df, ['gantt'])) == 1
+    with pytest.raises(ValueError):
+        build_pdf_report(df, ['desconocida'])
+
+    jobs = build_report_jobs(df, ['pdf'], 'proyecto')
+    assert jobs[0][1] == 'reporte_actividades_P0.pdf'
+    filename, data = next(run_report_jobs(jobs[:1], df))
+    assert data.startswith(b'%PDF')
+
+def test_crosstab_widths_fit_the_page():
+    epw = ReportPDF().epw
+    assert crosstab_widths(epw, 4) == [90.0] + [28.0] * 5
+    for n_estados in (8, 12, 20):
+        widths = crosstab_widths(epw, n_estados)
+        assert len(widths) == n_estados + 2
+        assert sum(widths) <= epw + 1e-6
+        assert widths[0] >= 60.0 - 1e-6
+
+    # Un reporte con muchos estados se genera sin errores
+    df = tasks(32)
+    df['estado'] = [f"estado {i % 12}" for i in range(len(df))]
+    assert build_pdf_report(df, ['dashboard']).startswith(b'%PDF')
@@ -0,0 +1,116 @@
+import importlib.util
+import json
+import os
+import shutil
+import sys
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from dataset import load_dataset
+import refresh
+from refresh import ClickUpSource, DatasetHolder, FileSource, RefreshWorker, CLICKUP_SCRIPT, open_source
+
+DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'datos.json'))
+
+def test_worker_swaps_dataset_when_file_changes(tmp_path):
+    path = str(tmp_path / 'datos.json')
+    shutil.copy(DATA_PATH, path)
+    source = FileSource(path)
+    holder = DatasetHolder(load_dataset(path), source.version())
+    worker = RefreshWorker(source, holder)
+    previous = holder.get()
+
+    assert worker.run_once() is False
+    assert holder.get() is previous
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    espacio = next(iter(data))
+    data = {espacio: {k: v for k, v in list(data[espacio].items())[:1]}}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+    assert worker.run_once() is True
+    assert holder.version == 2
+    assert len(holder.get().df) < len(previous.df)
+
+def test_failed_refresh_keeps_current_dataset(tmp_path):
+    path = str(tmp_path / 'datos.json')
+    shutil.copy(DATA_PATH, path)
+    holder = DatasetHolder(load_dataset(path))
+
+    def fetch():
+        raise ConnectionError("sin conexión")
+
+    worker = RefreshWorker(ClickUpSource(path, fetch, save=None), holder)
+    previous = holder.get()
+    assert worker.run_once(force=True) is False
+    assert holder.get() is previous
+    assert "sin conexión" in worker.last_error
+
+class FakeResponse:
+    ok = True
+    def __init__(self, payload):
+        self.payload = payload
+    def json(self):
+        return self.payload
+
+class FakeSession:
+    """Simula la API de ClickUp respondiendo según el final de la URL."""
+    def __init__(self):
+        self.urls = []
+    def get(self, url, headers=None):
+        self.urls.append(url)
+        if url.endswith('/folder'):
+            return FakeResponse({'folders': [{'id': 'f1', 'name': 'Carpeta'}]})
+        if url.endswith('/list'):
+            return FakeResponse({'lists': [{'id': 'l1', 'name': 'Proyecto'}]})
+        return FakeResponse({'tasks': [
+            {'id': 't1', 'name': 'Tarea', 'status': {'status': 'Pendiente'}, 'assignees': [{'username': 'Ana'}],
+             'start_date': None, 'due_date': None, 'priority': None},
+            {'id': 't2', 'name': 'Sub', 'parent': 't1', 'status': {'status': 'Completado'}, 'assignees': []},
+        ]})
+
+def test_clickup_source_with_mock_endpoint(tmp_path):
+    spec = importlib.util.spec_from_file_location('clickup_main', CLICKUP_SCRIPT)
+    clickup = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(clickup)
+    session = FakeSession()
+    path = str(tmp_path / 'datos.json')
+
+    source = ClickUpSource(
+        path,
+        fetch=lambda: clickup.construir_estructura('s1', api_base='http://mock/api', session=session),
+        save=clickup.guardar_estructura,
+    )
+    df = source.load().df
+
+    assert session.urls[0] == 'http://mock/api/space/s1/folder'
+    assert df['nombre'].tolist() == ['Tarea', 'Sub']
+    assert df['parent_id'].tolist() == [None, 't1']
+    assert df['estado'].tolist() == ['pendiente', 'completado']
+
+def test_open_source_reads_the_version_before_loading(monkeypatch):
+    class ChangingSource:
+        """Fuente cuyos datos cambian mientras se cargan."""
+        def __init__(self):
+            self.current = 1
+            self.loads = 0
+
+        def version(self):
+            return self.current
+
+        def load(self):
+            self.loads += 1
+            dataset = load_dataset(DATA_PATH)
+            self.current += 1  # Se escribe una versión nueva durante la carga
+            return dataset
+
+    source = ChangingSource()
+    monkeypatch.setattr(refresh, 'data_source', lambda path, debounce: source)
+    opened, holder = open_source(DATA_PATH)
+    assert opened is source and holder.source_version == 1
+    # La versión escrita durante la primera carga no se da por cargada
+    assert RefreshWorker(source, holder).run_once() is True
+    assert source.loads == 2
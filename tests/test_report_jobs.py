@@ -0,0 +1,82 @@
+import io
+import os
+import sys
+import zipfile
+import pandas as pd
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from report_jobs import split_frame, build_report, build_report_jobs, reports_to_zip
+import report_cli
+
+DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'datos.json'))
+
+def sample_df():
+    return pd.DataFrame([
+        {'id': 't1', 'proyecto': 'P1', 'asignados': ['Ana', 'Luis']},
+        {'id': 't2', 'proyecto': 'P2', 'asignados': ['Ana']},
+        {'id': 't3', 'proyecto': 'P2', 'asignados': []},
+    ])
+
+def test_split_frame_by_person_repeats_shared_tasks():
+    parts = {label: part['id'].tolist() for label, part in split_frame(sample_df(), 'persona')}
+    assert parts == {'Ana': ['t1', 't2'], 'Luis': ['t1']}
+
+def test_build_report_jobs_names_files_per_partition():
+    jobs = build_report_jobs(sample_df(), ['detallado', 'general'], 'proyecto')
+    assert [filename for _, filename, _ in jobs] == [
+        'reporte_detallado_tareas_P1.xlsx', 'reporte_general_actividades_P1.xlsx',
+        'reporte_detallado_tareas_P2.xlsx', 'reporte_general_actividades_P2.xlsx',
+    ]
+
+def test_build_report_jobs_makes_colliding_names_unique():
+    df = pd.DataFrame([
+        {'id': 't1', 'proyecto': 'Obra/Norte', 'asignados': []},
+        {'id': 't2', 'proyecto': 'Obra Norte', 'asignados': []},
+        {'id': 't3', 'proyecto': 'obra norte', 'asignados': []},
+    ])
+    jobs = build_report_jobs(df, ['general'], 'proyecto')
+    assert [filename for _, filename, _ in jobs] == [
+        'reporte_general_actividades_Obra_Norte.xlsx',
+        'reporte_general_actividades_Obra_Norte_2.xlsx',
+        'reporte_general_actividades_obra_norte_3.xlsx',
+    ]
+
+def test_cli_generates_workbooks(tmp_path):
+    out = tmp_path / 'reportes'
+    assert report_cli.main(['--data', DATA_PATH, '--out', str(out), '--split', 'proyecto', '--workers', '2']) == 0
+
+    files = sorted(os.listdir(out))
+    assert len(files) == 4 * 5
+    # Cada archivo es un libro xlsx válido (un zip)
+    assert all(zipfile.is_zipfile(out / name) for name in files)
+
+def test_reports_to_zip_contains_one_workbook_per_person():
+    df = report_cli.load_tasks(DATA_PATH)
+    jobs = build_report_jobs(df, ['general'], 'persona')
+
+    with zipfile.ZipFile(io.BytesIO(reports_to_zip(jobs, df, max_workers=2))) as zf:
+        names = zf.namelist()
+    assert len(names) == df['asignados'].explode().dropna().nunique()
+    assert all(name.startswith('reporte_general_actividades_') for name in names)
+
+def test_app_zip_uses_threads_without_pickling(monkeypatch):
+    import report_jobs
+    df = report_cli.load_tasks(DATA_PATH)
+    jobs = build_report_jobs(df, ['general'], 'proyecto')
+
+    def no_processes(*args, **kwargs):
+        raise AssertionError("la aplicación no debe crear procesos")
+    monkeypatch.setattr(report_jobs, 'ProcessPoolExecutor', no_processes)
+    monkeypatch.setattr(pd.DataFrame, '__reduce_ex__', lambda self, protocol: no_processes())
+    with zipfile.ZipFile(io.BytesIO(reports_to_zip(jobs, df, max_workers=2, processes=False))) as zf:
+        names = zf.namelist()
+    assert sorted(names) == sorted(filename for _, filename, _ in jobs)
+
+def test_workload_report_without_tasks_is_a_valid_workbook():
+    df = report_cli.load_tasks(DATA_PATH)
+    empty = df.iloc[:0]
+    content = build_report('carga', empty, df)
+    with zipfile.ZipFile(io.BytesIO(content)) as zf:
+        assert 'xl/workbook.xml' in zf.namelist()
@@ -0,0 +1,56 @@
+import pytest
+import pandas as pd
+import os
+import sys
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from rollup import RollupCube
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame([
+        {'id': 't1', 'parent_id': None, 'is_subtask': False, 'area': 'A', 'proyecto': 'P1',
+         'estado': 'pendiente', 'prioridad': 'normal', 'fecha_inicio': pd.Timestamp('2025-01-10')},
+        {'id': 'sub_t1_0', 'parent_id': 't1', 'is_subtask': True, 'area': 'A', 'proyecto': 'P1',
+         'estado': 'completado', 'prioridad': None, 'fecha_inicio': pd.NaT},
+        {'id': 't2', 'parent_id': None, 'is_subtask': False, 'area': 'A', 'proyecto': 'P2',
+         'estado': 'completado', 'prioridad': 'high', 'fecha_inicio': pd.Timestamp('2025-02-01')},
+        {'id': 't3', 'parent_id': None, 'is_subtask': False, 'area': 'A', 'proyecto': 'P2',
+         'estado': 'pendiente', 'prioridad': 'high', 'fecha_inicio': pd.NaT},
+    ])
+
+def test_counts_by_matches_value_counts(sample_df):
+    cube = RollupCube.from_dataframe(sample_df)
+
+    assert cube.total() == len(sample_df)
+    assert cube.counts_by('estado').to_dict() == sample_df['estado'].value_counts().to_dict()
+    assert cube.counts_by('prioridad').to_dict() == sample_df['prioridad'].value_counts().to_dict()
+    assert cube.slice(proyectos=['P2']).total() == 2
+
+def test_for_filters_full_range_keeps_dated_families(sample_df):
+    cube = RollupCube.from_dataframe(sample_df)
+    start, end = sample_df['fecha_inicio'].min(), sample_df['fecha_inicio'].max()
+
+    # t3 no tiene fecha y su familia no tiene miembros con fecha: queda excluida
+    todas = cube.for_filters([], [], [], start, end, '', 'Todas')
+    assert todas.total() == 3
+    assert cube.for_filters([], [], [], start, end, '', 'Solo Subtareas').total() == 1
+
+def test_for_filters_returns_none_when_not_expressible(sample_df):
+    cube = RollupCube.from_dataframe(sample_df)
+    start, end = sample_df['fecha_inicio'].min(), sample_df['fecha_inicio'].max()
+
+    assert cube.for_filters([], [], ['pendiente'], start, end, '', 'Todas') is None
+    assert cube.for_filters([], [], [], start, end, 'tarea', 'Todas') is None
+    assert cube.for_filters([], [], [], start + pd.Timedelta(days=1), end, '', 'Todas') is None
+
+def test_for_filters_uses_the_selection_date_bounds(sample_df):
+    cube = RollupCube.from_dataframe(sample_df)
+    p2 = pd.Timestamp('2025-02-01')
+
+    # El rango completo de P2 (el que ofrece la barra lateral) es más corto que el global
+    assert cube.for_filters([], ['P2'], [], p2, p2, '', 'Todas').total() == 1
+    assert cube.for_filters(['A'], [], [], p2, p2, '', 'Todas') is None
+    assert cube.for_filters([], ['P2'], [], p2 + pd.Timedelta(days=1), p2, '', 'Todas') is None
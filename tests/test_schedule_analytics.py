@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from gantt_prep import prepare_gantt_frame
+import io
+import openpyxl
+from views.workload_view import workload_to_excel
+from schedule_analytics import concurrency_segments, analyze_schedule, cached_analysis, workload_matrix
+
+def test_concurrency_segments_matches_daily_expansion():
+    rng = np.random.default_rng(7)
+    keys = rng.integers(0, 5, 200)
+    starts = rng.integers(0, 60, 200)
+    ends = starts + rng.integers(1, 15, 200)
+
+    segments = concurrency_segments(keys, starts, ends)
+
+    expected = np.zeros((5, 80), dtype=int)
+    for k, s, e in zip(keys, starts, ends):
+        expected[k, s:e] += 1
+    actual = np.zeros_like(expected)
+    for seg in segments.itertuples():
+        actual[seg.key, seg.inicio:seg.fin] = seg.activos
+    assert (actual == expected).all()
+
+def test_analyze_schedule():
+    df = pd.DataFrame([
+        {'id': 't1', 'parent_id': None, 'is_subtask': False, 'nombre': 'Tarea 1', 'proyecto': 'P1',
+         'asignados': ['Ana', 'Luis'], 'fecha_inicio': pd.Timestamp('2025-01-01'), 'fecha_limite': pd.Timestamp('2025-01-10')},
+        {'id': 'sub_t1_0', 'parent_id': 't1', 'is_subtask': True, 'nombre': 'Sub 1', 'proyecto': 'P1',
+         'asignados': ['Ana'], 'fecha_inicio': pd.Timestamp('2025-01-08'), 'fecha_limite': pd.Timestamp('2025-01-15')},
+        {'id': 't2', 'parent_id': None, 'is_subtask': False, 'nombre': 'Tarea 2', 'proyecto': 'P2',
+         'asignados': ['Luis'], 'fecha_inicio': pd.Timestamp('2025-02-01'), 'fecha_limite': pd.Timestamp('2025-02-03')},
+    ])
+    analytics = analyze_schedule(prepare_gantt_frame(df), df)
+
+    spans = analytics['Duración por Proyecto'].set_index('Proyecto')
+    assert spans.loc['P1', 'Duración (días)'] == 15
+    assert spans.loc['P1', 'Tarea que define el fin'] == 'Sub 1'
+
+    overlaps = analytics['Sobrecarga por Persona']
+    assert overlaps['Persona'].tolist() == ['Ana']
+    assert overlaps.loc[0, 'Desde'] == pd.Timestamp('2025-01-08')
+    assert overlaps.loc[0, 'Hasta'] == pd.Timestamp('2025-01-10')
+    assert overlaps.loc[0, 'Días'] == 3
+
+    violations = analytics['Inconsistencias de Fechas']
+    assert violations['Regla'].tolist() == ['Termina después que la tarea padre']
+
+def test_workload_matrix_daily_and_weekly():
+    df = pd.DataFrame([
+        {'id': 't1', 'parent_id': None, 'is_subtask': False, 'nombre': 'Tarea 1', 'proyecto': 'P1',
+         'asignados': ['Ana'], 'fecha_inicio': pd.Timestamp('2025-01-06'), 'fecha_limite': pd.Timestamp('2025-01-08')},
+        {'id': 't2', 'parent_id': None, 'is_subtask': False, 'nombre': 'Tarea 2', 'proyecto': 'P1',
+         'asignados': ['Ana', 'Luis'], 'fecha_inicio': pd.Timestamp('2025-01-08'), 'fecha_limite': pd.Timestamp('2025-01-14')},
+    ])
+    frame = prepare_gantt_frame(df)
+
+    daily = workload_matrix(frame, df['asignados'])
+    assert daily.index.tolist() == ['Ana', 'Luis']
+    assert daily.loc['Ana'].tolist() == [1, 1, 2, 1, 1, 1, 1, 1, 1]
+    assert daily.loc['Luis'].tolist() == [0, 0, 1, 1, 1, 1, 1, 1, 1]
+
+    weekly = workload_matrix(frame, df['asignados'], freq='W')
+    assert weekly.columns.tolist() == [pd.Timestamp('2025-01-06'), pd.Timestamp('2025-01-13')]
+    assert weekly.loc['Ana'].tolist() == [2, 1]
+
+def test_inverted_intervals_do_not_reduce_concurrency():
+    keys = np.array([0, 0, 0])
+    starts = np.array([0, 2, 5])
+    ends = np.array([10, 8, 1])  # la tercera está invertida
+    segments = concurrency_segments(keys, starts, ends)
+    assert segments['activos'].min() >= 1
+    assert segments[['inicio', 'fin', 'activos']].values.tolist() == [[0, 2, 1], [2, 8, 2], [8, 10, 1]]
+
+    df = pd.DataFrame([
+        {'id': 't1', 'parent_id': None, 'is_subtask': False, 'nombre': 'Tarea 1', 'proyecto': 'P1',
+         'asignados': ['Ana'], 'fecha_inicio': pd.Timestamp('2025-01-01'), 'fecha_limite': pd.Timestamp('2025-01-10')},
+        {'id': 't2', 'parent_id': None, 'is_subtask': False, 'nombre': 'Invertida', 'proyecto': 'P1',
+         'asignados': ['Ana'], 'fecha_inicio': pd.Timestamp('2025-01-05'), 'fecha_limite': pd.Timestamp('2025-01-02')},
+    ])
+    overlaps = analyze_schedule(prepare_gantt_frame(df), df)['Sobrecarga por Persona']
+    assert overlaps[['Desde', 'Hasta', 'Máx. tareas simultáneas']].values.tolist() == [
+        [pd.Timestamp('2025-01-05'), pd.Timestamp('2025-01-05'), 2]
+    ]
+
+def test_workload_matrix_with_inverted_dates():
+    # La tarea invertida empieza después de que termine todo lo demás: sin acotarla,
+    # su evento de fin caía antes del primer día y bincount fallaba
+    df = pd.DataFrame([
+        {'id': 't1', 'parent_id': None, 'is_subtask': False, 'nombre': 'Tarea 1', 'proyecto': 'P1',
+         'asignados': ['Ana'], 'fecha_inicio': pd.Timestamp('2025-01-06'), 'fecha_limite': pd.Timestamp('2025-01-08')},
+        {'id': 't2', 'parent_id': None, 'is_subtask': False, 'nombre': 'Invertida', 'proyecto': 'P1',
+         'asignados': ['Ana', 'Luis'], 'fecha_inicio': pd.Timestamp('2025-01-07'), 'fecha_limite': pd.Timestamp('2025-01-01')},
+    ])
+    daily = workload_matrix(df, df['asignados'])
+    assert daily.loc['Ana'].tolist() == [1, 2, 1]
+    assert daily.loc['Luis'].tolist() == [0, 1, 0]
+    assert (daily.to_numpy() >= 0).all()
+
+def test_workload_matrix_only_allocates_the_window():
+    df = pd.DataFrame([
+        {'id': 't1', 'parent_id': None, 'is_subtask': False, 'nombre': 'Tarea 1', 'proyecto': 'P1',
+         'asignados': ['Ana'], 'fecha_inicio': pd.Timestamp('2025-01-06'), 'fecha_limite': pd.Timestamp('2099-12-31')},
+        {'id': 't2', 'parent_id': None, 'is_subtask': False, 'nombre': 'Tarea 2', 'proyecto': 'P1',
+         'asignados': ['Luis'], 'fecha_inicio': pd.Timestamp('2025-01-08'), 'fecha_limite': pd.Timestamp('2025-01-09')},
+    ])
+    daily = workload_matrix(df, df['asignados'], desde=pd.Timestamp('2025-01-07'), hasta=pd.Timestamp('2025-01-10'))
+    assert daily.columns.tolist() == list(pd.date_range('2025-01-07', '2025-01-10'))
+    assert daily.loc['Ana'].tolist() == [1, 1, 1, 1]
+    assert daily.loc['Luis'].tolist() == [0, 1, 1, 0]
+
+    # Semanas que comienzan el lunes, aunque la ventana empiece a mitad de semana
+    weekly = workload_matrix(df, df['asignados'], freq='W', desde=pd.Timestamp('2025-01-08'), hasta=pd.Timestamp('2025-01-20'))
+    assert weekly.columns.tolist() == [pd.Timestamp('2025-01-06'), pd.Timestamp('2025-01-13'), pd.Timestamp('2025-01-20')]
+    assert weekly.loc['Luis'].tolist() == [1, 0, 0]
+    assert workload_matrix(df, df['asignados'], desde=pd.Timestamp('2025-02-01'), hasta=pd.Timestamp('2025-01-01')).empty
+
+def test_cached_analysis_reused_per_frame():
+    df = pd.DataFrame([
+        {'id': 't1', 'parent_id': None, 'is_subtask': False, 'nombre': 'Tarea 1', 'proyecto': 'P1',
+         'asignados': ['Ana'], 'fecha_inicio': pd.Timestamp('2025-01-01'), 'fecha_limite': pd.Timestamp('2025-01-10')},
+    ])
+    frame = prepare_gantt_frame(df)
+    store = {}
+    analytics = cached_analysis(store, frame, df)
+    assert cached_analysis(store, frame, df) is analytics
+    assert cached_analysis(store, prepare_gantt_frame(df), df) is not analytics
+
+def test_workload_excel_uses_heat_scale():
+    periods = pd.date_range('2025-01-06', periods=3, freq='D')
+    matrix = pd.DataFrame([[1, 2, 0], [0, 3, 1]], index=['Ana', 'Luis'], columns=periods)
+    wb = openpyxl.load_workbook(io.BytesIO(workload_to_excel(matrix, 'Día')))
+    ws = wb['Carga de Trabajo']
+    assert [cell.value for cell in ws[3]] == ['Persona', '06/01/25', '07/01/25', '08/01/25']
+    assert [cell.value for cell in ws[5]] == ['Luis', 0, 3, 1]
+    assert ws['B3'].alignment.textRotation == 90
+    assert [str(rule.sqref) for rule in ws.conditional_formatting] == ['B4:D5']
+    assert ws.freeze_panes == 'B4'
+
+def test_workload_excel_empty():
+    wb = openpyxl.load_workbook(io.BytesIO(workload_to_excel(pd.DataFrame(), 'Semana')))
+    assert wb['Carga de Trabajo']['A1'].value.startswith("No hay tareas")
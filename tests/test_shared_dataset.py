@@ -0,0 +1,71 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from dataset import Dataset, load_dataset
+from options_index import OptionsIndex
+from rollup import RollupCube
+from shared_dataset import SharedSource, attach, current_version, decode_texts, encode_texts, publish
+
+DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'datos.json'))
+
+def test_texts_round_trip():
+    values = ['Diseño', None, '', 'ñandú 🚀', 'x']
+    assert decode_texts(*encode_texts(values)).tolist() == values
+
+def test_publish_and_attach(tmp_path):
+    root = str(tmp_path)
+    source = SharedSource(root)
+    assert source.version() is None and source.load().empty
+
+    dataset = load_dataset(DATA_PATH)
+    first = publish(dataset, root)
+    shared = attach(root)
+    pd.testing.assert_frame_equal(shared.df, dataset.df)
+    assert shared.issues['regla'].tolist() == dataset.issues['regla'].tolist()
+    assert shared.options.projects() == dataset.options.projects()
+    # Las columnas tipadas del DataFrame son vistas sobre los archivos mapeados
+    fechas = shared.df['fecha_inicio'].to_numpy()
+    assert np.shares_memory(fechas, shared.compact.arrays['fecha_inicio'])
+    assert isinstance(shared.compact.arrays['fecha_inicio'].base, np.memmap)
+
+    # El mismo contenido no publica una versión nueva
+    assert publish(load_dataset(DATA_PATH), root) == first
+    assert [name for name in os.listdir(root) if name.startswith('v-')] == [first]
+
+    second = publish(Dataset(dataset.df.iloc[1:]), root)
+    third = publish(Dataset(dataset.df.iloc[2:]), root)
+    assert current_version(root) == source.version() == third
+    # Se conservan la versión vigente y la anterior
+    assert sorted(name for name in os.listdir(root) if name.startswith('v-')) == [second, third]
+    assert first not in os.listdir(root)
+
+def test_attach_reads_the_published_indexes(tmp_path, monkeypatch):
+    root = str(tmp_path)
+    dataset = load_dataset(DATA_PATH)
+    publish(dataset, root)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("la réplica no debe recalcular los índices")
+    monkeypatch.setattr(RollupCube, 'from_dataframe', fail)
+    monkeypatch.setattr(OptionsIndex, 'summarize', fail)
+    shared = attach(root)
+    pd.testing.assert_frame_equal(shared.cube.cells, dataset.cube.cells)
+    pd.testing.assert_frame_equal(shared.options.summary, dataset.options.summary)
+    # Los nombres de las tareas son texto de Arrow sobre el búfer mapeado, sin decodificar
+    nombres = shared.df['nombre'].array
+    assert isinstance(nombres, pd.arrays.ArrowStringArray)
+    assert isinstance(shared.compact.arrays['nombre_texto'].base, np.memmap)
+
+def test_attach_opens_the_published_database(tmp_path):
+    root = str(tmp_path)
+    dataset = load_dataset(DATA_PATH)
+    publish(dataset, root, engine='sqlite')
+    shared = attach(root, engine='sqlite')
+    assert shared.backend is not None and shared.backend.engine == 'sqlite'
+    positions = shared.backend.filter_positions([], [], [], None, None, '', 'Todas')
+    assert len(positions) == len(dataset.df)
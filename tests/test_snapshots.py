@@ -0,0 +1,62 @@
+import os
+import sys
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from snapshots import SnapshotStore, completed_per_week, cycle_time_per_project, transitions, wip_per_estado
+
+def tasks(estados):
+    return pd.DataFrame([
+        {'id': task_id, 'nombre': task_id, 'estado': estado, 'asignados': ['Ana'], 'fecha_inicio': pd.NaT,
+         'fecha_limite': pd.NaT, 'prioridad': None, 'area': 'A', 'proyecto': 'P1' if task_id != 't3' else 'P2',
+         'parent_id': None, 'is_subtask': False}
+        for task_id, estado in estados.items()
+    ])
+
+def test_append_writes_deltas_and_keyframes(tmp_path):
+    store = SnapshotStore(str(tmp_path), keyframe_days=7)
+
+    first = store.append(tasks({'t1': 'pendiente', 't2': 'en progreso', 't3': 'pendiente'}), '2025-01-06 08:00')
+    assert first['clave'] and first['altas'] == 3
+    assert store.append(tasks({'t1': 'pendiente', 't2': 'en progreso', 't3': 'pendiente'}), '2025-01-07 08:00')['archivo'] is None
+
+    delta = store.append(tasks({'t1': 'en progreso', 't2': 'completado', 't3': 'pendiente'}), '2025-01-08 08:00')
+    assert not delta['clave'] and delta['cambios'] == 2
+    assert len(pd.read_parquet(delta['archivo'])) == 2
+
+    store.append(tasks({'t1': 'completado', 't2': 'completado'}), '2025-01-13 08:00')
+    store.append(tasks({'t1': 'aprobado', 't2': 'completado'}), '2025-01-14 08:00')
+
+    assert [tipo for _, tipo, _ in store.partitions()] == ['clave', 'delta', 'clave', 'delta']
+    # Un rango posterior a la segunda clave solo lee desde esa clave
+    assert [os.path.basename(p) for p in store.files_for_range('2025-01-14', '2025-01-14')] == ['clave-080000.parquet', 'delta-080000.parquet']
+
+def _append_same_version(root):
+    return SnapshotStore(root).append(tasks({'t1': 'pendiente', 't2': 'en progreso'}))['archivo']
+
+def test_concurrent_appends_write_one_snapshot(tmp_path):
+    # Varios procesos publican la misma versión a la vez: solo uno la escribe
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        written = [path for path in executor.map(_append_same_version, [str(tmp_path)] * 8) if path]
+    assert len(written) == 1
+    assert len(SnapshotStore(str(tmp_path)).partitions()) == 1
+
+def test_trend_metrics(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.append(tasks({'t1': 'pendiente', 't2': 'en progreso', 't3': 'pendiente'}), '2025-01-06 08:00')
+    store.append(tasks({'t1': 'en progreso', 't2': 'completado', 't3': 'pendiente'}), '2025-01-08 08:00')
+    store.append(tasks({'t1': 'completado', 't2': 'completado'}), '2025-01-14 08:00')
+
+    trans = transitions(store.read())
+    assert completed_per_week(trans).tolist() == [1, 1]
+
+    wip = wip_per_estado(trans)
+    assert wip.loc[pd.Timestamp('2025-01-14 08:00')].to_dict() == {'completado': 2, 'en progreso': 0, 'pendiente': 0}
+    assert wip_per_estado(trans, start='2025-01-10').iloc[0].to_dict() == {'completado': 1, 'en progreso': 1, 'pendiente': 1}
+
+    ciclos = cycle_time_per_project(trans).set_index('Proyecto')
+    assert ciclos.loc['P1', 'Tareas'] == 2
+    assert ciclos.loc['P1', 'Ciclo medio (días)'] == 4.0
@@ -0,0 +1,91 @@
+import gc
+import os
+import sys
+import pandas as pd
+import pytest
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from data_loader import load_and_normalize_json
+from dataset import Dataset
+from processors import filter_data_hierarchically
+from sql_backend import SqlBackend, available_engines, dataset_database
+from startup import import_times
+
+DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'datos.json'))
+
+@pytest.fixture(scope='module', params=available_engines())
+def loaded(request):
+    df = load_and_normalize_json(DATA_PATH)
+    return df, SqlBackend.from_dataframe(df, engine=request.param)
+
+def filter_cases(df):
+    min_date, max_date = df['fecha_inicio'].min(), df['fecha_inicio'].max()
+    mid_date = min_date + (max_date - min_date) / 2
+    area = df['area'].iloc[0]
+    proyectos = sorted(df['proyecto'].unique())[:2]
+    return [
+        ([], [], [], min_date, max_date, '', 'Todas'),
+        ([area], proyectos, [], min_date, max_date, '', 'Solo Tareas'),
+        ([], [], ['pendiente'], min_date, max_date, '', 'Solo Subtareas'),
+        ([], [], [], min_date, mid_date, '', 'Todas'),
+        ([], [], ['completado', 'en progreso'], mid_date, max_date, 'de', 'Todas'),
+        ([], [], [], pd.NaT, pd.NaT, 'DISEÑO', 'Todas'),
+        # Lookbehind: sintaxis de re que RE2 (DuckDB, Arrow) no admite
+        ([], [], [], pd.NaT, pd.NaT, r'(?<=de )\w', 'Todas'),
+    ]
+
+def test_filters_match_pandas(loaded):
+    df, backend = loaded
+    for filtros in filter_cases(df):
+        expected = filter_data_hierarchically(df, *filtros)
+        assert backend.filter_positions(*filtros).tolist() == expected.index.tolist(), filtros
+
+        cube = backend.summary_cube(*filtros)
+        assert cube.total() == len(expected)
+        assert cube.counts_by('estado').to_dict() == expected['estado'].value_counts().to_dict()
+
+def test_search_matches_on_arrow_names(loaded):
+    df, backend = loaded
+    # En el Dataset los nombres son texto de Arrow: la búsqueda sigue usando re
+    compact_df = Dataset(df).df
+    assert isinstance(compact_df['nombre'].array, pd.arrays.ArrowStringArray)
+    filtros = ([], [], [], pd.NaT, pd.NaT, r'(?<=de )\w', 'Todas')
+    expected = filter_data_hierarchically(df, *filtros)
+    assert len(expected)
+    assert filter_data_hierarchically(compact_df, *filtros).index.tolist() == expected.index.tolist()
+    assert backend.filter_positions(*filtros).tolist() == expected.index.tolist()
+
+def test_unique_values_match_data_manager(loaded):
+    df, backend = loaded
+    area = df['area'].iloc[0]
+    assert backend.unique_values('estado') == sorted(df['estado'].dropna().unique())
+    assert backend.unique_values('proyecto', [area]) == sorted(df.loc[df['area'] == area, 'proyecto'].dropna().unique())
+
+@pytest.mark.parametrize('engine', available_engines())
+def test_file_database_is_private_to_each_dataset_version(tmp_path, engine):
+    df = load_and_normalize_json(DATA_PATH)
+    todas = ([], [], [], pd.NaT, pd.NaT, '', 'Todas')
+    database = str(tmp_path / 'reporte.db')
+
+    anterior = SqlBackend.from_dataframe(df, dataset_database(database), engine, temporary=True)
+    # Una versión nueva (aquí, más pequeña) no toca la tabla que usa la anterior
+    nueva_database = dataset_database(database)
+    nueva = SqlBackend.from_dataframe(df.iloc[:10], nueva_database, engine, temporary=True)
+    assert len(anterior.filter_positions(*todas)) == len(df)
+    assert len(nueva.filter_positions(*todas)) == 10
+
+    # Los conteos se memorizan por filtros; el archivo se borra al liberar el motor
+    assert anterior.summary_cube(*todas) is anterior.summary_cube(*todas)
+    del anterior
+    gc.collect()
+    # Solo quedan la base de la versión nueva y sus archivos auxiliares (p. ej. el WAL de DuckDB)
+    assert os.listdir(tmp_path) and all(
+        str(tmp_path / name).startswith(nueva_database) for name in os.listdir(tmp_path)
+    )
+    nueva.close()
+    assert os.listdir(tmp_path) == []
+
+def test_duckdb_is_imported_only_by_the_engine():
+    assert 'duckdb' not in [name for name, _, _ in import_times('sql_backend')]
@@ -0,0 +1,27 @@
+import os
+import sys
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import startup
+
+def test_configure_kaleido_uses_first_existing_browser(tmp_path, monkeypatch):
+    browser = tmp_path / 'chromium'
+    browser.write_text('')
+    monkeypatch.setattr(startup, 'BROWSER_CANDIDATES', (str(tmp_path / 'no-existe'), str(browser)))
+    monkeypatch.delenv('BROWSER_PATH', raising=False)
+    startup.configure_kaleido.cache_clear()
+    try:
+        assert startup.configure_kaleido() == str(browser)
+        assert os.environ['BROWSER_PATH'] == str(browser)
+    finally:
+        startup.configure_kaleido.cache_clear()
+
+def test_app_defers_view_modules():
+    times = dict((name, cumulative) for name, _, cumulative in startup.import_times('app'))
+
+    assert 'app' in times
+    assert 'startup' in times or 'processors' in times
+    assert not any(name.startswith('views.') for name in times)
+    assert 'plotly.express' not in times
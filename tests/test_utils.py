@@ -0,0 +1,15 @@
+import os
+import sys
+import pandas as pd
+
+# Añadir el directorio 'src' al sys.path (los módulos se importan como en la app)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from utils import frame_signature
+
+def test_frame_signature_changes_with_version_and_rows():
+    df = pd.DataFrame({'estado': ['pendiente', 'completado', 'pendiente']})
+    assert frame_signature(df, 1) == frame_signature(df.copy(), 1)
+    # Una versión nueva con las mismas posiciones no reutiliza la exportación anterior
+    assert frame_signature(df.assign(estado='aprobado'), 2) != frame_signature(df, 1)
+    assert frame_signature(df.iloc[[0, 2]], 1) != frame_signature(df.iloc[[0, 1]], 1)